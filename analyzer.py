@@ -1,9 +1,46 @@
-from dataclasses import dataclass
-from typing import Optional, Tuple, List
+from collections import OrderedDict
+from concurrent.futures import (Executor, Future, InvalidStateError, ThreadPoolExecutor,
+                                TimeoutError as FutureTimeout, as_completed as futures_as_completed,
+                                wait as futures_wait)
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import Optional, Tuple, List, Dict, Any, Iterator
+import math
+import multiprocessing
+import os
+import threading
+import time
 import sympy as sp
 
+from parser import CompiledFunction, as_compiled
+from timing import Timer, emit, profile_text, profiled, timer_stage
+import fastpath
+import interval
+import numeric
+
 x = sp.symbols('x')
 
+# Se incrementa cuando cambia el contenido de AnalysisReport (invalida el almacén persistente).
+ANALYZER_VERSION = "5"
+
+# Tiempo máximo (segundos) por etapa simbólica; None o 0 ejecuta la etapa sin límite en el proceso actual.
+DEFAULT_STAGE_BUDGETS: Dict[str, Optional[float]] = {
+    "domain": 8.0,
+    "range": 8.0,
+    "x_intercepts": 8.0,
+    "y_intercept": 8.0,
+}
+
+# Ventana sobre la que se hacen las estimaciones numéricas (la misma del gráfico por defecto)
+DEFAULT_WINDOW: Tuple[float, float] = (-10, 10)
+
+_STAGE_METHODS = {
+    "domain": "_domain",
+    "range": "_range",
+    "x_intercepts": "_solve_roots",
+    "y_intercept": "_y_value",
+}
+
 @dataclass
 class AnalysisReport:
     expr_str: str 
@@ -14,136 +51,828 @@ class AnalysisReport:
     steps_for_x: Optional[str] 
     steps_y_intercept: Optional[str]
     steps_x_intercepts: Optional[str]
+    # Etapas cuyo resultado es una estimación numérica (se agotó su tiempo)
+    estimated: List[str] = field(default_factory=list)
+    # Duraciones (s) y conteos por etapa: {"durations": {...}, "counts": {...}}
+    timings: Dict[str, Any] = field(default_factory=dict)
+    # Salida de cProfile cuando el análisis se ejecutó con profile=True
+    profile: Optional[str] = None
+
+
+class StageError(Exception):
+    pass
+
+
+class StageTimeout(StageError):
+    pass
+
+
+class StageCancelled(StageError):
+    pass
+
+
+# Las etapas con plazo no corren en procesos creados con fork: la GUI tiene hilos (Tk,
+# BackgroundRunner) y hacer fork de un proceso con hilos puede bloquear al hijo (Python 3.12+
+# lo advierte). Con forkserver el servidor importa este módulo una vez y cada proceso nuevo
+# parte con SymPy ya cargado; donde no existe (Windows) se usa spawn.
+STAGE_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+STAGE_WORKERS = 4  # las cuatro etapas con presupuesto corren en paralelo
+
+
+def _stage_worker(conn) -> None:
+    """Bucle de un proceso de etapas: recibe (expr, método, args) y responde (ok, valor)."""
+    while True:
+        try:
+            expr, method, args = conn.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            return
+        try:
+            analyzer = FunctionAnalyzer(CompiledFunction.from_expr(expr, simplify=False), cache=None, budgets={})
+            result = (True, getattr(analyzer, method)(*args))
+        except Exception as e:
+            result = (False, repr(e))
+        conn.send(result)
+
+
+class StageWorkers:
+    """Procesos reutilizables (y precalentados con ``start``) para las etapas con plazo.
+
+    Cada proceso atiende una etapa a la vez. El que supera su plazo o se cancela se mata y se
+    reemplaza por uno nuevo: una etapa colgada en SymPy nunca bloquea a las siguientes.
+    """
+
+    def __init__(self, size: int = STAGE_WORKERS, method: str = STAGE_START_METHOD) -> None:
+        self.size = size
+        self._ctx = multiprocessing.get_context(method)
+        if method == "forkserver":
+            self._ctx.set_forkserver_preload([__name__])
+        self._idle: List[Tuple[Any, Any]] = []  # (proceso, extremo del pipe)
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> Tuple[Any, Any]:
+        conn, child = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_stage_worker, args=(child,), name="stage-worker", daemon=True)
+        proc.start()
+        child.close()
+        return proc, conn
+
+    @staticmethod
+    def _discard(worker: Tuple[Any, Any], kill: bool = False) -> None:
+        proc, conn = worker
+        if kill:
+            proc.kill()
+        conn.close()  # sin kill, el proceso ve EOF y termina solo
+        if kill:
+            proc.join()
+
+    def start(self) -> None:
+        """Arranca procesos hasta tener ``size`` libres; llamarla de nuevo no crea más."""
+        with self._lock:
+            missing = self.size - len(self._idle)
+        workers = [self._spawn() for _ in range(missing)]
+        with self._lock:
+            self._idle.extend(workers)
+
+    def pids(self) -> List[int]:
+        """Pids de los procesos libres (diagnóstico)."""
+        with self._lock:
+            return [proc.pid for proc, _ in self._idle]
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._discard(worker, kill=True)
+
+    def _acquire(self) -> Tuple[Any, Any]:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker[0].is_alive():
+                    return worker
+                self._discard(worker)
+        return self._spawn()
+
+    def _release(self, worker: Tuple[Any, Any]) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(worker)
+                return
+        self._discard(worker)
+
+    def run(self, expr: sp.Expr, method: str, args: tuple, budget: float,
+            cancel: Optional[threading.Event] = None) -> Any:
+        worker = self._acquire()
+        proc, conn = worker
+        done = False
+        try:
+            conn.send((expr, method, args))
+            deadline = time.monotonic() + budget
+            while not conn.poll(min(0.05, max(deadline - time.monotonic(), 0))):
+                if cancel is not None and cancel.is_set():
+                    raise StageCancelled(f"La etapa {method} fue cancelada")
+                if time.monotonic() >= deadline:
+                    raise StageTimeout(f"La etapa {method} superó {budget} s")
+            ok, value = conn.recv()
+            done = True
+        except (EOFError, OSError):
+            raise StageTimeout(f"La etapa {method} terminó sin resultado")
+        finally:
+            if done:
+                self._release(worker)
+            else:
+                # El proceso sigue ocupado (o murió): se mata y se deja otro listo en su lugar
+                self._discard(worker, kill=True)
+                self.start()
+        if not ok:
+            raise StageError(value)
+        return value
+
+
+_stage_workers: Optional[StageWorkers] = None
+_stage_workers_lock = threading.Lock()
+_stage_start_method = STAGE_START_METHOD
+
+
+def stage_workers() -> StageWorkers:
+    """Los procesos de etapas compartidos por todos los análisis de este proceso."""
+    global _stage_workers
+    with _stage_workers_lock:
+        if _stage_workers is None:
+            _stage_workers = StageWorkers(method=_stage_start_method)
+        return _stage_workers
+
+
+def _reset_stage_workers() -> None:
+    # Los procesos de etapas son hijos del padre: en un hijo creado con fork no se pueden usar
+    # (is_alive falla) y el hijo arma los suyos. Sólo se cierra su copia de los pipes. El
+    # forkserver heredado tampoco es hijo suyo (waitpid falla), así que el hijo usa spawn.
+    global _stage_workers, _stage_workers_lock, _stage_start_method
+    _stage_start_method = "spawn"
+    if _stage_workers is not None:
+        for _, conn in _stage_workers._idle:
+            conn.close()
+    _stage_workers = None
+    _stage_workers_lock = threading.Lock()
+
+
+def run_with_deadline(expr: sp.Expr, method: str, args: tuple, budget: float,
+                      cancel: Optional[threading.Event] = None) -> Any:
+    """Ejecuta FunctionAnalyzer.<method>(*args) en un proceso de etapas y lo mata si excede
+    ``budget`` o si se activa ``cancel``."""
+    return stage_workers().run(expr, method, args, budget, cancel)
+
+
+class AnalysisCache:
+    """Caché LRU acotada de reportes, indexada por el srepr canónico de la expresión."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, AnalysisReport]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[AnalysisReport]:
+        with self._lock:
+            report = self._data.get(key)
+            if report is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return report
+
+    def put(self, key: str, report: AnalysisReport) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = report
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._data), "maxsize": self.maxsize}
+
+
+analysis_cache = AnalysisCache()
+
+
+def canonical_key(expr: sp.Expr) -> str:
+    return sp.srepr(expr)
+
+
+class _lazy:
+    """Propiedad memoizada; un lock por campo evita recalcularla si varias etapas la piden a la vez."""
+
+    def __init__(self, fn) -> None:
+        self.fn = fn
+        self.name = fn.__name__
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        with obj._lock_for(self.name):
+            if self.name not in obj.__dict__:
+                obj.__dict__[self.name] = self.fn(obj)
+        return obj.__dict__[self.name]
+
+
+class AnalysisArtifacts:
+    """Resultados intermedios de un análisis: cada operación simbólica se ejecuta a lo sumo una vez.
+
+    Los valores del reporte y el texto del paso a paso se derivan de los mismos
+    artefactos, y sólo se calculan cuando alguien los pide.
+    """
+
+    def __init__(self, analyzer: "FunctionAnalyzer") -> None:
+        self.analyzer = analyzer
+        self.expr = analyzer.expr
+        self.estimated: List[str] = []
+        self.timer = Timer()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    # --- Dominio y recorrido ---
+    @_lazy
+    def domain(self) -> sp.sets.Set:
+        try:
+            with self.timer.stage("domain"):
+                return self.analyzer._run_stage("domain")
+        except StageError:
+            self.estimated.append("domain")
+            return sp.S.Reals
+
+    @_lazy
+    def domain_str(self) -> str:
+        dom = self.domain
+        if "domain" in self.estimated:
+            note = "el dominio exacto no se obtuvo a tiempo"
+            gaps = self.undefined_parts
+            if gaps:
+                xmin, xmax = self.analyzer.window
+                parts = " ∪ ".join(interval.format_interval(a, b, inward=True) for a, b in gaps)
+                note += f"; en [{xmin:g}, {xmax:g}] f no está definida en {parts} (verificado)"
+            return f"Reals (≈ estimación: {note})"
+        return str(dom)
+
+    @_lazy
+    def range_str(self) -> str:
+        domain = self.domain
+        try:
+            with self.timer.stage("range"):
+                rng = self.analyzer._run_stage("range", domain)
+            if rng is not None:
+                return str(rng)
+        except StageError:
+            pass
+        self.estimated.append("range")
+        approx, bound = self.numeric_range, self.interval_range
+        xmin, xmax = self.analyzer.window
+        if bound is not None and (bound.lower > -math.inf or bound.upper < math.inf):
+            enclosure = interval.format_interval(bound.lower, bound.upper)
+            if approx is None:
+                return f"⊆ {enclosure} (cota verificada en [{xmin:g}, {xmax:g}])"
+            return (f"≈ [{approx[0]:.6g}, {approx[1]:.6g}] ⊆ {enclosure} "
+                    f"(estimación numérica y cota verificada en [{xmin:g}, {xmax:g}])")
+        if approx is None:
+            return "No determinado automáticamente"
+        return (f"≈ [{approx[0]:.6g}, {approx[1]:.6g}] "
+                f"(estimación numérica en [{xmin:g}, {xmax:g}])")
+
+    # --- Cotas garantizadas con aritmética de intervalos sobre la ventana ---
+    @_lazy
+    def interval_range(self) -> Optional[interval.RangeEnclosure]:
+        """f([xmin, xmax]) ⊆ [lower, upper], sin resolver nada simbólicamente."""
+        F = self.analyzer.compiled.interval
+        if F is None:
+            return None
+        xmin, xmax = self.analyzer.window
+        with self.timer.stage("interval_range"):
+            try:
+                bound = interval.enclose_range(F, self.analyzer.compiled.f, xmin, xmax)
+            except (ArithmeticError, ValueError):
+                return None
+        if bound is not None:
+            self.timer.count("interval_range", bound.evals)
+        return bound
+
+    @_lazy
+    def root_candidates(self) -> Optional[List[Tuple[float, float]]]:
+        """Subintervalos de la ventana que pueden tener raíces (fuera de ellos f ≠ 0 está probado)."""
+        F = self.analyzer.compiled.interval
+        if F is None:
+            return None
+        with self.timer.stage("interval_roots"):
+            try:
+                return interval.root_candidates(F, *self.analyzer.window)
+            except (ArithmeticError, ValueError):
+                return None
+
+    @_lazy
+    def undefined_parts(self) -> List[Tuple[float, float]]:
+        """Subintervalos de la ventana donde está probado que f no está definida."""
+        F = self.analyzer.compiled.interval
+        if F is None:
+            return []
+        with self.timer.stage("interval_domain"):
+            try:
+                return interval.undefined_parts(F, *self.analyzer.window)
+            except (ArithmeticError, ValueError):
+                return []
+
+    # --- Muestras numéricas sobre la ventana ---
+    @_lazy
+    def samples(self) -> Tuple[List[float], List[float]]:
+        if self.analyzer.samples is not None:
+            return self.analyzer.samples
+        xmin, xmax = self.analyzer.window
+        n = 1000
+        with self.timer.stage("samples"):
+            pts = numeric.sample_points(self.analyzer.compiled.f, xmin, xmax, n, batch=self.analyzer.compiled.batch)
+        self.timer.count("samples", n)
+        return pts
+
+    @_lazy
+    def numeric_range(self) -> Optional[Tuple[float, float]]:
+        _, ys = self.samples
+        if not ys:
+            return None
+        return min(ys), max(ys)
+
+    @_lazy
+    def numeric_roots(self) -> List[float]:
+        xs, ys = self.samples
+        denom = self.analyzer.compiled.denom
+        f = self.analyzer.compiled.f
+        evals = 0
+
+        def counted(xi: float) -> float:
+            nonlocal evals
+            evals += 1
+            return f(xi)
+
+        candidates = self.root_candidates
+        if candidates == []:
+            return []  # probado: f no se anula en la ventana
+        with self.timer.stage("numeric_roots"):
+            denom_f = sp.lambdify(x, denom, modules=["math"]) if denom.has(x) else None
+            roots = numeric.find_roots(counted, xs, ys, denom=denom_f, candidates=candidates)
+        self.timer.count("numeric_roots", evals)
+        return roots
+
+    @_lazy
+    def zero_intervals(self) -> List[Tuple[float, float]]:
+        """Tramos de la ventana donde todas las muestras valen 0 (infinitos ceros)."""
+        if self.root_candidates == []:
+            return []
+        return numeric.zero_runs(*self.samples)
+
+    # --- Corte con eje X: un único solveset ---
+    @_lazy
+    def solutions(self) -> Any:
+        """Conjunto solución de f(x)=0 en el dominio, o la excepción que impidió obtenerlo."""
+        domain = self.domain
+        try:
+            with self.timer.stage("solveset"):
+                return self.analyzer._run_stage("x_intercepts", domain)
+        except StageTimeout as e:
+            self.estimated.append("x_intercepts")
+            return e
+        except Exception as e:
+            return e
+
+    @_lazy
+    def real_roots(self) -> List[sp.Expr]:
+        sol = self.solutions
+        if not isinstance(sol, sp.sets.FiniteSet):
+            return []
+        return [sp.nsimplify(s) for s in sol if s.is_real]
+
+    @_lazy
+    def symbolic_roots_found(self) -> bool:
+        return isinstance(self.solutions, sp.sets.FiniteSet) or self.solutions is sp.S.EmptySet
+
+    @_lazy
+    def x_intercepts(self) -> List[str]:
+        if self.symbolic_roots_found:
+            return [str(s) for s in self.real_roots]
+        # Sin conjunto finito simbólico (ConditionSet, ImageSet, tiempo agotado): raíces numéricas
+        if "x_intercepts" not in self.estimated:
+            self.estimated.append("x_intercepts")
+        found = [(r, numeric.format_root(r)) for r in self.numeric_roots]
+        found += [(a, numeric.format_zero_run(a, b)) for a, b in self.zero_intervals]
+        return [text for _, text in sorted(found)]
+
+    @_lazy
+    def multiplicities(self) -> Dict[sp.Expr, int]:
+        if self.analyzer.kind == fastpath.GENERIC:
+            return {}
+        try:
+            return {r: m for r, m in fastpath.roots_in_domain(self.expr)}
+        except Exception:
+            return {}
+
+    @_lazy
+    def steps_x_intercepts(self) -> str:
+        lines = [f"Intersecciones con eje X (resolver f(x)=0):",
+                 f"f(x) = {self.analyzer.expr_str}",
+                 "Resolver: f(x) = 0"]
+        sol = self.solutions
+        if isinstance(sol, StageTimeout):
+            lines.append("No se pudo resolver simbólicamente en el tiempo asignado.")
+        elif isinstance(sol, Exception):
+            lines.append(f"No se pudo resolver simbólicamente. Detalle: {sol}")
+        elif isinstance(sol, sp.sets.FiniteSet):
+            if self.real_roots:
+                mult = self.multiplicities
+                lines.append("Soluciones reales en el dominio: " +
+                             ", ".join([f"x = {s}" + (f" (multiplicidad {mult[s]})" if mult.get(s, 1) > 1 else "")
+                                        for s in self.real_roots]))
+            else:
+                lines.append("No hay soluciones reales en el dominio.")
+        else:
+            lines.append(f"No se obtuvo un conjunto finito simbólico: {sol}")
+        if not self.symbolic_roots_found:
+            xmin, xmax = self.analyzer.window
+            if self.numeric_roots:
+                lines.append(f"Raíces numéricas en [{xmin:g}, {xmax:g}] (cambio de signo + refinamiento): " +
+                             ", ".join(f"x ≈ {numeric.format_root(r)}" for r in self.numeric_roots))
+            elif not self.zero_intervals:
+                lines.append(f"No se encontraron cambios de signo en [{xmin:g}, {xmax:g}].")
+            for a, b in self.zero_intervals:
+                lines.append(f"f(x) = 0 en todas las muestras de [{numeric.format_root(a)}, "
+                             f"{numeric.format_root(b)}]: infinitos ceros (intervalo aproximado).")
+        return "\n".join(lines)
+
+    # --- Corte con eje Y: una única sustitución x=0 ---
+    @_lazy
+    def zero_in_domain(self) -> bool:
+        try:
+            return bool(0 in self.domain)
+        except Exception:
+            return False
+
+    @_lazy
+    def y_sub(self) -> Optional[sp.Expr]:
+        return self.expr.subs(x, 0) if self.zero_in_domain else None
+
+    @_lazy
+    def y_intercept(self) -> Optional[str]:
+        if self.y_sub is None:
+            return None
+        try:
+            with self.timer.stage("y_intercept"):
+                return self.analyzer._run_stage("y_intercept", self.y_sub)
+        except StageTimeout:
+            pass
+        except Exception:
+            return None
+        # simplify no terminó a tiempo: f(0) se evalúa numéricamente
+        self.estimated.append("y_intercept")
+        try:
+            val = complex(sp.N(self.y_sub))
+        except Exception:
+            return None
+        return numeric.format_root(val.real) if val.imag == 0 and math.isfinite(val.real) else None
+
+    @_lazy
+    def steps_y_intercept(self) -> str:
+        if not self.zero_in_domain:
+            return "La función no está definida en x = 0, no hay corte con Y."
+        with self.timer.stage("steps"):
+            txt, _ = self.analyzer._steps_for_value(0, sub_expr=self.y_sub)
+        return "Intersección con eje Y (x=0):\n" + (txt or "")
+
+
+def value_steps_text(expr_str: str, x0: Any, sub_str: str, value: Any) -> str:
+    """Paso a paso de la evaluación de f en x0 (compartido con las tablas de valores)."""
+    return "\n".join([
+        f"f(x) = {expr_str}",
+        f"Sustituyendo x = {x0} ⇒ f({x0}) = {sub_str}",
+        f"Cálculo numérico ⇒ f({x0}) ≈ {value}",
+    ])
+
+
+def division_by_zero_text(expr_str: str, denom_str: str, x0: Any) -> str:
+    return (
+        f"f(x) = {expr_str}\n"
+        f"Sustituyendo x = {x0} ⇒ el denominador se anula: {denom_str} = 0.\n"
+        f"La función racional no está definida en x = {x0} (división por cero)."
+    )
+
 
 class FunctionAnalyzer:
 
-    def __init__(self, expr: sp.Expr): 
-        self.expr = sp.simplify(expr) 
+    def __init__(self, fn: CompiledFunction, cache: Optional[AnalysisCache] = analysis_cache,
+                 store: Optional[Any] = None,
+                 budgets: Optional[Dict[str, Optional[float]]] = None,
+                 window: Tuple[float, float] = DEFAULT_WINDOW,
+                 samples: Optional[Tuple[List[float], List[float]]] = None,
+                 profile: bool = False): 
+        # ``samples``: salida de FunctionPlotter.sample_points sobre ``window``, para no volver a muestrear.
+        # ``profile``: analyze() corre todas las etapas en el hilo actual bajo cProfile (sin caché).
+        self.compiled = as_compiled(fn)
+        self.expr = self.compiled.expr
+        self.cache = cache
+        self.store = store
+        self.budgets = DEFAULT_STAGE_BUDGETS if budgets is None else budgets
+        self.window = window
+        self.samples = samples
+        self.profile = profile
+        self.cancelled = threading.Event()
+        self.key = canonical_key(self.expr)
+        if tuple(window) != DEFAULT_WINDOW:
+            self.key += f"|{window[0]!r}|{window[1]!r}"
+        self.kind = fastpath.classify(self.expr)
 
     def _domain(self) -> sp.sets.Set:
         from sympy.calculus.util import continuous_domain 
+        if self.kind != fastpath.GENERIC:
+            try:
+                return fastpath.domain(self.expr)
+            except Exception:
+                pass
         try:
             return continuous_domain(self.expr, x, sp.S.Reals)
         except Exception:
             return sp.S.Reals
 
     def _range(self, domain: sp.sets.Set) -> Optional[sp.sets.Set]:
+        if self.kind != fastpath.GENERIC:
+            try:
+                return fastpath.function_range(self.expr)
+            except Exception:
+                pass
         try:
             from sympy.calculus.util import function_range
             return function_range(self.expr, x, domain)
         except Exception:
             return None
 
-    def _x_intercepts(self, domain: sp.sets.Set) -> List[sp.Number]:
-        vals: List[sp.Number] = []
-        try:
-            solset = sp.solveset(sp.Eq(self.expr, 0), x, domain=domain)
-            if isinstance(solset, sp.sets.FiniteSet):
-                for s in solset:
-                    if s.is_real:
-                        vals.append(sp.nsimplify(s))
-        except Exception:
-            pass
-        return vals
+    def _solve_roots(self, domain: sp.sets.Set) -> sp.sets.Set:
+        if self.kind != fastpath.GENERIC:
+            try:
+                return sp.FiniteSet(*[r for r, _ in fastpath.roots_in_domain(self.expr)])
+            except Exception:
+                pass
+        return sp.solveset(sp.Eq(self.expr, 0), x, domain=domain)
 
-    def _y_intercept(self, domain: sp.sets.Set) -> Optional[sp.Number]:
-        try:
-            if 0 in domain:
-                val = sp.simplify(self.expr.subs(x, 0))
-                if val.is_real:
-                    return sp.nsimplify(val)
-        except Exception:
-            return None
-        return None
+    @cached_property
+    def expr_str(self) -> str:
+        return sp.sstr(self.expr)
 
-    def _steps_for_value(self, x0: float) -> Tuple[Optional[str], Optional[float]]:
-        expr_str = sp.sstr(self.expr)
+    def _steps_for_value(self, x0: float, sub_expr: Optional[sp.Expr] = None) -> Tuple[Optional[str], Optional[float]]:
         # Detectar si el denominador depende de x y se anula en x0
-        numer, denom = sp.fraction(self.expr)
+        denom = self.compiled.denom
         if denom.has(x):
             denom_val = denom.subs(x, x0)
             if denom_val == 0:
-                msg = (
-                    f"f(x) = {expr_str}\n"
-                    f"Sustituyendo x = {x0} ⇒ el denominador se anula: {sp.sstr(denom)} = 0.\n"
-                    f"La función racional no está definida en x = {x0} (división por cero)."
-                )
-                return (msg, None)
+                return (division_by_zero_text(self.expr_str, sp.sstr(denom), x0), None)
         try:
-            sub_expr = self.expr.subs(x, x0)
-            sub_str = sp.sstr(sub_expr)
+            if sub_expr is None:
+                sub_expr = self.expr.subs(x, x0)
             val = float(sp.N(sub_expr))
-            lines = [
-                f"f(x) = {expr_str}",
-                f"Sustituyendo x = {x0} ⇒ f({x0}) = {sub_str}",
-                f"Cálculo numérico ⇒ f({x0}) ≈ {val}",
-            ]
-            return ("\n".join(lines), val)
+            return (value_steps_text(self.expr_str, x0, sp.sstr(sub_expr), val), val)
         except Exception as e:
             try:
-                numer, denom = sp.fraction(self.expr)
                 denom_val = denom.subs(x, x0)
                 if denom_val == 0:
-                    msg = (
-                        f"f(x) = {expr_str}\n"
-                        f"Sustituyendo x = {x0} ⇒ el denominador se anula: {sp.sstr(denom)} = 0.\n"
-                        f"La función racional no está definida en x = {x0} (división por cero)."
-                    )
-                    return (msg, None)
+                    return (division_by_zero_text(self.expr_str, sp.sstr(denom), x0), None)
             except Exception:
                 pass
             return (f"No se pudo evaluar en x = {x0}. Detalle: {e}", None)
-        
-    def _steps_y_intercept(self, domain) -> Optional[str]:
-        if 0 not in domain:
-            return "La función no está definida en x = 0, no hay corte con Y."
-        txt, _ = self._steps_for_value(0)
-        return "Intersección con eje Y (x=0):\n" + (txt or "")
 
+    def _run_stage(self, stage: str, *args) -> Any:
+        method = _STAGE_METHODS[stage]
+        budget = self.budgets.get(stage)
+        # Los caminos rápidos (polinomios y racionales) son exactos y no necesitan un proceso aparte;
+        # al perfilar, la etapa corre en este proceso para que cProfile la vea.
+        if not budget or self.kind != fastpath.GENERIC or self.profile:
+            return getattr(self, method)(*args)
+        return run_with_deadline(self.expr, method, args, budget, cancel=self.cancelled)
 
-    def _steps_x_intercepts(self, domain) -> Optional[str]:
-        lines = [f"Intersecciones con eje X (resolver f(x)=0):",
-             f"f(x) = {sp.sstr(self.expr)}",
-             "Resolver: f(x) = 0"]
-        try:
-            sol = sp.solveset(sp.Eq(self.expr, 0), x, domain=domain)
-            if isinstance(sol, sp.sets.FiniteSet):
-                reales = [sp.nsimplify(s) for s in sol if s.is_real]
-                if reales:
-                    lines.append("Soluciones reales en el dominio: " +
-                             ", ".join([f"x = {s}" for s in reales]))
-                else:
-                    lines.append("No hay soluciones reales en el dominio.")
-            else:
-                lines.append(f"No se obtuvo un conjunto finito simbólico: {sol}")
-        except Exception as e:
-            lines.append(f"No se pudo resolver simbólicamente. Detalle: {e}")
-        return "\n".join(lines)
+    def _y_value(self, y_sub: sp.Expr) -> Optional[str]:
+        val = sp.simplify(y_sub)
+        return str(sp.nsimplify(val)) if val.is_real else None
 
-    def analyze(self, x_value: Optional[float] = None) -> AnalysisReport:
-        dom = self._domain()
-        rng = self._range(dom)
+    def evaluate(self, x0: float) -> Tuple[Optional[str], Optional[float]]:
+        """Paso a paso y valor de f(x0); el valor es None si f no está definida en x0."""
+        return self._steps_for_value(x0)
 
-        xints_syms = self._x_intercepts(dom)
-        yint_sym = self._y_intercept(dom)
+    def _stage_steps_for_x(self, x_value: Optional[float], timer: Optional[Timer] = None) -> Optional[str]:
+        if x_value is None:
+            return None
+        with timer_stage(timer, "steps_for_x"):
+            steps, _ = self._steps_for_value(x_value)
+        return steps
 
-        domain_str = str(dom)
-        range_str = str(rng) if rng is not None else "No determinado automáticamente"
-        xints_strs = [str(s) for s in xints_syms]
-        yint_str = str(yint_sym) if yint_sym is not None else None
+    # ------------------------------
+    # Planificación: dominio → {recorrido, cortes, pasos} en paralelo
+    # ------------------------------
+    def analyze_async(self, x_value: Optional[float] = None,
+                      executor: Optional[Executor] = None,
+                      include_steps: bool = True) -> "AnalysisJob":
+        """Lanza el análisis y devuelve de inmediato un AnalysisJob con un Future por campo.
 
-        steps = None
-        if x_value is not None:
-            steps, _ = self._steps_for_value(x_value)
-        stepsY = self._steps_y_intercept(dom)
-        stepsX = self._steps_x_intercepts(dom)
+        Con ``include_steps=False`` el texto del paso a paso no se calcula (los campos quedan en None).
+        """
+        executor = executor or _default_executor()
+
+        # Dominio, recorrido y cortes se cachean; el paso a paso en x_value no.
+        timer = Timer()
+        base = None
+        if not self.profile:
+            with timer.stage("cache"):
+                base = self.cache.get(self.key) if self.cache is not None else None
+                if base is None and self.store is not None:
+                    base = self.store.get_report(self.key)
+                    if base is not None and self.cache is not None:
+                        self.cache.put(self.key, base)
+        if base is not None:
+            job = AnalysisJob(self.expr, list(base.estimated), cancel=self.cancelled, timer=timer)
+            for name in BASE_FIELDS:
+                job.futures[name].set_result(getattr(base, name))
+            job._chain("steps_for_x", executor, self._stage_steps_for_x, x_value, timer)
+            return job
+
+        artifacts = AnalysisArtifacts(self)
+        artifacts.timer = timer
+        job = AnalysisJob(self.expr, artifacts.estimated, cancel=self.cancelled, timer=timer)
+        fields = BASE_FIELDS if include_steps else VALUE_FIELDS
+        for name in BASE_FIELDS:
+            if name not in fields:
+                job.futures[name].set_result(None)
+
+        def fan_out(dom_fut: Future) -> None:
+            for name in fields:
+                if name != "domain_str":
+                    job._chain(name, executor, getattr, artifacts, name)
+
+        def on_base_done(_: Future) -> None:
+            # Al perfilar no se lee ni se escribe la caché: la medición siempre es "sin caché"
+            if job._pending_base() or not include_steps or self.profile:
+                return
+            try:
+                report = job._base_report()
+            except BaseException:
+                return
+            if self.cache is not None:
+                self.cache.put(self.key, report)
+            # Las estimaciones no se persisten: otra sesión con más tiempo puede obtener el resultado exacto.
+            if self.store is not None and not report.estimated:
+                self.store.put_report(self.key, report)
+
+        for name in BASE_FIELDS:
+            job.futures[name].add_done_callback(on_base_done)
+        job._chain("domain_str", executor, getattr, artifacts, "domain_str")
+        job.futures["domain_str"].add_done_callback(fan_out)
+        job._chain("steps_for_x", executor, self._stage_steps_for_x, x_value, timer)
+        return job
+
+    def analyze(self, x_value: Optional[float] = None, include_steps: bool = True) -> AnalysisReport:
+        if not self.profile:
+            return self.analyze_async(x_value=x_value, include_steps=include_steps).result()
+        # Todas las etapas en este hilo, para que cProfile las registre
+        with profiled() as prof:
+            report = self.analyze_async(x_value=x_value, executor=_InlineExecutor(),
+                                        include_steps=include_steps).result()
+        return replace(report, profile=profile_text(prof))
+
+
+VALUE_FIELDS = ("domain_str", "range_str", "x_intercepts", "y_intercept")
+BASE_FIELDS = VALUE_FIELDS + ("steps_y_intercept", "steps_x_intercepts")
+REPORT_FIELDS = BASE_FIELDS + ("steps_for_x",)
+
+
+class AnalysisJob:
+    """Análisis en curso: un Future por campo de AnalysisReport, resueltos a medida que terminan."""
+
+    def __init__(self, expr: sp.Expr, estimated: Optional[List[str]] = None,
+                 cancel: Optional[threading.Event] = None, timer: Optional[Timer] = None) -> None:
+        self.expr = expr
+        self.futures: Dict[str, Future] = {name: Future() for name in REPORT_FIELDS}
+        self.estimated: List[str] = [] if estimated is None else estimated
+        self.timer = timer if timer is not None else Timer()
+        self._started = time.perf_counter()
+        self._emitted = False
+        self._cancel = cancel if cancel is not None else threading.Event()
+
+    def cancel(self) -> None:
+        """Cancela las etapas pendientes y mata los procesos de las que están en curso."""
+        self._cancel.set()
+        for fut in self.futures.values():
+            fut.cancel()
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
 
+    def _chain(self, name: str, executor: Executor, fn, *args) -> None:
+        target = self.futures[name]
+        if self.cancelled():
+            return
+
+        def copy(src: Future) -> None:
+            try:
+                exc = src.exception()
+                if exc is not None:
+                    target.set_exception(exc)
+                else:
+                    target.set_result(src.result())
+            except InvalidStateError:
+                # El trabajo fue cancelado mientras la etapa corría: su resultado se descarta.
+                pass
+
+        executor.submit(fn, *args).add_done_callback(copy)
+
+    def _pending_base(self) -> bool:
+        return not all(self.futures[name].done() for name in BASE_FIELDS)
+
+    def _base_report(self) -> AnalysisReport:
         return AnalysisReport(
             expr_str=str(self.expr),
-            domain_str=domain_str,
-            range_str=range_str,
-            x_intercepts=xints_strs,
-            y_intercept=yint_str,
-            steps_for_x=steps, steps_y_intercept=stepsY,
-            steps_x_intercepts=stepsX,
-)
+            steps_for_x=None,
+            estimated=list(self.estimated),
+            timings=self.timer.as_dict(),
+            **{name: self.futures[name].result() for name in BASE_FIELDS},
+        )
+
+    def done(self) -> bool:
+        return all(f.done() for f in self.futures.values())
+
+    def as_completed(self, timeout: Optional[float] = None) -> Iterator[Tuple[str, Any]]:
+        """Entrega pares (campo, valor) en el orden en que cada etapa termina."""
+        names = {f: name for name, f in self.futures.items()}
+        for fut in futures_as_completed(names, timeout=timeout):
+            yield names[fut], fut.result()
+
+    def result(self, timeout: Optional[float] = None) -> AnalysisReport:
+        """Reporte completo; lanza concurrent.futures.TimeoutError si no termina en ``timeout`` s."""
+        _, pending = futures_wait(self.futures.values(), timeout=timeout)
+        if pending:
+            raise FutureTimeout(f"el análisis no terminó en {timeout} s")
+        report = replace(self._base_report(),
+                         steps_for_x=self.futures["steps_for_x"].result(timeout=0))
+        if not self._emitted:
+            # "total" es el tiempo de pared hasta el primer result(); las etapas corren en paralelo.
+            self._emitted = True
+            self.timer.add("total", time.perf_counter() - self._started)
+            report.timings = self.timer.as_dict()
+            emit("analyze", report.timings)
+        return report
+
+
+class _InlineExecutor(Executor):
+    """Ejecuta cada tarea en el hilo que la envía (usado al perfilar)."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        fut: Future = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        return fut
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _default_executor() -> ThreadPoolExecutor:
+    # Hilos coordinadores: las etapas con presupuesto se ejecutan en su propio proceso (run_with_deadline).
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="analyzer")
+        return _executor
+
+
+def _reset_executor() -> None:
+    # Un hijo creado con fork (pool del servicio, lotes) hereda el executor sin sus hilos:
+    # sus tareas nunca correrían, así que el hijo arma uno nuevo al primer uso.
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor)
+    os.register_at_fork(after_in_child=_reset_stage_workers)
@@ -0,0 +1,228 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import asdict
+from multiprocessing.connection import wait as wait_connections
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from parser import FunctionParser
+from analyzer import FunctionAnalyzer
+from plotter import FunctionPlotter
+from store import open_default_store
+from timing import merge
+
+DEFAULT_TIMEOUT = 60.0      # segundos por función
+DEFAULT_TASKS_PER_WORKER = 200  # funciones antes de reciclar un proceso (libera memoria acumulada)
+
+
+def iter_expressions(stream: TextIO) -> Iterator[str]:
+    """Una función por línea; se omiten líneas vacías y comentarios (#)."""
+    for line in stream:
+        text = line.strip()
+        if text and not text.startswith("#"):
+            yield text
+
+
+def analyze_one(parser: FunctionParser, text: str, x_value: Optional[float] = None,
+                png_path: Optional[str] = None, store: Any = None) -> Dict[str, Any]:
+    """Analiza una función y devuelve el registro JSON (campos de AnalysisReport + tiempos)."""
+    timings: Dict[str, float] = {}
+    t0 = time.perf_counter()
+    parsed = parser.parse(text)
+    timings["parse"] = time.perf_counter() - t0
+
+    t1 = time.perf_counter()
+    # Sin presupuestos por etapa: el límite es el timeout por función que aplica el proceso padre.
+    analyzer = FunctionAnalyzer(parsed.compiled, store=store, budgets={})
+    report = analyzer.analyze(x_value=x_value)
+    timings["analyze"] = time.perf_counter() - t1
+
+    record: Dict[str, Any] = {"ok": True, **asdict(report)}
+    del record["profile"]
+    stages = [parsed.timings, report.timings]
+    if png_path is not None:
+        t2 = time.perf_counter()
+        pr = FunctionPlotter(parsed.compiled, store=store).make_figure(x_value=x_value)
+        pr.fig.savefig(png_path)
+        timings["plot"] = time.perf_counter() - t2
+        stages.append(pr.timings)
+        record["png"] = png_path
+    timings["total"] = time.perf_counter() - t0
+    record["timings"] = timings
+    # Desglose por etapa (sintaxis, simplify, domain, solveset, muestreo, ...)
+    record["stages"] = merge(*stages, prefixes=["parse", "analyze", "plot"])
+    return record
+
+
+def _limit_memory(max_memory_mb: Optional[int]) -> None:
+    if not max_memory_mb:
+        return
+    import resource
+    limit = max_memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker(conn, options: Dict[str, Any]) -> None:
+    _limit_memory(options["max_memory"])
+    store = open_default_store() if options["use_store"] else None
+    parser = FunctionParser(store=store)
+    try:
+        while True:
+            task = conn.recv()
+            if task is None:
+                break
+            index, text = task
+            png_path = None
+            if options["png_dir"]:
+                png_path = os.path.join(options["png_dir"], f"{index:05d}.png")
+            try:
+                record = analyze_one(parser, text, options["x_value"], png_path, store)
+            except MemoryError:
+                conn.send({"ok": False, "error": "memoria agotada"})
+                break  # el proceso puede quedar en mal estado: el padre lo reemplaza
+            except Exception as e:
+                record = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            conn.send(record)
+    except EOFError:
+        pass
+    finally:
+        conn.close()
+
+
+class _Slot:
+    """Un proceso de trabajo y la función que está analizando."""
+
+    def __init__(self, ctx, options: Dict[str, Any]) -> None:
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker, args=(child, options), daemon=True)
+        self.proc.start()
+        child.close()
+        self.task: Optional[Tuple[int, str]] = None
+        self.started = 0.0
+        self.done = 0
+
+    def submit(self, task: Tuple[int, str]) -> None:
+        self.task = task
+        self.started = time.monotonic()
+        self.conn.send(task)
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.proc.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.proc.join(timeout=5)
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join()
+        self.conn.close()
+
+
+def run_batch(expressions: Iterator[str], out: TextIO, workers: int = 0,
+              timeout: float = DEFAULT_TIMEOUT, x_value: Optional[float] = None,
+              png_dir: Optional[str] = None, max_memory: Optional[int] = None,
+              tasks_per_worker: int = DEFAULT_TASKS_PER_WORKER, use_store: bool = False) -> int:
+    """Analiza ``expressions`` en ``workers`` procesos y escribe un registro JSON por línea
+    en cuanto cada función termina (no necesariamente en el orden de entrada).
+
+    Una función que supera ``timeout`` o agota la memoria sólo cuesta su proceso, que se
+    reemplaza por uno nuevo. Devuelve la cantidad de funciones con error.
+    """
+    if png_dir:
+        os.makedirs(png_dir, exist_ok=True)
+    options = {"x_value": x_value, "png_dir": png_dir, "max_memory": max_memory, "use_store": use_store}
+    ctx = multiprocessing.get_context()
+    slots: List[_Slot] = [_Slot(ctx, options) for _ in range(workers or os.cpu_count() or 1)]
+    tasks = enumerate(expressions)
+    pending = True
+    failures = 0
+
+    def emit(task: Tuple[int, str], record: Dict[str, Any]) -> None:
+        nonlocal failures
+        if not record.get("ok"):
+            failures += 1
+        record = {"index": task[0], "input": task[1], **record}
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+
+    try:
+        while True:
+            for slot in slots:
+                if slot.task is None and pending:
+                    task = next(tasks, None)
+                    if task is None:
+                        pending = False
+                    else:
+                        slot.submit(task)
+            busy = [s for s in slots if s.task is not None]
+            if not busy:
+                break
+
+            now = time.monotonic()
+            wait_for = min(s.started + timeout for s in busy) - now
+            ready = wait_connections([s.conn for s in busy], timeout=max(wait_for, 0.0))
+            for i, slot in enumerate(slots):
+                if slot.task is None:
+                    continue
+                if slot.conn in ready:
+                    try:
+                        record = slot.conn.recv()
+                    except EOFError:
+                        # El proceso murió (p. ej. lo terminó el sistema por memoria)
+                        record = {"ok": False, "error": "el proceso de análisis terminó inesperadamente"}
+                    emit(slot.task, record)
+                    slot.task = None
+                    slot.done += 1
+                    if not slot.proc.is_alive() or record.get("error") == "memoria agotada" \
+                            or slot.done >= tasks_per_worker:
+                        slot.stop(kill=not slot.proc.is_alive())
+                        slots[i] = _Slot(ctx, options)
+                elif time.monotonic() - slot.started >= timeout:
+                    emit(slot.task, {"ok": False, "error": f"tiempo agotado ({timeout:g} s)",
+                                     "timings": {"total": time.monotonic() - slot.started}})
+                    slot.stop(kill=True)
+                    slots[i] = _Slot(ctx, options)
+    finally:
+        for slot in slots:
+            slot.stop(kill=slot.task is not None)
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python main.py batch",
+        description="Analiza un archivo de funciones (una por línea) y escribe un JSON por función.")
+    ap.add_argument("input", nargs="?", default="-", help="archivo de funciones ('-' = entrada estándar)")
+    ap.add_argument("-o", "--output", default="-", help="archivo JSONL de salida ('-' = salida estándar)")
+    ap.add_argument("-j", "--workers", type=int, default=0, help="procesos de trabajo (por defecto, uno por CPU)")
+    ap.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="segundos máximos por función")
+    ap.add_argument("--x", dest="x_value", type=float, default=None, help="x a evaluar en cada función")
+    ap.add_argument("--png-dir", default=None, help="guarda el gráfico de cada función en este directorio")
+    ap.add_argument("--max-memory", type=int, default=None, help="límite de memoria por proceso (MB)")
+    ap.add_argument("--tasks-per-worker", type=int, default=DEFAULT_TASKS_PER_WORKER,
+                    help="funciones por proceso antes de reemplazarlo")
+    ap.add_argument("--store", action="store_true", help="usa el almacén persistente de resultados")
+    args = ap.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        failures = run_batch(iter_expressions(src), out, workers=args.workers, timeout=args.timeout,
+                             x_value=args.x_value, png_dir=args.png_dir, max_memory=args.max_memory,
+                             tasks_per_worker=args.tasks_per_worker, use_store=args.store)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
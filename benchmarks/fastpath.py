@@ -0,0 +1,48 @@
+"""Compara el camino rápido polinomial/racional con el genérico por grado.
+
+Uso: python -m benchmarks.fastpath [grado_máximo] [repeticiones]
+"""
+import statistics
+import sys
+import time
+
+import sympy as sp
+
+from analyzer import FunctionAnalyzer
+import fastpath
+
+x = sp.symbols('x')
+
+
+def corpus(max_degree: int):
+    for n in range(1, max_degree + 1):
+        poly = sp.expand(sp.prod([x - k for k in range(n)]) + 1)
+        yield f"polinomio grado {n}", poly
+        yield f"racional grado {n}", poly / (x**2 - n - 1)
+
+
+def _time(expr: sp.Expr, kind: str, reps: int) -> float:
+    samples = []
+    for _ in range(reps):
+        a = FunctionAnalyzer(expr, cache=None, budgets={})
+        a.kind = kind
+        t0 = time.perf_counter()
+        a.analyze(include_steps=False)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    max_degree = int(argv[0]) if argv else 6
+    reps = int(argv[1]) if len(argv) > 1 else 3
+    print(f"{'caso':<22}{'clase':<12}{'rápido (s)':>12}{'genérico (s)':>14}{'speedup':>10}")
+    for name, expr in corpus(max_degree):
+        kind = fastpath.classify(expr)
+        fast = _time(expr, kind, reps)
+        generic = _time(expr, fastpath.GENERIC, reps)
+        print(f"{name:<22}{kind:<12}{fast:>12.4f}{generic:>14.4f}{generic / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
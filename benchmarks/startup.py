@@ -0,0 +1,122 @@
+"""Tiempo de arranque: importación de la GUI y de cada módulo pesado, en intérpretes nuevos.
+
+Uso:
+    python -m benchmarks.startup                        # tabla por módulo
+    python -m benchmarks.startup --json base.json       # guarda los resultados
+    python -m benchmarks.startup --baseline base.json   # compara; sale con 1 si hay regresiones
+
+Cada repetición lanza ``python -X importtime`` que importa ``gui`` (lo que hace falta para
+mostrar la ventana) y luego ``warmup.HEAVY_MODULES`` (lo que la GUI carga en segundo plano).
+Un módulo que ya importó otro anterior cuenta 0 ms: si ``gui`` vuelve a importar SymPy al
+iniciar, el tiempo pasa a ``gui`` y supera ``--budget-ms``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.suite import DEFAULT_MIN_MS, DEFAULT_THRESHOLD, _p95, compare
+from warmup import HEAVY_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_MODULE = "gui"
+DEFAULT_BUDGET_MS = 250.0   # importación de la GUI antes de que aparezca la ventana
+MODULES = (STARTUP_MODULE,) + HEAVY_MODULES
+_SCRIPT = "\n".join(f"import {name}" for name in MODULES)
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Milisegundos acumulados de cada módulo según la salida de ``python -X importtime``."""
+    times: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # encabezado
+        times.setdefault(parts[2].strip(), int(parts[1]) / 1000)
+    return times
+
+
+def run_once() -> Dict[str, float]:
+    env = dict(os.environ, MAT1185_NO_STORE="1")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _SCRIPT], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "falló")
+    times = parse_importtime(proc.stderr)
+    return {name: times.get(name, 0.0) for name in MODULES}
+
+
+def measure(runs: int = 5) -> Dict[str, Any]:
+    samples: Dict[str, List[float]] = {name: [] for name in MODULES}
+    for _ in range(runs):
+        for name, ms in run_once().items():
+            samples[name].append(ms)
+    cases = {name: {"stages": {"import": {"median": statistics.median(v), "p95": _p95(v)}}}
+             for name, v in samples.items()}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "runs": runs,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": cases,
+    }
+
+
+def print_table(results: Dict[str, Any], out=sys.stdout) -> None:
+    print(f"{'módulo':<40}{'mediana (ms)':>14}{'p95 (ms)':>12}", file=out)
+    for name, case in results["cases"].items():
+        stats = case["stages"]["import"]
+        print(f"{name:<40}{stats['median']:>14.1f}{stats['p95']:>12.1f}", file=out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                 description="Mide el tiempo de importación al iniciar la GUI, por módulo.")
+    ap.add_argument("--runs", type=int, default=5, help="intérpretes nuevos a lanzar")
+    ap.add_argument("--json", default=None, help="escribe los resultados en este archivo ('-' = salida estándar)")
+    ap.add_argument("--baseline", default=None, help="resultados anteriores (JSON) con los que comparar")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="regresión relativa tolerada (0.25 = 25%%)")
+    ap.add_argument("--min-ms", type=float, default=DEFAULT_MIN_MS,
+                    help="diferencia absoluta mínima (ms) para contar como regresión")
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                    help=f"tiempo máximo (ms) para importar '{STARTUP_MODULE}'")
+    args = ap.parse_args(argv)
+
+    results = measure(args.runs)
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_table(results)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as fh:
+                json.dump(results, fh, indent=2, ensure_ascii=False)
+
+    problems: List[str] = []
+    startup_ms = results["cases"][STARTUP_MODULE]["stages"]["import"]["median"]
+    if startup_ms > args.budget_ms:
+        problems.append(f"{STARTUP_MODULE}: {startup_ms:.1f} ms supera el presupuesto de {args.budget_ms:g} ms")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            problems += compare(results, json.load(fh), args.threshold, args.min_ms)
+    for line in problems:
+        print(f"REGRESIÓN {line}", file=sys.stderr)
+    if problems:
+        return 1
+    if args.baseline:
+        print("Sin regresiones respecto de la línea base.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""Suite de rendimiento: parse → analyze → sample → render sobre un corpus por clase.
+
+Uso:
+    python -m benchmarks.suite                          # tabla por caso y etapa
+    python -m benchmarks.suite --json base.json         # guarda los resultados
+    python -m benchmarks.suite --baseline base.json     # compara; sale con 1 si hay regresiones
+
+Cada caso se ejecuta ``--reps`` veces (más una de calentamiento descartada) y se informa la
+mediana y el p95 de cada etapa. La memoria pico se mide con tracemalloc durante el
+calentamiento, para que su sobrecosto no afecte los tiempos; no incluye los procesos en los
+que el analizador corre las etapas con plazo (dominio, recorrido, cortes).
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+import matplotlib
+import sympy as sp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from analyzer import FunctionAnalyzer
+from parser import FunctionParser
+from plotter import FunctionPlotter
+
+STAGES = ("parse", "analyze", "sample", "render")
+DEFAULT_THRESHOLD = 0.25   # regresión relativa tolerada sobre la mediana
+DEFAULT_MIN_MS = 5.0       # diferencias menores se consideran ruido
+
+# (clase, nombre, función tal como la escribiría el usuario)
+CORPUS: List[Tuple[str, str, str]] = [
+    *[("polinomio", f"grado {n}", " + ".join(f"{k + 1}*x**{k}" for k in range(n + 1)))
+      for n in (1, 2, 3, 5, 8, 12)],
+    ("racional", "1/x", "1/x"),
+    ("racional", "polos simples", "(x**2 - 1)/(x**2 - 4)"),
+    ("racional", "grado 4/3", "(x**4 - 3*x + 2)/(x**3 - x)"),
+    ("racional", "polo doble", "x/(x - 1)**2"),
+    ("trig", "sin", "sin(x)"),
+    ("trig", "tan", "tan(x)"),
+    ("trig", "suma", "sin(x) + cos(2*x)"),
+    ("trig", "sec", "sec(x) + 1"),
+    ("exp_log", "exp", "exp(x)"),
+    ("exp_log", "log", "log(x)"),
+    ("exp_log", "x*log(x)", "x*log(x)"),
+    ("exp_log", "gaussiana", "exp(-x**2)"),
+    ("a_trozos", "Abs", "Abs(x - 1) - 2"),
+    ("a_trozos", "floor", "floor(x)"),
+    ("a_trozos", "floor/x", "floor(x)/x"),
+    ("a_trozos", "Piecewise", "Piecewise((x**2, x < 0), (sqrt(x), True))"),
+    ("patologico", "sin(1/x)", "sin(1/x)"),
+    ("patologico", "x**x", "x**x"),
+    ("patologico", "exp anidada", "exp(exp(x))"),
+    ("patologico", "dominio vacío", "sqrt(-x**2 - 1)"),
+    ("patologico", "tan(x**2)", "tan(x**2)"),
+    ("patologico", "oscilación rápida", "sin(100*x)*exp(-Abs(x))"),
+]
+
+
+def _case_id(cls: str, name: str) -> str:
+    return f"{cls}/{name}"
+
+
+def run_case(text: str) -> Tuple[Dict[str, float], int]:
+    """Una pasada completa; devuelve los segundos de cada etapa y las evaluaciones de f."""
+    durations: Dict[str, float] = {}
+    t0 = time.perf_counter()
+    # Sin almacén ni cachés: cada repetición mide el trabajo completo
+    parsed = FunctionParser().parse(text)
+    t1 = time.perf_counter()
+    # Con los plazos por etapa de la GUI: un caso patológico cuesta a lo sumo esos segundos
+    FunctionAnalyzer(parsed.compiled, cache=None).analyze(x_value=1.0)
+    t2 = time.perf_counter()
+    plotter = FunctionPlotter(parsed.compiled, tile_cache=None)
+    curve = plotter.curve(x_value=1.0)
+    t3 = time.perf_counter()
+    pr = plotter.make_figure(x_value=1.0, curve=curve)
+    FigureCanvasAgg(pr.fig).draw()
+    t4 = time.perf_counter()
+    durations.update(parse=t1 - t0, analyze=t2 - t1, sample=t3 - t2, render=t4 - t3)
+    return durations, curve.evals
+
+
+def _p95(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+
+
+def _peak_kb(text: str) -> float:
+    tracemalloc.start()
+    try:
+        run_case(text)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(text: str, reps: int, cold: bool = False) -> Dict[str, Any]:
+    """Mediana y p95 por etapa (ms), memoria pico (KB) y evaluaciones de f de un caso."""
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    # El calentamiento (importaciones perezosas, cachés de SymPy, ...) mide la memoria
+    peak_kb = _peak_kb(text)
+    evals = 0
+    for _ in range(reps):
+        if cold:
+            sp.core.cache.clear_cache()
+        durations, evals = run_case(text)
+        for stage in STAGES:
+            samples[stage].append(durations[stage])
+    totals = [sum(samples[s][i] for s in STAGES) for i in range(reps)]
+    stages = {s: {"median": 1000 * statistics.median(v), "p95": 1000 * _p95(v)} for s, v in samples.items()}
+    stages["total"] = {"median": 1000 * statistics.median(totals), "p95": 1000 * _p95(totals)}
+    return {"stages": stages, "peak_kb": peak_kb, "evals": evals}
+
+
+def run_suite(reps: int = 3, classes: Optional[List[str]] = None, cold: bool = False,
+              log=sys.stderr) -> Dict[str, Any]:
+    cases: Dict[str, Any] = {}
+    for cls, name, text in CORPUS:
+        if classes and cls not in classes:
+            continue
+        case_id = _case_id(cls, name)
+        try:
+            result = measure(text, reps, cold)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        cases[case_id] = {"class": cls, "input": text, **result}
+        if log is not None:
+            print(f"  {case_id}", file=log, flush=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "sympy": sp.__version__,
+            "matplotlib": matplotlib.__version__,
+            "machine": platform.machine(),
+            "reps": reps,
+            "cold": cold,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": cases,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            min_ms: float = DEFAULT_MIN_MS) -> List[str]:
+    """Regresiones de ``results`` frente a ``baseline``: medianas (y memoria pico) que crecen más
+    de ``threshold`` en términos relativos y más de ``min_ms`` en términos absolutos."""
+    problems: List[str] = []
+    for case_id, base in baseline.get("cases", {}).items():
+        new = results["cases"].get(case_id)
+        if new is None or "error" in base:
+            continue
+        if "error" in new:
+            problems.append(f"{case_id}: falló ({new['error']})")
+            continue
+        for stage, stats in base["stages"].items():
+            old_ms = stats["median"]
+            new_ms = new["stages"].get(stage, {}).get("median")
+            if new_ms is not None and new_ms > old_ms * (1 + threshold) and new_ms - old_ms > min_ms:
+                problems.append(f"{case_id} [{stage}]: {old_ms:.1f} → {new_ms:.1f} ms "
+                                f"(+{100 * (new_ms / old_ms - 1):.0f}%)")
+        old_kb, new_kb = base.get("peak_kb"), new.get("peak_kb")
+        if old_kb and new_kb and new_kb > old_kb * (1 + threshold):
+            problems.append(f"{case_id} [memoria]: {old_kb:.0f} → {new_kb:.0f} KB "
+                            f"(+{100 * (new_kb / old_kb - 1):.0f}%)")
+    return problems
+
+
+def print_table(results: Dict[str, Any], out=sys.stdout) -> None:
+    header = f"{'caso':<32}" + "".join(f"{s + ' (ms)':>16}" for s in STAGES + ("total",))
+    print(header + f"{'pico (KB)':>12}{'evals':>8}", file=out)
+    for case_id, case in results["cases"].items():
+        if "error" in case:
+            print(f"{case_id:<32}{case['error']}", file=out)
+            continue
+        cells = "".join(f"{case['stages'][s]['median']:>8.1f} /{case['stages'][s]['p95']:>6.1f}"
+                        for s in STAGES + ("total",))
+        print(f"{case_id:<32}{cells}{case['peak_kb']:>12.0f}{case['evals']:>8}", file=out)
+    print("(mediana / p95)", file=out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                 description="Mide parse, análisis, muestreo y render sobre un corpus de funciones.")
+    ap.add_argument("--reps", type=int, default=3, help="repeticiones por caso (además del calentamiento)")
+    ap.add_argument("--class", dest="classes", action="append",
+                    help="sólo esta clase del corpus (se puede repetir)")
+    ap.add_argument("--cold", action="store_true", help="vacía la caché de SymPy antes de cada repetición")
+    ap.add_argument("--json", default=None, help="escribe los resultados en este archivo ('-' = salida estándar)")
+    ap.add_argument("--baseline", default=None, help="resultados anteriores (JSON) con los que comparar")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="regresión relativa tolerada (0.25 = 25%%)")
+    ap.add_argument("--min-ms", type=float, default=DEFAULT_MIN_MS,
+                    help="diferencia absoluta mínima (ms) para contar como regresión")
+    args = ap.parse_args(argv)
+
+    results = run_suite(args.reps, args.classes, args.cold)
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_table(results)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as fh:
+                json.dump(results, fh, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            problems = compare(results, json.load(fh), args.threshold, args.min_ms)
+        for line in problems:
+            print(f"REGRESIÓN {line}", file=sys.stderr)
+        if problems:
+            return 1
+        print("Sin regresiones respecto de la línea base.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+from array import array
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+import copy
+import math
+import sympy as sp
+from sympy.printing.pycode import PythonCodePrinter
+
+x = sp.symbols('x')
+
+# Errores de evaluación que se convierten en NaN (dominio, división por cero, resultado complejo)
+_EVAL_ERRORS = "(ArithmeticError, ValueError, TypeError)"
+
+
+class BatchEvaluator:
+    """Evaluador de f generado a partir de ``sympy.cse``: cada subexpresión común se calcula una vez.
+
+    ``evaluate(xs, out)`` recorre un ``array('d')`` de valores de x y escribe en ``out``
+    (preasignado); los puntos donde f no es real quedan como NaN en lugar de lanzar excepciones.
+    ``scalar(x)`` es la misma función para un solo punto.
+
+    Con ``params`` (símbolos de una familia como ``a*sin(b*x)``) el código se genera una sola
+    vez y ``bind(valores)`` devuelve un evaluador con esos parámetros fijos, sin recompilar.
+    """
+
+    def __init__(self, expr: sp.Expr, params: Sequence[sp.Symbol] = ()) -> None:
+        self.expr = expr
+        self.params = tuple(params)
+        self.source = self._generate(expr, self.params)
+        namespace = {"math": math}
+        exec(compile(self.source, "<BatchEvaluator>", "exec"), namespace)
+        self._bind = namespace["_bind"]
+        self.values: Tuple[float, ...] = ()
+        if not self.params:
+            self._set(())
+
+    def _set(self, values: Tuple[float, ...]) -> None:
+        self.values = values
+        batch, sample, scalar = self._bind(*values)
+        self.evaluate: Callable[[Iterable[float], array], None] = batch
+        self.scalar: Callable[[float], float] = scalar
+        self._sample = sample
+
+    def bind(self, values: Sequence[float]) -> "BatchEvaluator":
+        """Copia del evaluador con los parámetros fijados en ``values`` (en el orden de ``params``)."""
+        if len(values) != len(self.params):
+            raise ValueError(f"Se esperaban {len(self.params)} valores de parámetros")
+        bound = copy.copy(self)
+        bound._set(tuple(float(v) for v in values))
+        return bound
+
+    @staticmethod
+    def _generate(expr: sp.Expr, params: Tuple[sp.Symbol, ...] = ()) -> str:
+        printer = PythonCodePrinter({"fully_qualified_modules": False})
+        # Todos los nombres locales generados llevan el prefijo ``_mat_`` para no chocar con los
+        # parámetros de la familia (``n``, ``xs``, ``step``, ``x0``...).
+        replacements, (reduced,) = sp.cse(expr, symbols=sp.numbered_symbols("_mat_c"))
+        body = [f"{printer.doprint(sym)} = {printer.doprint(sub)}" for sym, sub in replacements]
+        body.append(f"_mat_y = {printer.doprint(reduced)}")
+        if printer._not_supported:
+            raise ValueError(f"Función no soportada por el evaluador: {printer._not_supported}")
+        # Las funciones de math y los parámetros se enlazan como variables locales (acceso más
+        # rápido en el bucle): las primeras al inicio de cada función, los segundos como argumentos
+        # por defecto fijados en ``_bind``.
+        math_names = printer.module_imports.get("math", ())
+        names = [printer.doprint(p) for p in params]
+        bound = "".join(f", {n}={n}" for n in names)
+
+        def block(lines, indent: str) -> str:
+            return "\n".join(indent + line for line in lines)
+
+        header = block([f"{name} = math.{name}" for name in sorted(math_names)], " " * 8)
+        return (
+            f"def _bind({', '.join(names)}):\n"
+            f"    def _batch(_mat_xs, _mat_out{bound}):\n"
+            f"{header}\n"
+            "        _mat_nan = math.nan\n"
+            "        for _mat_i, x in enumerate(_mat_xs):\n"
+            "            try:\n"
+            f"{block(body, ' ' * 16)}\n"
+            "                _mat_out[_mat_i] = _mat_y\n"
+            f"            except {_EVAL_ERRORS}:\n"
+            "                _mat_out[_mat_i] = _mat_nan\n"
+            "\n"
+            f"    def _sample(_mat_xmin, _mat_step, _mat_n{bound}):\n"
+            f"{header}\n"
+            "        _mat_isfinite = math.isfinite\n"
+            "        _mat_xs, _mat_ys = [], []\n"
+            "        for _mat_i in range(_mat_n):\n"
+            "            x = _mat_xmin + _mat_i * _mat_step\n"
+            "            try:\n"
+            f"{block(body, ' ' * 16)}\n"
+            "                if _mat_isfinite(_mat_y):\n"
+            "                    _mat_xs.append(x); _mat_ys.append(_mat_y)\n"
+            f"            except {_EVAL_ERRORS}:\n"
+            "                pass\n"
+            "        return _mat_xs, _mat_ys\n"
+            "\n"
+            f"    def _scalar(x{bound}):\n"
+            f"{header}\n"
+            "        try:\n"
+            f"{block(body, ' ' * 12)}\n"
+            "            return float(_mat_y)\n"
+            f"        except {_EVAL_ERRORS}:\n"
+            "            return math.nan\n"
+            "\n"
+            "    return _batch, _sample, _scalar\n"
+        )
+
+    def __call__(self, xs: Iterable[float]) -> array:
+        xs = xs if isinstance(xs, array) else array('d', xs)
+        out = array('d', bytes(8 * len(xs)))
+        self.evaluate(xs, out)
+        return out
+
+    def linspace(self, xmin: float, xmax: float, n: int) -> Tuple[array, array]:
+        step = (xmax - xmin) / (n - 1)
+        xs = array('d', [xmin + i * step for i in range(n)])
+        return xs, self(xs)
+
+    def sample(self, xmin: float, xmax: float, n: int) -> Tuple[List[float], List[float]]:
+        """n puntos equiespaciados, conservando sólo los valores reales y finitos."""
+        return self._sample(xmin, (xmax - xmin) / (n - 1), n)
+
+
+def compile_batch(expr: sp.Expr, params: Sequence[sp.Symbol] = ()) -> Optional[BatchEvaluator]:
+    """BatchEvaluator para ``expr``, o None si contiene algo que el generador no sabe imprimir."""
+    try:
+        return BatchEvaluator(expr, params)
+    except Exception:
+        return None
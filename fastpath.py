@@ -0,0 +1,128 @@
+from typing import List, Tuple, Optional
+import sympy as sp
+
+x = sp.symbols('x')
+
+POLYNOMIAL = "polynomial"
+RATIONAL = "rational"
+GENERIC = "generic"
+
+
+def classify(expr: sp.Expr) -> str:
+    """Clasifica f para elegir el algoritmo: polinomio, racional o genérico."""
+    try:
+        if expr.is_zero:
+            return GENERIC
+        if expr.is_polynomial(x):
+            kind = POLYNOMIAL
+        elif expr.is_rational_function(x):
+            kind = RATIONAL
+        else:
+            return GENERIC
+        numer, denom = sp.fraction(sp.cancel(expr))
+        # real_roots sólo está disponible para coeficientes racionales
+        for part in (numer, denom, sp.fraction(sp.together(expr))[1]):
+            dom = sp.Poly(part, x).domain
+            if not (dom.is_ZZ or dom.is_QQ):
+                return GENERIC
+        return kind
+    except (sp.PolynomialError, TypeError, ValueError):
+        return GENERIC
+
+
+def real_roots(poly_expr: sp.Expr) -> List[Tuple[sp.Expr, int]]:
+    """Raíces reales distintas de un polinomio en x, en orden creciente, con su multiplicidad."""
+    p = sp.Poly(poly_expr, x)
+    if p.degree() <= 0:
+        return []
+    roots: List[Tuple[sp.Expr, int]] = []
+    for r in p.real_roots():
+        if roots and roots[-1][0] == r:
+            roots[-1] = (r, roots[-1][1] + 1)
+        else:
+            roots.append((r, 1))
+    return roots
+
+
+def split(expr: sp.Expr) -> Tuple[sp.Expr, sp.Expr]:
+    """Numerador y denominador ya cancelados (sirven para límites y derivadas, no para el dominio)."""
+    return sp.fraction(sp.cancel(expr))
+
+
+def excluded_points(expr: sp.Expr) -> List[sp.Expr]:
+    """Ceros reales del denominador sin cancelar: los polos y también los huecos, como x = 1
+    en (x**2 - 1)/(x - 1), que ``sp.cancel`` haría desaparecer."""
+    _, denom = sp.fraction(sp.together(expr))
+    return [r for r, _ in real_roots(denom)]
+
+
+def domain(expr: sp.Expr) -> sp.sets.Set:
+    """Dominio de un polinomio o función racional: los reales menos los ceros del denominador."""
+    points = excluded_points(expr)
+    if not points:
+        return sp.S.Reals
+    return sp.Complement(sp.S.Reals, sp.FiniteSet(*points))
+
+
+def roots_in_domain(expr: sp.Expr) -> List[Tuple[sp.Expr, int]]:
+    numer, _ = split(expr)
+    points = set(excluded_points(expr))
+    return [(r, m) for r, m in real_roots(numer) if r not in points]
+
+
+def _limit_at_infinity(numer: sp.Expr, denom: sp.Expr, direction: int) -> sp.Expr:
+    # Sólo importan los términos principales de numerador y denominador.
+    pn, pd = sp.Poly(numer, x), sp.Poly(denom, x)
+    diff = pn.degree() - pd.degree()
+    ratio = pn.LC() / pd.LC()
+    if diff < 0:
+        return sp.S.Zero
+    if diff == 0:
+        return ratio
+    sign = sp.sign(ratio) * (direction ** diff)
+    return sp.oo if sign > 0 else -sp.oo
+
+
+def _value_at(expr: sp.Expr, c: sp.Expr) -> sp.Expr:
+    # En raíces racionales la sustitución ya es exacta y simplificada; simplify sólo encarece CRootOf.
+    return expr.subs(x, c)
+
+
+def _piece_range(expr: sp.Expr, numer: sp.Expr, denom: sp.Expr, a: sp.Expr, b: sp.Expr,
+                 critical: List[sp.Expr]) -> sp.sets.Set:
+    # f es continua en (a, b): su imagen es un intervalo cuyos extremos son
+    # valores en puntos críticos o límites laterales en los extremos.
+    candidates: List[Tuple[sp.Expr, bool]] = []
+    for c in critical:
+        if (a == -sp.oo or c > a) and (b == sp.oo or c < b):
+            candidates.append((_value_at(expr, c), True))
+    for end, side in ((a, "+"), (b, "-")):
+        if end in (sp.oo, -sp.oo):
+            candidates.append((_limit_at_infinity(numer, denom, 1 if end == sp.oo else -1), False))
+        else:
+            candidates.append((sp.limit(expr, x, end, side), False))
+
+    lo = min(v for v, _ in candidates)
+    hi = max(v for v, _ in candidates)
+    lo_closed = any(attained and v == lo for v, attained in candidates)
+    hi_closed = any(attained and v == hi for v, attained in candidates)
+    if lo == hi:
+        return sp.FiniteSet(lo)
+    return sp.Interval(lo, hi, left_open=not lo_closed, right_open=not hi_closed)
+
+
+def function_range(expr: sp.Expr) -> Optional[sp.sets.Set]:
+    """Recorrido exacto a partir de los puntos críticos de f' y los límites en polos e infinito."""
+    if not expr.has(x):
+        return sp.FiniteSet(expr)
+    numer, denom = split(expr)
+    points = excluded_points(expr)
+    if not denom.has(x) and not points and sp.Poly(numer, x).degree() % 2 == 1:
+        return sp.Interval(-sp.oo, sp.oo)
+    dnumer, _ = sp.fraction(sp.cancel(sp.diff(expr, x)))
+    critical = [r for r, _ in real_roots(dnumer)]
+
+    # Se corta también en los huecos: allí el valor límite no se alcanza
+    bounds = [-sp.oo] + points + [sp.oo]
+    pieces = [_piece_range(expr, numer, denom, a, b, critical) for a, b in zip(bounds, bounds[1:])]
+    return sp.Union(*pieces)
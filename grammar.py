@@ -0,0 +1,304 @@
+"""Tokenizador y parser por precedencia de operadores para f(x), sin eval.
+
+Construye la expresión SymPy directamente a partir de una lista blanca de nombres
+(``ALLOWED_FUNCS`` de parser.py); cualquier otro identificador es un error con su posición.
+``from_srepr`` reconstruye, también sin eval, las expresiones guardadas en el almacén.
+"""
+import ast
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Tuple
+
+import sympy as sp
+
+MAX_DEPTH = 100          # paréntesis, llamadas, signos y potencias anidados
+MAX_POWER_BITS = 10_000  # tamaño máximo de una potencia entera calculada al parsear
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z_0-9]*)
+  | (?P<op>\*\*|<=|>=|==|[-+*/^(),<>&|])
+""", re.VERBOSE)
+
+# operador binario -> (precedencia, asociativo a la derecha)
+_BINARY: Dict[str, Tuple[int, bool]] = {
+    "|": (1, False), "&": (2, False),
+    "<": (3, False), "<=": (3, False), ">": (3, False), ">=": (3, False), "==": (3, False),
+    "+": (4, False), "-": (4, False),
+    "*": (5, False), "/": (5, False),
+    "**": (7, True), "^": (7, True),
+}
+_UNARY_PREC = 6  # -x**2 = -(x**2), pero 2*-x es válido
+
+_CONSTANTS: Dict[str, Any] = {"True": sp.true, "False": sp.false}
+
+
+class ParseError(ValueError):
+    """Error de sintaxis; ``position`` es el índice (desde 0) del carácter problemático."""
+
+    def __init__(self, message: str, position: int, text: str = "") -> None:
+        # Los tres argumentos quedan en ``args``: así el error se puede enviar entre procesos (pickle)
+        super().__init__(message, position, text)
+        self.message = message
+        self.position = position
+        self.text = text
+
+    def __str__(self) -> str:
+        return f"{self.message} (posición {self.position + 1})"
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str   # "number", "name", "op" o "end"
+    value: str
+    pos: int
+
+
+def tokenize(text: str) -> List[Token]:
+    tokens: List[Token] = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise ParseError(f"carácter no permitido {text[pos]!r}", pos, text)
+        if m.lastgroup != "space":
+            tokens.append(Token(m.lastgroup, m.group(), pos))
+        pos = m.end()
+    tokens.append(Token("end", "", len(text)))
+    return tokens
+
+
+class ExpressionParser:
+    """Parser de una sola pasada; ``names`` asigna cada identificador permitido a su objeto SymPy."""
+
+    def __init__(self, text: str, names: Mapping[str, Any]) -> None:
+        self.text = text
+        self.names = names
+        self.tokens = tokenize(text)
+        self.i = 0
+        self.depth = 0
+
+    def error(self, message: str, token: Token) -> ParseError:
+        return ParseError(message, token.pos, self.text)
+
+    @property
+    def current(self) -> Token:
+        return self.tokens[self.i]
+
+    def advance(self) -> Token:
+        tok = self.tokens[self.i]
+        self.i += 1
+        return tok
+
+    def enter(self, tok: Token) -> None:
+        """Un nivel más de recursión; se rechaza antes de agotar la pila de Python."""
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise self.error("la expresión está demasiado anidada", tok)
+
+    def expect(self, value: str) -> Token:
+        tok = self.current
+        if tok.value != value or tok.kind != "op":
+            found = f"'{tok.value}'" if tok.kind != "end" else "el final"
+            raise self.error(f"se esperaba '{value}' y se encontró {found}", tok)
+        return self.advance()
+
+    def parse(self) -> Any:
+        if self.current.kind == "end":
+            raise self.error("la expresión está vacía", self.current)
+        result = self.expression(0)
+        tok = self.current
+        if tok.kind != "end":
+            if tok.kind in ("number", "name") or tok.value == "(":
+                raise self.error(f"falta un operador antes de '{tok.value}' (p. ej. 2*x)", tok)
+            raise self.error(f"'{tok.value}' inesperado", tok)
+        if isinstance(result, tuple):
+            raise self.error("una tupla sólo puede ser argumento de una función", self.tokens[0])
+        return result
+
+    def expression(self, min_prec: int) -> Any:
+        left = self.unary()
+        while True:
+            tok = self.current
+            info = _BINARY.get(tok.value) if tok.kind == "op" else None
+            if info is None or info[0] < min_prec:
+                return left
+            prec, right_assoc = info
+            self.advance()
+            if right_assoc:
+                # x**x**x... anida hacia la derecha sin paréntesis: cuenta como profundidad
+                self.enter(tok)
+                right = self.expression(prec)
+                self.depth -= 1
+            else:
+                right = self.expression(prec + 1)
+            left = self.binary(tok, left, right)
+
+    def unary(self) -> Any:
+        tok = self.current
+        if tok.kind == "op" and tok.value in "+-":
+            self.advance()
+            self.enter(tok)
+            operand = self.expression(_UNARY_PREC)
+            self.depth -= 1
+            return -operand if tok.value == "-" else operand
+        return self.primary()
+
+    def primary(self) -> Any:
+        tok = self.advance()
+        if tok.kind == "number":
+            return sp.Integer(tok.value) if tok.value.isdigit() else sp.Float(tok.value)
+        if tok.kind == "name":
+            if self.current.value == "(":
+                return self.call(tok)
+            if tok.value in _CONSTANTS:
+                return _CONSTANTS[tok.value]
+            value = self.names.get(tok.value)
+            if value is None or callable(value) and not isinstance(value, sp.Basic):
+                raise self.error(f"nombre desconocido '{tok.value}'", tok)
+            return value
+        if tok.value == "(":
+            items = self.group(")")
+            return items[0] if len(items) == 1 else tuple(items)
+        if tok.kind == "end":
+            raise self.error("la expresión termina de forma incompleta", tok)
+        raise self.error(f"'{tok.value}' inesperado", tok)
+
+    def group(self, closing: str) -> List[Any]:
+        """Lista de expresiones separadas por coma hasta ``closing`` (ya se consumió la apertura)."""
+        self.enter(self.current)
+        items = [self.expression(0)]
+        while self.current.value == ",":
+            self.advance()
+            items.append(self.expression(0))
+        self.expect(closing)
+        self.depth -= 1
+        return items
+
+    def call(self, name: Token) -> Any:
+        func = self.names.get(name.value)
+        if func is None or isinstance(func, sp.Basic):
+            raise self.error(f"función no permitida '{name.value}'", name)
+        self.advance()  # '('
+        args = self.group(")")
+        try:
+            return func(*args)
+        except Exception as e:
+            raise self.error(f"argumentos inválidos para {name.value}: {e}", name)
+
+    def binary(self, op: Token, left: Any, right: Any) -> Any:
+        if isinstance(left, tuple) or isinstance(right, tuple):
+            raise self.error("una tupla sólo puede ser argumento de una función", op)
+        try:
+            if op.value in ("**", "^"):
+                self._check_power(op, left, right)
+                return left ** right
+            if op.value == "+":
+                return left + right
+            if op.value == "-":
+                return left - right
+            if op.value == "*":
+                return left * right
+            if op.value == "/":
+                return left / right
+            if op.value == "&":
+                return sp.And(left, right)
+            if op.value == "|":
+                return sp.Or(left, right)
+            return {"<": sp.Lt, "<=": sp.Le, ">": sp.Gt, ">=": sp.Ge, "==": sp.Eq}[op.value](left, right)
+        except ParseError:
+            raise
+        except Exception as e:
+            raise self.error(f"operación inválida con '{op.value}': {e}", op)
+
+    def _check_power(self, op: Token, base: Any, exp: Any) -> None:
+        # SymPy calcula 9**9**9 al construirlo: se rechaza antes de bloquear el proceso
+        if isinstance(base, sp.Rational) and isinstance(exp, sp.Integer) and abs(base) not in (0, 1):
+            bits = max(abs(base.p).bit_length(), abs(base.q).bit_length())
+            if bits * abs(int(exp)) > MAX_POWER_BITS:
+                raise self.error("la potencia es demasiado grande", op)
+
+
+def is_incomplete(text: str, names: Mapping[str, Any] = {}) -> bool:
+    """True si ``text`` parece el comienzo de una expresión que se sigue escribiendo: vacía,
+    con paréntesis sin cerrar, terminada en operador o coma, o en un nombre de función (o el
+    prefijo de uno) sin su '('. Es sólo una revisión de tokens, sin construir la expresión."""
+    try:
+        tokens = tokenize(text)[:-1]
+    except ParseError:
+        return False  # un carácter inválido no se arregla escribiendo más: se informa
+    if not tokens:
+        return True
+    depth = sum(1 if t.value == "(" else -1 if t.value == ")" else 0 for t in tokens if t.kind == "op")
+    last = tokens[-1]
+    if depth > 0 or last.kind == "op" and last.value != ")":
+        return True
+    if last.kind == "name" and last.value not in names:
+        return any(name.startswith(last.value) for name in names)
+    return last.kind == "name" and callable(names[last.value]) and not isinstance(names[last.value], sp.Basic)
+
+
+def parse_expression(text: str, names: Mapping[str, Any]) -> Any:
+    """Expresión SymPy de ``text`` usando sólo los identificadores de ``names``; lanza ParseError."""
+    return ExpressionParser(text, names).parse()
+
+
+# ------------------------------
+# Expresiones guardadas (srepr)
+# ------------------------------
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+# Clases que srepr escribe pero que no están en el espacio de nombres de sympy
+_SREPR_EXTRA: Dict[str, Any] = {"ExprCondPair": sp.functions.elementary.piecewise.ExprCondPair}
+
+# Únicas clases que reciben texto (el resto lo pasaría a sympify, que usa eval) y qué texto aceptan
+_STRING_ARGS: Dict[str, Any] = {"Symbol": str.isidentifier, "Float": _is_number}
+
+
+def from_srepr(text: str) -> sp.Basic:
+    """Reconstruye la expresión de ``sp.srepr`` sin eval: sólo acepta llamadas a clases de SymPy
+    con argumentos literales y constantes como ``pi`` u ``oo``. Lanza ValueError si hay otra cosa."""
+    try:
+        tree = ast.parse(text, mode="eval")
+        return _from_node(tree.body)
+    except ValueError:
+        raise
+    except Exception as e:  # SyntaxError, RecursionError, errores de los constructores de SymPy...
+        raise ValueError(f"srepr no válido: {e}") from None
+
+
+def _from_node(node: ast.AST) -> Any:
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        cls = getattr(sp, node.func.id, None) or _SREPR_EXTRA.get(node.func.id)
+        if not (isinstance(cls, type) and issubclass(cls, sp.Basic)):
+            raise ValueError(f"clase no permitida '{node.func.id}'")
+        args = [_from_node(arg) for arg in node.args]
+        for arg in args:
+            if isinstance(arg, str) and not _STRING_ARGS.get(node.func.id, lambda a: False)(arg):
+                raise ValueError(f"argumento de texto no permitido en '{node.func.id}'")
+        kwargs = {}
+        for kw in node.keywords:
+            value = _from_node(kw.value)
+            if kw.arg is None or not isinstance(value, (bool, int)):
+                raise ValueError(f"argumento no permitido en '{node.func.id}'")
+            kwargs[kw.arg] = value
+        return cls(*args, **kwargs)
+    if isinstance(node, ast.Name):
+        value = getattr(sp, node.id, None)  # pi, E, oo, zoo, nan, I, true, false
+        if not isinstance(value, sp.Basic):
+            raise ValueError(f"nombre no permitido '{node.id}'")
+        return value
+    if isinstance(node, ast.Constant) and type(node.value) in (str, int, float, bool):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+        value = _from_node(node.operand)
+        if type(value) in (int, float):
+            return -value
+    raise ValueError(f"elemento no permitido: {ast.dump(node)[:40]}")
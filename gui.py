@@ -1,11 +1,63 @@
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Optional, List, Tuple
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-
-from parser import FunctionParser
-from analyzer import FunctionAnalyzer
-from plotter import FunctionPlotter
+from typing import Any, Dict, Optional, List, Tuple
+
+from worker import BackgroundRunner, RunContext
+from timing import emit, format_breakdown, merge, profiling_enabled
+from warmup import prewarm, prewarm_enabled
+
+# Texto de la barra de estado para cada campo del reporte, a medida que termina
+STAGE_LABELS = {
+    "domain_str": "dominio",
+    "range_str": "recorrido",
+    "x_intercepts": "cortes con X",
+    "y_intercept": "corte con Y",
+    "steps_y_intercept": "pasos del corte con Y",
+    "steps_x_intercepts": "pasos de los cortes con X",
+    "steps_for_x": "evaluación en x",
+}
+
+# Espera tras el último cambio de la vista antes de remuestrear (ms)
+RESAMPLE_DELAY_MS = 150
+
+# Deslizadores de parámetros: rango mínimo, decimales y espera antes de re-analizar (ms)
+PARAM_RANGE = (-10.0, 10.0)
+PARAM_DECIMALS = 1
+PARAM_ANALYSIS_DELAY_MS = 400
+
+# Vista previa al escribir: espera tras la última tecla antes de graficar, y tiempo que la
+# entrada debe quedar estable antes del análisis simbólico completo (ms)
+PREVIEW_DELAY_MS = 250
+PREVIEW_STABLE_MS = 1200
+
+
+def _load_modules() -> None:
+    """Importa SymPy, Matplotlib y los módulos del análisis. Se llama en segundo plano al
+    iniciar, para que la ventana aparezca antes; hasta entonces estos nombres no existen."""
+    global FigureCanvasTkAgg, NavigationToolbar2Tk, FunctionParser, FunctionAnalyzer, \
+        DEFAULT_WINDOW, REPORT_FIELDS, canonical_key, FamilyPlotter, FunctionPlotter, PlotView, \
+        open_default_store, stage_workers
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+    from parser import FunctionParser
+    from analyzer import FunctionAnalyzer, DEFAULT_WINDOW, REPORT_FIELDS, canonical_key, stage_workers
+    from plotter import FamilyPlotter, FunctionPlotter, PlotView
+    from store import open_default_store
+
+
+def parse_params(text: str) -> Dict[str, float]:
+    """``"a=1, b=2.5"`` -> {"a": 1.0, "b": 2.5}; un nombre sin valor vale 1."""
+    params: Dict[str, float] = {}
+    for item in text.replace(";", ",").split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        name = name.strip()
+        try:
+            params[name] = float(value.replace(" ", "")) if value.strip() else 1.0
+        except ValueError:
+            raise ValueError(f"Valor no válido para el parámetro '{name}': {value.strip()}")
+    return params
 
 
 class AnalyzerApp:
@@ -19,18 +71,43 @@ class AnalyzerApp:
         top.pack(fill="x")
 
         ttk.Label(top, text="f(x) =").grid(row=0, column=0, sticky="w")
-        self.fun_entry = ttk.Entry(top, width=60)
+        self.fun_var = tk.StringVar(value="sin(x) + 1/x")
+        self.fun_entry = ttk.Entry(top, width=60, textvariable=self.fun_var)
         self.fun_entry.grid(row=0, column=1, sticky="we", padx=6)
-        self.fun_entry.insert(0, "sin(x) + 1/x")
 
         ttk.Label(top, text="x para evaluar (opcional):").grid(row=0, column=2, padx=(10, 0))
         self.x_entry = ttk.Entry(top, width=10)
         self.x_entry.grid(row=0, column=3, sticky="w")
 
-        self.analyze_btn = ttk.Button(top, text="Analizar y Graficar", command=self.on_analyze)
+        self.analyze_btn = ttk.Button(top, text="Analizar y Graficar", command=self.on_analyze,
+                                      state="disabled")
         self.analyze_btn.grid(row=0, column=4, padx=(10, 0))
 
+        self.cancel_btn = ttk.Button(top, text="Cancelar", command=self.on_cancel, state="disabled")
+        self.cancel_btn.grid(row=0, column=5, padx=(6, 0))
+
+        ttk.Label(top, text="Parámetros:").grid(row=1, column=0, sticky="w", pady=(6, 0))
+        self.params_entry = ttk.Entry(top, width=60)
+        self.params_entry.grid(row=1, column=1, sticky="we", padx=6, pady=(6, 0))
+        ttk.Label(top, text="p. ej. a=1, b=2 (opcional)").grid(row=1, column=2, columnspan=2,
+                                                                sticky="w", padx=(10, 0), pady=(6, 0))
+        self.live_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(top, text="Vista previa al escribir", variable=self.live_var).grid(
+            row=1, column=4, columnspan=2, sticky="w", padx=(10, 0), pady=(6, 0))
+
         top.columnconfigure(1, weight=1)
+
+        # --- Estado del análisis en segundo plano ---
+        status = ttk.Frame(master, padding=(10, 0))
+        status.pack(fill="x")
+        self.progress = ttk.Progressbar(status, mode="indeterminate", length=160)
+        self.progress.pack(side="left")
+        self.status_var = tk.StringVar(value="Listo")
+        ttk.Label(status, textvariable=self.status_var).pack(side="left", padx=8)
+
+        # --- Deslizadores de parámetros (se crean al analizar una familia) ---
+        self.sliders = ttk.Frame(master, padding=(10, 4))
+        self.sliders.pack(fill="x")
         keypad = ttk.Frame(master, padding=(10,0))
         keypad.pack(fill="x", pady=(0,8))
 
@@ -54,18 +131,92 @@ class AnalyzerApp:
         mid.add(right, minsize=400)
         self.plot_area = ttk.Frame(right)
         self.plot_area.pack(fill="both", expand=True)
+        self._loading = ttk.Label(self.plot_area, text="Cargando SymPy y Matplotlib…", anchor="center")
+        self._loading.pack(fill="both", expand=True)
+
+        # Almacén, parser y gráfico se crean en _on_modules_loaded
+        self.store = None
+        self.parser = None
+
+        # Análisis y muestreo fuera del hilo de Tk; un nuevo análisis reemplaza al anterior
+        self.runner = BackgroundRunner(master)
+        # Remuestreo de la vista al hacer zoom o desplazar (independiente del análisis)
+        self.view_runner = BackgroundRunner(master)
+        self._resample_after: Optional[str] = None
+        # Curva de la familia al mover un deslizador; el análisis completo se pospone
+        self.param_runner = BackgroundRunner(master)
+        self._family_plotter: Optional["FamilyPlotter"] = None
+        self._param_values: Dict[str, float] = {}
+        self._param_vars: Dict[str, tk.StringVar] = {}
+        self._param_scales: Dict[str, ttk.Scale] = {}
+        self._param_dirty = False
+        self._param_after: Optional[str] = None
+        self._request: Tuple[str, Optional[float]] = ("", None)
+        # Vista previa: sólo curva con cada cambio; el análisis completo cuando la entrada se estabiliza
+        self.preview_runner = BackgroundRunner(master)
+        self._preview_after: Optional[str] = None
+        self._stable_after: Optional[str] = None
+        self._preview_key: Optional[str] = None
+        self._analyzed_key: Optional[str] = None
+        # Precalentamiento de las cachés de SymPy; cede ante cualquier análisis del usuario
+        self.warm_runner = BackgroundRunner(master)
 
-        self._show_blank_plot()
+        # Matplotlib connections (para evitar duplicados)
+        self._mpl_cids: List[Tuple["FigureCanvasTkAgg", int]] = []
+
+        # Resultados parciales del análisis en curso (se muestran a medida que llegan)
+        self._fields: Dict[str, Any] = {}
+        self._estimated: List[str] = []
+        self._expr_str: Optional[str] = None
+        self._plotter: Optional["FunctionPlotter"] = None
+        self._draw_seconds: Optional[float] = None
+
+        # La ventana ya es visible: SymPy y Matplotlib se importan en segundo plano
+        self.progress.start(12)
+        self.status_var.set("Cargando módulos…")
+        self.runner.start(self._load_task, on_done=self._on_modules_loaded, on_error=self._on_load_error)
+
+    def _load_task(self, ctx: RunContext) -> float:
+        t0 = time.perf_counter()
+        _load_modules()
+        # Procesos de las etapas con plazo listos antes del primer análisis
+        stage_workers().start()
+        return time.perf_counter() - t0
+
+    def _on_load_error(self, e: Exception):
+        self.progress.stop()
+        self.status_var.set("Error al cargar los módulos")
+        self._loading.configure(text=f"No se pudieron cargar los módulos:\n{e}")
+
+    def _on_modules_loaded(self, seconds: float):
+        self._loading.destroy()
+        # Almacén persistente opcional (None si está deshabilitado)
+        self.store = open_default_store()
 
         # Parser
-        self.parser = FunctionParser()
+        self.parser = FunctionParser(store=self.store)
 
-        # Matplotlib connections (para evitar duplicados)
-        self._mpl_cids: List[Tuple[FigureCanvasTkAgg, int]] = []
+        # Una sola figura, canvas y toolbar para toda la sesión; cada análisis actualiza sus artistas
+        self.view = PlotView()
+        self.canvas = FigureCanvasTkAgg(self.view.fig, master=self.plot_area)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        toolbar_frame = ttk.Frame(self.plot_area)
+        toolbar_frame.pack(fill="x")
+        self.toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame, pack_toolbar=False)
+        self.toolbar.pack(side="left")
+        self.view.attach(self.canvas)
+        # Scroll zoom centrado en el puntero
+        self._attach_scroll_zoom(self.canvas, self.view.fig)
+        self.view.ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
 
-        # Mantener referencias a canvas/toolbar
-        self.canvas: Optional[FigureCanvasTkAgg] = None
-        self.toolbar: Optional[NavigationToolbar2Tk] = None
+        self._show_blank_plot()
+        # Las teclas y el teclado en pantalla escriben en fun_var: ambos disparan la vista previa
+        self.fun_var.trace_add("write", self._on_text_changed)
+        self.analyze_btn.configure(state="normal")
+        self._set_idle(f"Listo (módulos cargados en {seconds:.1f} s)")
+        if prewarm_enabled():
+            self.warm_runner.start(lambda ctx: prewarm(checkpoint=ctx.progress),
+                                   on_done=lambda _: None, on_error=lambda _: None)
 
     # ------------------------------
     # Helpers para conexiones Matplotlib
@@ -80,7 +231,7 @@ class AnalyzerApp:
                 pass
         self._mpl_cids = []
 
-    def _attach_scroll_zoom(self, canvas: FigureCanvasTkAgg, fig):
+    def _attach_scroll_zoom(self, canvas: "FigureCanvasTkAgg", fig):
         """Zoom con la rueda del mouse, centrado en el puntero y limitado al eje."""
         # Limpia conexiones anteriores (si re-graficaste)
         self._clear_mpl_connections()
@@ -213,105 +364,427 @@ class AnalyzerApp:
                 messagebox.showerror("Error", "x debe ser un número real (usa punto decimal).")
                 self._show_blank_plot("Error — listo para reintentar")
                 return
-
         try:
-            parsed = self.parser.parse(fx_text)
-            analyzer = FunctionAnalyzer(parsed.expr)
-            report = analyzer.analyze(x_value=x_value)
-        except Exception as e:
-            messagebox.showwarning("Error al analizar", f"No pude analizar/graficar: {e}")
-            self._show_blank_plot("Error al analizar — listo para reintentar")
+            params = parse_params(self.params_entry.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
 
+        self._cancel_preview()
+        self._request = (fx_text, x_value)
+        self._preview_key = None  # la próxima edición vuelve a graficar
+        self._start_analysis(fx_text, x_value, params)
+
+    def _start_analysis(self, fx_text: str, x_value: Optional[float], params: Dict[str, float],
+                        replot: bool = True):
+        """``replot=False`` (cambio de parámetro): la curva ya está dibujada, sólo se re-analiza."""
+        self.warm_runner.cancel()
+        self._cancel_param_analysis()
+        self._fields = {}
+        self._estimated = []
+        self._expr_str = None
+        if replot:
+            self._plotter = None
+        self._draw_seconds = None
+        self._started = time.perf_counter()
+        self.runner.start(
+            lambda ctx: self._analysis_task(ctx, fx_text, x_value, params, replot),
+            on_done=self._show_timings,
+            on_error=self._show_analysis_error,
+            on_progress=self.status_var.set,
+            on_partial=self._on_partial,
+        )
+        self.cancel_btn.configure(state="normal")
+        self.progress.start(12)
+        self.status_var.set("Analizando…")
+
+    def on_cancel(self):
+        self.runner.cancel()
+        self._set_idle("Cancelado")
+
+    def _set_idle(self, text: str = "Listo"):
+        self.progress.stop()
+        self.cancel_btn.configure(state="disabled")
+        self.status_var.set(text)
+
+    def _analysis_task(self, ctx: RunContext, fx_text: str, x_value: Optional[float],
+                       params: Optional[Dict[str, float]] = None, replot: bool = True):
+        """Se ejecuta en el hilo de trabajo: no toca widgets, sólo informa por ``ctx``.
+
+        Primero entrega la curva (sólo necesita la función compilada) y después cada
+        campo del análisis simbólico a medida que termina.
+        """
+        ctx.progress("Interpretando la función…")
+        parsed = self.parser.parse(fx_text, params=params)
+        # La curva de cada valor de los parámetros se muestrea aparte (FamilyPlotter): no se guarda
+        store = self.store if parsed.family is None else None
+        plotter = FunctionPlotter(parsed.compiled, store=store)
+        curve = None
+        if replot:
+            ctx.post(("family", parsed.family, dict(params or {})))
+            ctx.progress("Muestreando…")
+            try:
+                curve = plotter.curve(x_value=x_value, window=DEFAULT_WINDOW)
+            except Exception as e:
+                ctx.post(("plot_error", e))
+            else:
+                ctx.post(("curve", plotter, curve, x_value))
+
+        # Las mismas muestras del gráfico alimentan la búsqueda numérica de raíces
+        samples = plotter.sample_points(*DEFAULT_WINDOW)
+        analyzer = FunctionAnalyzer(parsed.compiled, store=store, samples=samples,
+                                    profile=profiling_enabled())
+        ctx.post(("expr", str(analyzer.expr)))
+        if analyzer.profile:
+            # MAT1185_PROFILE: análisis secuencial bajo cProfile (sin resultados parciales)
+            ctx.progress("Analizando (perfilado)…")
+            report = analyzer.analyze(x_value=x_value)
+            for name in REPORT_FIELDS:
+                ctx.post(("field", name, getattr(report, name), list(report.estimated)))
+            # El texto de cProfile va al panel de resultados (desde el hilo de Tk, como los campos)
+            ctx.post(("profile", report.profile))
+        else:
+            job = analyzer.analyze_async(x_value=x_value)
+            ctx.on_cancel(job.cancel)
+            ctx.progress("Calculando dominio…")
+            for name, value in job.as_completed():
+                ctx.post(("field", name, value, list(job.estimated)))
+                ctx.progress(f"Listo: {STAGE_LABELS.get(name, name)}")
+            report = job.result()
+        return merge(parsed.timings, report.timings, curve.timings if curve else None,
+                     prefixes=["parse", "analyze", "plot"])
+
+    def _show_timings(self, timings):
+        """Barra de estado: desglose de las etapas más lentas del último análisis."""
+        if self._draw_seconds is not None:
+            timings["durations"]["plot.draw"] = self._draw_seconds
+        total = time.perf_counter() - self._started
+        timings["durations"]["total"] = total
+        emit("gui", timings)
+        self._set_idle(f"Listo en {1000 * total:.0f} ms — {format_breakdown(timings, skip=('total', 'analyze.total'))}")
+
+    def _show_analysis_error(self, e: Exception):
+        self._set_idle("Error")
+        messagebox.showwarning("Error al analizar", f"No pude analizar/graficar: {e}")
+        self._show_blank_plot("Error al analizar — listo para reintentar")
+
+    def _on_partial(self, event):
+        kind = event[0]
+        if kind == "family":
+            _, family, params = event
+            self._setup_sliders(family, params)
+        elif kind == "curve":
+            _, plotter, curve, x_value = event
+            self._show_curve(plotter, curve, x_value)
+        elif kind == "plot_error":
+            messagebox.showwarning("Gráfico no disponible", f"No pude generar el gráfico: {event[1]}")
+            self._show_blank_plot("Error al graficar — listo para reintentar")
+        elif kind == "expr":
+            self._expr_str = event[1]
+            self._render_results()
+        elif kind == "profile":
+            self._fields["profile"] = event[1]
+            self._render_results()
+        elif kind == "field":
+            _, name, value, estimated = event
+            self._fields[name] = value
+            self._estimated = estimated
+            self._render_results()
+            if name in ("x_intercepts", "y_intercept"):
+                self._mark_intercepts()
+
+    def _render_results(self):
+        """Reescribe el panel de resultados con los campos ya disponibles (el resto queda como pendiente)."""
+        fields = self._fields
+        pending = "calculando…"
+
+        def value(name):
+            return fields[name] if name in fields else pending
+
         self.results.delete("1.0", tk.END)
-        self.results.insert(tk.END, f"Función: f(x) = {report.expr_str}\n\n")
-        self.results.insert(tk.END, f"Dominio: {report.domain_str}\n")
-        self.results.insert(tk.END, f"Recorrido: {report.range_str}\n\n")
+        self.results.insert(tk.END, f"Función: f(x) = {self._expr_str}\n\n")
+        self.results.insert(tk.END, f"Dominio: {value('domain_str')}\n")
+        self.results.insert(tk.END, f"Recorrido: {value('range_str')}\n\n")
+        if self._estimated:
+            nombres = {"domain": "dominio", "range": "recorrido", "x_intercepts": "cortes con X",
+                       "y_intercept": "corte con Y"}
+            self.results.insert(tk.END, "Aviso: valores estimados numéricamente para: " +
+                                ", ".join(nombres.get(s, s) for s in self._estimated) + "\n\n")
 
         self.results.insert(tk.END, "Intersecciones con el eje X: ")
-        if report.x_intercepts:
-            self.results.insert(tk.END, ", ".join([f"(x={xi})" for xi in report.x_intercepts]) + "\n")
+        if "x_intercepts" not in fields:
+            self.results.insert(tk.END, pending + "\n")
+        elif fields["x_intercepts"]:
+            # Los tramos de infinitos ceros ya vienen como "x ∈ [a, b] ..."
+            self.results.insert(tk.END, ", ".join([xi if xi.startswith("x ∈") else f"(x={xi})"
+                                                   for xi in fields["x_intercepts"]]) + "\n")
         else:
             self.results.insert(tk.END, "—\n")
 
         self.results.insert(tk.END, "Intersección con el eje Y: ")
-        if report.y_intercept is not None:
-            self.results.insert(tk.END, f"(0, {report.y_intercept})\n\n")
+        if "y_intercept" not in fields:
+            self.results.insert(tk.END, pending + "\n\n")
+        elif fields["y_intercept"] is not None:
+            self.results.insert(tk.END, f"(0, {fields['y_intercept']})\n\n")
         else:
             self.results.insert(tk.END, "—\n\n")
 
-        if hasattr(report, "steps_y_intercept") and report.steps_y_intercept:
-            self.results.insert(tk.END, "\n" + report.steps_y_intercept + "\n")
+        if fields.get("steps_y_intercept"):
+            self.results.insert(tk.END, "\n" + fields["steps_y_intercept"] + "\n")
 
-        if hasattr(report, "steps_x_intercepts") and report.steps_x_intercepts:
-            self.results.insert(tk.END, "\n" + report.steps_x_intercepts + "\n")
+        if fields.get("steps_x_intercepts"):
+            self.results.insert(tk.END, "\n" + fields["steps_x_intercepts"] + "\n")
 
-        if report.steps_for_x:
+        if fields.get("steps_for_x"):
             self.results.insert(tk.END, "\nCálculo paso a paso (x evaluada):\n")
-            self.results.insert(tk.END, report.steps_for_x + "\n")
+            self.results.insert(tk.END, fields["steps_for_x"] + "\n")
 
-        for w in self.plot_area.winfo_children():
-            w.destroy()
+        if fields.get("profile"):
+            self.results.insert(tk.END, "\nPerfil (MAT1185_PROFILE, funciones con más tiempo acumulado):\n")
+            self.results.insert(tk.END, fields["profile"])
 
+    def _show_curve(self, plotter: "FunctionPlotter", curve, x_value: Optional[float]):
+        """Dibuja la curva apenas está muestreada; los cortes se agregan después sobre los mismos ejes."""
+        self.view_runner.cancel()
         try:
-            plotter = FunctionPlotter(parsed.expr)
-            # Convertir intersecciones a valores numéricos si es posible
-            xints = []
-            for xi in report.x_intercepts:
-                try:
-                    xints.append(float(xi))
-                except Exception:
-                    pass
-            yint = None
-            if report.y_intercept is not None:
-                try:
-                    yint = float(report.y_intercept)
-                except Exception:
-                    pass
-            pr = plotter.make_figure(x_value=x_value, x_intercepts=xints, y_intercept=yint)
+            self.view.show_curve(curve, x_value=x_value, y_value=plotter.point_value(x_value))
+        except Exception as e:
+            messagebox.showwarning("Gráfico no disponible", f"No pude generar el gráfico: {e}")
+            self._show_blank_plot("Error al graficar — listo para reintentar")
+            return
+        self._plotter = plotter
+        self._cancel_resample()  # los límites nuevos no requieren remuestrear
+        self.toolbar.update()  # la vista inicial de "Inicio" pasa a ser la nueva curva
+        t0 = time.perf_counter()
+        self.canvas.draw()
+        self._draw_seconds = time.perf_counter() - t0
 
-            # Mantén referencias en self para que no se recolecten
-            self.canvas = FigureCanvasTkAgg(pr.fig, master=self.plot_area)
-            self.canvas.draw()
-            self.canvas.get_tk_widget().pack(fill="both", expand=True)
+    # ------------------------------
+    # Vista previa al escribir
+    # ------------------------------
+    def _on_text_changed(self, *_):
+        if not self.live_var.get():
+            return
+        # Lo que se estaba calculando corresponde a un texto anterior
+        self._cancel_preview()
+        if self.runner.busy():
+            self.runner.cancel()
+            self._set_idle("Editando…")
+        self._preview_after = self.master.after(PREVIEW_DELAY_MS, self._preview)
+
+    def _cancel_preview(self):
+        for name in ("_preview_after", "_stable_after"):
+            after_id = getattr(self, name)
+            if after_id is not None:
+                self.master.after_cancel(after_id)
+                setattr(self, name, None)
+        self.preview_runner.cancel()
+
+    def _preview_inputs(self) -> Optional[Tuple[str, Optional[float], Dict[str, float]]]:
+        """Texto, x y parámetros actuales, o None si algo no es válido todavía (sin avisos)."""
+        fx_text = self.fun_entry.get().strip()
+        try:
+            params = parse_params(self.params_entry.get())
+            x_text = self.x_entry.get().strip()
+            x_value = float(x_text.replace(",", ".")) if x_text else None
+        except ValueError:
+            return None
+        if self.parser.is_incomplete(fx_text, params):
+            return None
+        return fx_text, x_value, params
+
+    def _preview(self):
+        self._preview_after = None
+        inputs = self._preview_inputs()
+        if inputs is None:
+            return
+        fx_text, x_value, params = inputs
+        last_key = self._preview_key
+        self.warm_runner.cancel()
+
+        def task(ctx):
+            # Sin simplificar: sólo hace falta la curva y la forma canónica para comparar
+            parsed = self.parser.parse(fx_text, simplify=False, params=params or None)
+            key = canonical_key(parsed.expr)
+            if key == last_key:
+                return key, parsed, None, None
+            ctx.progress("Muestreando…")
+            plotter = FunctionPlotter(parsed.compiled, store=None if parsed.family else self.store)
+            return key, parsed, plotter, plotter.curve(x_value=x_value, window=DEFAULT_WINDOW)
+
+        self.preview_runner.start(
+            task,
+            on_done=lambda result: self._apply_preview(inputs, *result),
+            on_error=lambda e: self.status_var.set(str(e)),
+        )
+
+    def _apply_preview(self, inputs, key: str, parsed, plotter, curve):
+        fx_text, x_value, params = inputs
+        self._request = (fx_text, x_value)  # lo que usan los deslizadores al re-analizar
+        if plotter is not None:
+            # La expresión cambió: nueva curva; los resultados anteriores ya no corresponden
+            self._preview_key = key
+            self._setup_sliders(parsed.family, params)
+            self._fields = {}
+            self._estimated = []
+            self._expr_str = str(parsed.expr)
+            self._render_results()
+            self._show_curve(plotter, curve, x_value)
+            self.status_var.set("Vista previa")
+        if key != self._analyzed_key:
+            self._stable_after = self.master.after(PREVIEW_STABLE_MS,
+                                                   lambda: self._analyze_stable(key, inputs))
+
+    def _analyze_stable(self, key: str, inputs):
+        self._stable_after = None
+        fx_text, x_value, params = inputs
+        self._analyzed_key = key
+        self._start_analysis(fx_text, x_value, params, replot=False)
 
-            # Toolbar
-            toolbar_frame = ttk.Frame(self.plot_area)
-            toolbar_frame.pack(fill="x")
-            self.toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame, pack_toolbar=False)
-            self.toolbar.update()
-            self.toolbar.pack(side="left")
+    # ------------------------------
+    # Parámetros
+    # ------------------------------
+    def _setup_sliders(self, family, params: Dict[str, float]):
+        """Un deslizador por parámetro de la familia (ninguno si la función no tiene parámetros)."""
+        self.param_runner.cancel()
+        self._param_dirty = False
+        names = [p.name for p in family.params] if family is not None else []
+        if family is None or list(self._param_vars) != names:
+            for child in self.sliders.winfo_children():
+                child.destroy()
+            self._param_vars = {}
+            self._param_scales = {}
+        self._family_plotter = None  # ``scale.set`` llama a _on_slider: se ignora mientras se arma
+        self._param_values = {name: params.get(name, 1.0) for name in names}
+        for row, name in enumerate(names):
+            value = self._param_values[name]
+            lo, hi = min(PARAM_RANGE[0], value), max(PARAM_RANGE[1], value)
+            if name in self._param_vars:
+                # Deslizador reutilizado: el valor nuevo puede caer fuera del rango anterior
+                self._param_vars[name].set(f"{value:g}")
+                self._param_scales[name].configure(from_=lo, to=hi)
+                self._param_scales[name].set(value)
+                continue
+            var = tk.StringVar(value=f"{value:g}")
+            self._param_vars[name] = var
+            ttk.Label(self.sliders, text=f"{name} =").grid(row=row, column=0, sticky="w")
+            scale = ttk.Scale(self.sliders, from_=lo, to=hi, length=360,
+                              command=lambda raw, n=name: self._on_slider(n, raw))
+            scale.set(value)
+            self._param_scales[name] = scale
+            scale.grid(row=row, column=1, sticky="we", padx=6)
+            ttk.Label(self.sliders, textvariable=var, width=8).grid(row=row, column=2, sticky="w")
+        self._family_plotter = FamilyPlotter(family) if family is not None else None
+
+    def _on_slider(self, name: str, raw: str):
+        value = round(float(raw), PARAM_DECIMALS)
+        if self._family_plotter is None or self._param_values.get(name) == value:
+            return
+        self._param_values[name] = value
+        self._param_vars[name].set(f"{value:g}")
+        self.params_entry.delete(0, tk.END)
+        self.params_entry.insert(0, ", ".join(f"{n}={v:g}" for n, v in self._param_values.items()))
+        # Los cortes y resultados mostrados ya no corresponden: se recalculan al soltar
+        self.runner.cancel()
+        self._set_idle(f"Parámetros: {self.params_entry.get()}")
+        self.view.set_intercepts([], None)
+        self._request_param_curve()
+        self._cancel_param_analysis()
+        self._param_after = self.master.after(PARAM_ANALYSIS_DELAY_MS, self._analyze_params)
+
+    def _request_param_curve(self):
+        # Una sola curva en vuelo: durante un arrastre se muestrea el último valor al terminar la anterior
+        if self.param_runner.busy():
+            self._param_dirty = True
+            return
+        self._param_dirty = False
+        family_plotter = self._family_plotter
+        params = dict(self._param_values)
+        x_value = self._request[1]
+        ax = self.view.ax
+        xmin, xmax = ax.get_xlim()
+        pixels = max(int(ax.get_window_extent().width), 100)
+
+        def task(ctx):
+            plotter, curve = family_plotter.view_curve(params, xmin, xmax, pixels)
+            return plotter, curve, plotter.point_value(x_value)
+
+        self.param_runner.start(
+            task,
+            on_done=lambda result: self._apply_param_curve(family_plotter, *result),
+            on_error=lambda e: self._apply_param_curve(family_plotter, None, None, None),
+        )
+
+    def _apply_param_curve(self, family_plotter: "FamilyPlotter", plotter, curve, y_value):
+        if family_plotter is not self._family_plotter:
+            return
+        if curve is not None:
+            self._plotter = plotter  # el zoom posterior remuestrea con estos valores
+            self.view.set_curve_data(curve.xs, curve.ys)
+            self.view.set_point(self._request[1], y_value)
+            self.canvas.draw_idle()
+        if self._param_dirty:
+            self._request_param_curve()
+
+    def _analyze_params(self):
+        self._param_after = None
+        fx_text, x_value = self._request
+        self._start_analysis(fx_text, x_value, dict(self._param_values), replot=False)
+
+    def _cancel_param_analysis(self):
+        if self._param_after is not None:
+            self.master.after_cancel(self._param_after)
+            self._param_after = None
 
-            # Scroll zoom centrado en el puntero
-            self._attach_scroll_zoom(self.canvas, pr.fig)
+    # ------------------------------
+    # Remuestreo al mover la vista
+    # ------------------------------
+    def _on_xlim_changed(self, ax):
+        # Debounce: durante un arrastre o varios pasos de rueda sólo se remuestrea al final
+        self._cancel_resample()
+        self._resample_after = self.master.after(RESAMPLE_DELAY_MS, self._resample_view)
+
+    def _cancel_resample(self):
+        if self._resample_after is not None:
+            self.master.after_cancel(self._resample_after)
+            self._resample_after = None
+
+    def _resample_view(self):
+        self._resample_after = None
+        if self._plotter is None:
+            return
+        ax = self.view.ax
+        xmin, xmax = ax.get_xlim()
+        pixels = max(int(ax.get_window_extent().width), 100)
+        plotter = self._plotter
+        self.view_runner.start(
+            lambda ctx: plotter.view_curve(xmin, xmax, pixels),
+            on_done=lambda curve: self._apply_view_curve(plotter, curve),
+            on_error=lambda e: None,  # se conserva la curva anterior
+        )
+
+    def _apply_view_curve(self, plotter: "FunctionPlotter", curve):
+        if plotter is not self._plotter:
+            return
+        self.view.set_curve_data(curve.xs, curve.ys)
+        self.canvas.draw_idle()
 
-        except Exception as e:
-            messagebox.showwarning("Gráfico no disponible", f"No pude generar el gráfico: {e}")
-            self._show_blank_plot("Error al graficar — listo para reintentar")
+    def _mark_intercepts(self):
+        # Espera a tener ambos cortes para agregarlos de una vez (una sola actualización de la leyenda)
+        if self._plotter is None or "x_intercepts" not in self._fields or "y_intercept" not in self._fields:
+            return
+        self.view.set_intercepts(self._fields["x_intercepts"], self._fields["y_intercept"])
 
     # ------------------------------
     # Plot vacío de cortesía
     # ------------------------------
     def _show_blank_plot(self, title: str = "Gráfico"):
-        from matplotlib.figure import Figure
-
-        # Limpia conexiones y widgets previos
-        self._clear_mpl_connections()
-        for w in self.plot_area.winfo_children():
-            w.destroy()
-
-        fig = Figure(figsize=(6, 4), dpi=110)
-        ax = fig.add_subplot(111)
-        ax.axhline(0, linewidth=1)
-        ax.axvline(0, linewidth=1)
-        ax.set_title(title)
-        ax.set_xlabel("x")
-        ax.set_ylabel("f(x)")
-        ax.grid(True, alpha=0.2)
-
-        self.canvas = FigureCanvasTkAgg(fig, master=self.plot_area)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.view_runner.cancel()
+        self._cancel_resample()
+        self._plotter = None
+        self.view.clear(title)
+        self.toolbar.update()
+        self.canvas.draw_idle()
 
 
 def launch_app():
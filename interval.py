@@ -0,0 +1,573 @@
+"""Aritmética de intervalos para f(x): cotas garantizadas de f sobre un intervalo de x.
+
+``compile_interval(expr)`` recorre el árbol de SymPy una sola vez (sin eval ni solve) y
+devuelve una función ``F(lo, hi) -> Interval`` con una cota de f([lo, hi]) redondeada hacia
+afuera. Sobre ella, la bisección recursiva permite acotar el recorrido en una ventana,
+descartar subintervalos sin raíces y certificar dónde f no está definida.
+"""
+import heapq
+import math
+import numbers
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import sympy as sp
+
+x = sp.symbols('x')
+
+INF = math.inf
+TWO_PI = 2 * math.pi
+# Más allá de este |x| sin/cos/tan en coma flotante ya no distinguen periodos
+TRIG_LIMIT = 1e15
+
+
+class IntervalUnsupported(ValueError):
+    """La expresión contiene algo que el evaluador de intervalos no sabe acotar."""
+
+
+@dataclass(frozen=True)
+class Interval:
+    """Cota [lo, hi] de los valores de f; vacía (lo > hi) si f no está definida en ningún punto.
+
+    ``total`` es True sólo si f está garantizadamente definida en todo el intervalo de entrada.
+    """
+    lo: float
+    hi: float
+    total: bool = True
+
+    @property
+    def empty(self) -> bool:
+        return self.lo > self.hi
+
+    def contains(self, value: float) -> bool:
+        return self.lo <= value <= self.hi
+
+    def hull(self, other: "Interval") -> "Interval":
+        if self.empty:
+            return Interval(other.lo, other.hi, False)
+        if other.empty:
+            return Interval(self.lo, self.hi, False)
+        return Interval(min(self.lo, other.lo), max(self.hi, other.hi), self.total and other.total)
+
+
+EMPTY = Interval(INF, -INF, False)
+ENTIRE = Interval(-INF, INF, True)
+
+
+# ------------------------------
+# Redondeo hacia afuera
+# ------------------------------
+def _dn(v: float) -> float:
+    return math.nextafter(v, -INF) if math.isfinite(v) else v
+
+
+def _up(v: float) -> float:
+    return math.nextafter(v, INF) if math.isfinite(v) else v
+
+
+def _make(lo: float, hi: float, total: bool = True) -> Interval:
+    """Intervalo con redondeo hacia afuera; un NaN (p. ej. inf - inf) deja la cota sin límite."""
+    lo = -INF if math.isnan(lo) else _dn(lo)
+    hi = INF if math.isnan(hi) else _up(hi)
+    return Interval(lo, hi, total)
+
+
+def _const(value: sp.Expr) -> Interval:
+    v = float(value)
+    if isinstance(value, sp.Integer) and abs(v) < 2 ** 53:
+        return Interval(v, v)
+    return _make(v, v)
+
+
+def _safe(fn: Callable[[float], float], v: float, overflow: float) -> float:
+    try:
+        return fn(v)
+    except OverflowError:
+        return overflow
+
+
+# ------------------------------
+# Operaciones
+# ------------------------------
+def _add(a: Interval, b: Interval) -> Interval:
+    if a.empty or b.empty:
+        return EMPTY
+    return _make(a.lo + b.lo, a.hi + b.hi, a.total and b.total)
+
+
+def _neg(a: Interval) -> Interval:
+    return a if a.empty else Interval(-a.hi, -a.lo, a.total)
+
+
+def _prod(u: float, v: float) -> float:
+    return 0.0 if u == 0 or v == 0 else u * v  # 0·inf = 0: el infinito es sólo una cota
+
+
+def _mul(a: Interval, b: Interval) -> Interval:
+    if a.empty or b.empty:
+        return EMPTY
+    p = (_prod(a.lo, b.lo), _prod(a.lo, b.hi), _prod(a.hi, b.lo), _prod(a.hi, b.hi))
+    return _make(min(p), max(p), a.total and b.total)
+
+
+def _recip(a: Interval) -> Interval:
+    if a.empty or a.lo == a.hi == 0:
+        return EMPTY
+    if a.lo > 0 or a.hi < 0:
+        return _make(1 / a.hi if a.hi != 0 else INF, 1 / a.lo if a.lo != 0 else INF, a.total)
+    # El intervalo contiene el 0: ahí f no está definida
+    if a.lo == 0:
+        return Interval(_dn(1 / a.hi), INF, False)
+    if a.hi == 0:
+        return Interval(-INF, _up(1 / a.lo), False)
+    return Interval(-INF, INF, False)
+
+
+def _clip(a: Interval, lo: float, hi: float = INF, open_lo: bool = False) -> Interval:
+    """Restringe la entrada al dominio [lo, hi] de una función parcial (``open_lo``: (lo, hi])."""
+    if a.empty or a.hi < lo or a.lo > hi or (open_lo and a.hi <= lo):
+        return EMPTY
+    inside = (a.lo > lo if open_lo else a.lo >= lo) and a.hi <= hi
+    return Interval(max(a.lo, lo), min(a.hi, hi), a.total and inside)
+
+
+def _monotone(fn: Callable[[float], float], a: Interval, increasing: bool = True) -> Interval:
+    if a.empty:
+        return EMPTY
+    lo, hi = _safe(fn, a.lo, -INF if increasing else INF), _safe(fn, a.hi, INF if increasing else -INF)
+    if not increasing:
+        lo, hi = hi, lo
+    return _make(lo, hi, a.total)
+
+
+def _ipow(a: Interval, n: int) -> Interval:
+    if a.empty:
+        return EMPTY
+    if n == 0:
+        return Interval(1.0, 1.0, a.total)
+    if n < 0:
+        return _recip(_ipow(a, -n))
+
+    def power(v: float) -> float:
+        try:
+            return v ** n
+        except OverflowError:
+            return math.copysign(INF, v) if n % 2 else INF
+
+    if n % 2 or a.lo >= 0:
+        return _make(power(a.lo), power(a.hi), a.total)
+    if a.hi <= 0:
+        return _make(power(a.hi), power(a.lo), a.total)
+    return Interval(0.0, _up(max(power(a.lo), power(a.hi))), a.total)
+
+
+def _rpow(a: Interval, r: float) -> Interval:
+    """x**r con r no entero: sólo para x >= 0 (x < 0 no es real, como en el evaluador)."""
+    base = _clip(a, 0.0, open_lo=r < 0)
+    if base.empty:
+        return EMPTY
+
+    def power(v: float) -> float:
+        if v == 0:
+            return INF if r < 0 else 0.0
+        return _safe(lambda t: t ** r, v, INF)
+
+    return _monotone(power, base, increasing=r > 0)
+
+
+def _log(a: Interval) -> Interval:
+    base = _clip(a, 0.0, open_lo=True)
+    return _monotone(lambda v: math.log(v) if v > 0 else -INF, base)
+
+
+def _hits(a: Interval, offset: float, period: float) -> bool:
+    """¿Contiene [lo, hi] algún offset + k·period? (con holgura: ante la duda, sí)."""
+    k = math.ceil((a.lo - offset) / period - 1e-9)
+    return offset + k * period <= a.hi + 1e-9 * max(1.0, abs(a.hi))
+
+
+def _periodic(fn: Callable[[float], float], a: Interval, top: float, bottom: float) -> Interval:
+    """sin o cos: ``top``/``bottom`` son las fases de sus máximos y mínimos."""
+    if a.empty:
+        return EMPTY
+    if a.hi - a.lo >= TWO_PI or max(abs(a.lo), abs(a.hi)) > TRIG_LIMIT:
+        return Interval(-1.0, 1.0, a.total)
+    u, v = fn(a.lo), fn(a.hi)
+    lo = -1.0 if _hits(a, bottom, TWO_PI) else max(-1.0, _dn(min(u, v)))
+    hi = 1.0 if _hits(a, top, TWO_PI) else min(1.0, _up(max(u, v)))
+    return Interval(lo, hi, a.total)
+
+
+def _sin(a: Interval) -> Interval:
+    return _periodic(math.sin, a, math.pi / 2, -math.pi / 2)
+
+
+def _cos(a: Interval) -> Interval:
+    return _periodic(math.cos, a, 0.0, math.pi)
+
+
+def _tan(a: Interval) -> Interval:
+    if a.empty:
+        return EMPTY
+    if a.hi - a.lo >= math.pi or max(abs(a.lo), abs(a.hi)) > TRIG_LIMIT or _hits(a, math.pi / 2, math.pi):
+        return Interval(-INF, INF, False)  # contiene (o podría contener) un polo
+    return _make(math.tan(a.lo), math.tan(a.hi), a.total)
+
+
+def _abs(a: Interval) -> Interval:
+    if a.empty or a.lo >= 0:
+        return a
+    if a.hi <= 0:
+        return _neg(a)
+    return Interval(0.0, max(-a.lo, a.hi), a.total)
+
+
+def _cosh(a: Interval) -> Interval:
+    m = _abs(a)
+    return _monotone(lambda v: _safe(math.cosh, v, INF), m)
+
+
+def _step(fn: Callable[[float], float], a: Interval) -> Interval:
+    # floor/ceiling son exactos y monótonos
+    if a.empty:
+        return EMPTY
+    return Interval(float(fn(a.lo)) if math.isfinite(a.lo) else a.lo,
+                    float(fn(a.hi)) if math.isfinite(a.hi) else a.hi, a.total)
+
+
+def _max(a: Interval, b: Interval) -> Interval:
+    if a.empty or b.empty:
+        return EMPTY
+    return Interval(max(a.lo, b.lo), max(a.hi, b.hi), a.total and b.total)
+
+
+def _min(a: Interval, b: Interval) -> Interval:
+    if a.empty or b.empty:
+        return EMPTY
+    return Interval(min(a.lo, b.lo), min(a.hi, b.hi), a.total and b.total)
+
+
+_UNARY: Dict[type, Callable[[Interval], Interval]] = {
+    sp.sin: _sin,
+    sp.cos: _cos,
+    sp.tan: _tan,
+    sp.sec: lambda a: _recip(_cos(a)),
+    sp.csc: lambda a: _recip(_sin(a)),
+    sp.cot: lambda a: _recip(_tan(a)) if not _tan(a).empty else EMPTY,
+    sp.asin: lambda a: _monotone(math.asin, _clip(a, -1.0, 1.0)),
+    sp.acos: lambda a: _monotone(math.acos, _clip(a, -1.0, 1.0), increasing=False),
+    sp.atan: lambda a: _monotone(math.atan, a),
+    sp.sinh: lambda a: _monotone(lambda v: _safe(math.sinh, v, math.copysign(INF, v)), a),
+    sp.cosh: _cosh,
+    sp.tanh: lambda a: _monotone(math.tanh, a),
+    sp.exp: lambda a: _monotone(lambda v: _safe(math.exp, v, INF), a),
+    sp.log: _log,
+    sp.Abs: _abs,
+    sp.floor: lambda a: _step(math.floor, a),
+    sp.ceiling: lambda a: _step(math.ceil, a),
+}
+
+# Condiciones de Piecewise: True / False si valen en todo el intervalo, None si no se sabe
+Cond = Callable[[Interval], Optional[bool]]
+
+
+def _compile_cond(cond: sp.Basic) -> Cond:
+    if cond is sp.true:
+        return lambda X: True
+    if cond is sp.false:
+        return lambda X: False
+    if isinstance(cond, (sp.And, sp.Or)):
+        parts = [_compile_cond(c) for c in cond.args]
+        is_and = isinstance(cond, sp.And)
+
+        def combine(X: Interval) -> Optional[bool]:
+            values = [p(X) for p in parts]
+            if is_and:
+                return False if False in values else True if all(v is True for v in values) else None
+            return True if True in values else False if all(v is False for v in values) else None
+        return combine
+    if isinstance(cond, sp.Not):
+        inner = _compile_cond(cond.args[0])
+        return lambda X: None if inner(X) is None else not inner(X)
+    if isinstance(cond, sp.core.relational.Relational):
+        diff = _compile(cond.lhs - cond.rhs)
+        op = cond.rel_op
+
+        def decide(X: Interval) -> Optional[bool]:
+            d = diff(X)
+            if d.empty:
+                return None
+            if op in ("<", "<="):
+                d, op_ = _neg(d), ">" if op == "<" else ">="
+            else:
+                op_ = op
+            if op_ == ">":
+                return True if d.lo > 0 else False if d.hi <= 0 else None
+            if op_ == ">=":
+                return True if d.lo >= 0 else False if d.hi < 0 else None
+            if op_ == "==":
+                return True if d.lo == d.hi == 0 else False if not d.contains(0.0) else None
+            if op_ == "!=":
+                return False if d.lo == d.hi == 0 else True if not d.contains(0.0) else None
+            return None
+        return decide
+    raise IntervalUnsupported(f"condición no soportada: {cond}")
+
+
+def _compile_piecewise(expr: sp.Piecewise) -> Callable[[Interval], Interval]:
+    branches = [(_compile(e), _compile_cond(c)) for e, c in expr.args]
+
+    def piecewise(X: Interval) -> Interval:
+        result = EMPTY
+        for branch, cond in branches:
+            holds = cond(X)
+            if holds is False:
+                continue
+            value = branch(X)
+            if result is EMPTY:
+                result = value
+            else:
+                result = result.hull(value)
+            if holds is True:
+                return result
+            result = Interval(result.lo, result.hi, False)  # la rama sólo vale en parte del intervalo
+        return Interval(result.lo, result.hi, False)  # puede haber x sin rama aplicable
+    return piecewise
+
+
+def _fold(op: Callable[[Interval, Interval], Interval], parts: List[Callable[[Interval], Interval]]):
+    def folded(X: Interval) -> Interval:
+        acc = parts[0](X)
+        for part in parts[1:]:
+            acc = op(acc, part(X))
+        return acc
+    return folded
+
+
+def _compile(expr: sp.Basic) -> Callable[[Interval], Interval]:
+    if expr == x:
+        return lambda X: X
+    if expr.is_Number or expr.is_NumberSymbol:
+        c = _const(expr)
+        return lambda X: c
+    if not expr.has(x) and expr.is_real:
+        c = _const(sp.N(expr, 20))
+        return lambda X: c
+    if isinstance(expr, sp.Add):
+        return _fold(_add, [_compile(a) for a in expr.args])
+    if isinstance(expr, sp.Mul):
+        return _fold(_mul, [_compile(a) for a in expr.args])
+    if isinstance(expr, sp.Pow):
+        base, exp = _compile(expr.base), expr.exp
+        if exp.is_Integer:
+            n = int(exp)
+            return lambda X: _ipow(base(X), n)
+        if exp.is_Rational and exp.q % 2 == 1 and exp.p % 2 == 0:
+            # x**(2/3): raíz real de x**2, definida también para x < 0 (como Abs(x)**(2/3))
+            r = float(exp)
+            return lambda X: _rpow(_abs(base(X)), r)
+        if exp.is_number:
+            r = float(exp)
+            return lambda X: _rpow(base(X), r)
+        # b**e = exp(e·log b) sólo vale con b > 0
+        power = _compile(sp.exp(exp * sp.log(expr.base, evaluate=False), evaluate=False))
+
+        def general_power(X: Interval) -> Interval:
+            B = base(X)
+            if B.empty:
+                return EMPTY
+            if B.lo > 0:
+                return power(X)
+            # Con b <= 0, f es real sólo en algunos exponentes (p. ej. (-2)**x con x entero)
+            return Interval(-INF, INF, False)
+        return general_power
+    if isinstance(expr, sp.Piecewise):
+        return _compile_piecewise(expr)
+    if isinstance(expr, (sp.Max, sp.Min)):
+        return _fold(_max if isinstance(expr, sp.Max) else _min, [_compile(a) for a in expr.args])
+    op = _UNARY.get(type(expr))
+    if op is not None and len(expr.args) == 1:
+        arg = _compile(expr.args[0])
+        return lambda X: op(arg(X))
+    raise IntervalUnsupported(f"no se puede acotar {type(expr).__name__}")
+
+
+class IntervalFunction:
+    """``F(lo, hi)``: Interval que contiene f(t) para todo t en [lo, hi] donde f está definida."""
+
+    def __init__(self, expr: sp.Expr) -> None:
+        self.expr = expr
+        self._fn = _compile(expr)
+
+    def __call__(self, lo: float, hi: float) -> Interval:
+        return self._fn(Interval(lo, hi))
+
+
+def compile_interval(expr: sp.Expr) -> Optional[IntervalFunction]:
+    """IntervalFunction para ``expr``, o None si contiene algo fuera del conjunto soportado."""
+    try:
+        return IntervalFunction(expr)
+    except (IntervalUnsupported, TypeError, ValueError):
+        return None
+
+
+# ------------------------------
+# Bisección
+# ------------------------------
+@dataclass(frozen=True)
+class RangeEnclosure:
+    """f([a, b]) ⊆ [lower, upper] (garantizado) y f alcanza al menos [attained_lo, attained_hi]."""
+    lower: float
+    upper: float
+    attained_lo: float
+    attained_hi: float
+    evals: int
+
+
+def enclose_range(F: IntervalFunction, f: Callable[[float], float], a: float, b: float,
+                  rel_tol: float = 1e-3, max_evals: int = 3000) -> Optional[RangeEnclosure]:
+    """Cota del recorrido de f sobre [a, b]: bisecta primero los subintervalos que más alejan la
+    cota de lo que f efectivamente alcanza (evaluada en los puntos medios) hasta que la diferencia
+    sea menor que ``rel_tol`` de la escala o se agote ``max_evals``. None si f no está definida."""
+    min_width = (b - a) * 2.0 ** -40
+    boxes: Dict[int, Tuple[float, float, Interval]] = {}
+    low_heap: List[Tuple[float, int]] = []
+    high_heap: List[Tuple[float, int]] = []
+    attained = [INF, -INF]
+    evals = 0
+    next_id = 0
+
+    def point(t: float) -> None:
+        try:
+            v = f(t)
+            # lambdify devuelve int con floor, ceiling, etc.: cualquier real cuenta
+            if not isinstance(v, numbers.Real):
+                return
+            v = float(v)
+        except (ArithmeticError, ValueError, TypeError):
+            return
+        if math.isfinite(v):
+            attained[0] = min(attained[0], v)
+            attained[1] = max(attained[1], v)
+
+    def push(lo: float, hi: float) -> None:
+        nonlocal evals, next_id
+        enc = F(lo, hi)
+        evals += 1
+        if enc.empty:
+            return
+        next_id += 1
+        boxes[next_id] = (lo, hi, enc)
+        heapq.heappush(low_heap, (enc.lo, next_id))
+        heapq.heappush(high_heap, (-enc.hi, next_id))
+
+    def top(heap: List[Tuple[float, int]]) -> Optional[Tuple[float, int]]:
+        while heap and heap[0][1] not in boxes:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    push(a, b)
+    point(a)
+    point(b)
+    frozen_lo, frozen_hi = INF, -INF  # subintervalos ya mínimos que no se pueden partir más
+    while boxes and evals < max_evals:
+        low, high = top(low_heap), top(high_heap)
+        lower = min(low[0] if low else INF, frozen_lo)
+        upper = max(-high[0] if high else -INF, frozen_hi)
+        scale = max(attained[1] - attained[0], abs(attained[0]), abs(attained[1]), 1e-12) \
+            if attained[0] <= attained[1] else 1.0
+        gap_lo = attained[0] - lower if attained[0] <= attained[1] else INF
+        gap_hi = upper - attained[1] if attained[0] <= attained[1] else INF
+        if max(gap_lo, gap_hi) <= rel_tol * scale:
+            break
+        candidate = low if gap_lo >= gap_hi else high
+        if candidate is None:
+            break
+        lo, hi, enc = boxes.pop(candidate[1])
+        if hi - lo <= min_width:
+            frozen_lo, frozen_hi = min(frozen_lo, enc.lo), max(frozen_hi, enc.hi)
+            continue
+        mid = 0.5 * (lo + hi)
+        point(mid)
+        push(lo, mid)
+        push(mid, hi)
+
+    los = [enc.lo for _, _, enc in boxes.values()] + [frozen_lo]
+    his = [enc.hi for _, _, enc in boxes.values()] + [frozen_hi]
+    lower, upper = min(los), max(his)
+    if lower > upper:
+        return None
+    return RangeEnclosure(lower, upper, attained[0], attained[1], evals)
+
+
+def _bisect(F: IntervalFunction, a: float, b: float, keep: Callable[[Interval], Optional[bool]],
+            max_depth: int, max_evals: int) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+    """Parte [a, b] según ``keep(F(sub))``: True = se conserva, False = se descarta, None = se
+    bisecta (hasta ``max_depth``; lo que queda sin decidir se devuelve como dudoso)."""
+    kept: List[Tuple[float, float]] = []
+    unsure: List[Tuple[float, float]] = []
+    stack = [(a, b, 0)]
+    evals = 0
+    while stack:
+        lo, hi, depth = stack.pop()
+        evals += 1
+        decision = keep(F(lo, hi))
+        if decision is True:
+            kept.append((lo, hi))
+        elif decision is None:
+            if depth >= max_depth or evals >= max_evals:
+                unsure.append((lo, hi))
+            else:
+                mid = 0.5 * (lo + hi)
+                stack.append((mid, hi, depth + 1))
+                stack.append((lo, mid, depth + 1))
+    return _merge(kept), _merge(unsure)
+
+
+def _merge(parts: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    merged: List[Tuple[float, float]] = []
+    for lo, hi in sorted(parts):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def root_candidates(F: IntervalFunction, a: float, b: float, max_depth: int = 14,
+                    max_evals: int = 4000) -> List[Tuple[float, float]]:
+    """Subintervalos de [a, b] que pueden contener raíces; fuera de ellos f ≠ 0 está probado."""
+    _, unsure = _bisect(F, a, b, lambda enc: False if enc.empty or not enc.contains(0.0) else None,
+                        max_depth, max_evals)
+    return unsure
+
+
+def undefined_parts(F: IntervalFunction, a: float, b: float, max_depth: int = 12,
+                    max_evals: int = 2000) -> List[Tuple[float, float]]:
+    """Subintervalos de [a, b] donde está probado que f no está definida en ningún punto."""
+    undefined, _ = _bisect(F, a, b, lambda enc: True if enc.empty else False if enc.total else None,
+                           max_depth, max_evals)
+    return undefined
+
+
+def format_bound(value: float, down: bool, digits: int = 6) -> str:
+    """Cota redondeada hacia afuera a ``digits`` cifras (un subnormal se muestra como 0)."""
+    if math.isinf(value):
+        return "-∞" if value < 0 else "∞"
+    if abs(value) < 2.2250738585072014e-308:
+        return "0"
+    text = f"{value:.{digits}g}"
+    shown = float(text)
+    if (shown > value) if down else (shown < value):
+        exponent = math.floor(math.log10(abs(value))) - digits + 1
+        step = 10.0 ** exponent
+        shown = (math.floor(value / step) if down else math.ceil(value / step)) * step
+        text = f"{shown:.{digits}g}"
+    return text
+
+
+def format_interval(lo: float, hi: float, inward: bool = False) -> str:
+    """[lo, hi] redondeado hacia afuera (una cota) o hacia adentro (``inward``: un tramo probado)."""
+    left = "(" if math.isinf(lo) else "["
+    right = ")" if math.isinf(hi) else "]"
+    return f"{left}{format_bound(lo, not inward)}, {format_bound(hi, inward)}{right}"
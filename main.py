@@ -1,4 +1,18 @@
-from gui import launch_app
+import sys
+
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["batch"]:
+        # Análisis por lotes sin interfaz gráfica
+        from batch import main
+        sys.exit(main(sys.argv[2:]))
+    if sys.argv[1:2] == ["table"]:
+        # Tabla de valores de f(x) a CSV/JSONL
+        from table import main
+        sys.exit(main(sys.argv[2:]))
+    if sys.argv[1:2] == ["serve"]:
+        # Servicio HTTP local
+        from service import main
+        sys.exit(main(sys.argv[2:]))
+    from gui import launch_app
     launch_app()
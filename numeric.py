@@ -0,0 +1,408 @@
+from typing import Any, Callable, List, Optional, Tuple
+import bisect
+import math
+
+# Tolerancias del buscador de raíces
+X_TOL = 1e-12
+F_TOL = 1e-6
+MAX_ITER = 200
+
+
+def _value(f: Callable[[float], float], xi: float) -> Optional[float]:
+    try:
+        yi = f(xi)
+    except Exception:
+        return None
+    if yi is None or isinstance(yi, complex) or not math.isfinite(yi):
+        return None
+    return yi
+
+
+def sample_points(f: Callable[[float], float], xmin: float, xmax: float,
+                  n: int = 1000, batch: Any = None) -> Tuple[List[float], List[float]]:
+    """Evalúa f en n puntos equiespaciados, descartando los puntos donde no es real y finita.
+
+    Si se entrega ``batch`` (un ``evaluator.BatchEvaluator``) se evalúa todo en una sola pasada.
+    """
+    if batch is not None:
+        return batch.sample(xmin, xmax, n)
+    xs, ys = [], []
+    step = (xmax - xmin) / (n - 1)
+    for i in range(n):
+        xi = xmin + i * step
+        yi = _value(f, xi)
+        if yi is not None:
+            xs.append(xi); ys.append(yi)
+    return xs, ys
+
+
+def refine_root(f: Callable[[float], float], a: float, b: float,
+                fa: float, fb: float) -> Optional[float]:
+    """Refina una raíz en [a, b] con fa·fb < 0 (regula falsi de Illinois; converge siempre)."""
+    side = 0
+    for _ in range(MAX_ITER):
+        c = (a * fb - b * fa) / (fb - fa)
+        if not (min(a, b) < c < max(a, b)):
+            c = 0.5 * (a + b)
+        fc = _value(f, c)
+        if fc is None:
+            return None
+        if fc == 0 or abs(b - a) < X_TOL * max(1.0, abs(c)):
+            return c
+        if fc * fb > 0:
+            b, fb = c, fc
+            if side == -1:
+                fa *= 0.5
+            side = -1
+        else:
+            a, fa = c, fc
+            if side == 1:
+                fb *= 0.5
+            side = 1
+    return 0.5 * (a + b)
+
+
+def _overlaps(candidates: List[Tuple[float, float]], a: float, b: float) -> bool:
+    """¿Corta [a, b] alguno de los intervalos ordenados ``candidates``?"""
+    i = bisect.bisect_right(candidates, (b, math.inf))
+    return i > 0 and candidates[i - 1][1] >= a
+
+
+def _step(xs: List[float]) -> float:
+    return (xs[-1] - xs[0]) / max(len(xs) - 1, 1) if xs else 0.0
+
+
+def _zero_runs(xs: List[float], ys: List[float], step: float) -> List[Tuple[int, int]]:
+    """Índices (i, j) de cada tramo de muestras contiguas con f = 0 (i == j si es un punto aislado)."""
+    runs: List[Tuple[int, int]] = []
+    i = 0
+    while i < len(xs):
+        if ys[i] != 0:
+            i += 1
+            continue
+        j = i
+        while j + 1 < len(xs) and ys[j + 1] == 0 and xs[j + 1] - xs[j] <= 1.5 * step:
+            j += 1
+        runs.append((i, j))
+        i = j + 1
+    return runs
+
+
+def zero_runs(xs: List[float], ys: List[float]) -> List[Tuple[float, float]]:
+    """Tramos [a, b] donde f vale 0 en dos o más muestras contiguas: f se anula en todo un
+    intervalo (p. ej. f = 0 o floor(x) en [0, 1)) y no tiene sentido listar raíces."""
+    return [(xs[i], xs[j]) for i, j in _zero_runs(xs, ys, _step(xs)) if j > i]
+
+
+def find_roots(f: Callable[[float], float], xs: List[float], ys: List[float],
+               denom: Optional[Callable[[float], float]] = None,
+               candidates: Optional[List[Tuple[float, float]]] = None) -> List[float]:
+    """Raíces de f a partir de muestras (xs, ys): cambios de signo refinados, sin polos ni duplicados.
+
+    ``denom`` es el denominador de f (de ``sp.fraction``); un cambio de signo donde se anula es un polo.
+    ``candidates`` (de ``interval.root_candidates``) son los únicos tramos donde puede haber raíces:
+    los cambios de signo fuera de ellos (saltos, polos) no se refinan. Una muestra con f = 0 es
+    raíz sólo si está aislada; los tramos de ceros contiguos los informa ``zero_runs``.
+    """
+    step = _step(xs)
+    found: List[float] = [xs[i] for i, j in _zero_runs(xs, ys, step) if i == j]
+    for i in range(len(xs)):
+        if i + 1 == len(xs) or ys[i] * ys[i + 1] >= 0:
+            continue
+        if candidates is not None and not _overlaps(candidates, xs[i], xs[i + 1]):
+            continue
+        # Un hueco entre muestras consecutivas indica puntos fuera del dominio: no se cruza.
+        if xs[i + 1] - xs[i] > 1.5 * step:
+            continue
+        r = refine_root(f, xs[i], xs[i + 1], ys[i], ys[i + 1])
+        if r is None:
+            continue
+        fr = _value(f, r)
+        if fr is None or abs(fr) > F_TOL:
+            continue
+        if denom is not None:
+            d = _value(denom, r)
+            if d is None or abs(d) < F_TOL:
+                continue
+        found.append(r)
+
+    found.sort()
+    roots: List[float] = []
+    for r in found:
+        if not roots or abs(r - roots[-1]) > max(10 * X_TOL, 1e-9 * abs(r)):
+            roots.append(r)
+    return roots
+
+
+def format_root(r: float) -> str:
+    return f"{r:.10g}"
+
+
+def format_zero_run(a: float, b: float) -> str:
+    return f"x ∈ [{format_root(a)}, {format_root(b)}] (infinitos ceros, aprox.)"
+
+
+# Muestreo adaptativo
+ADAPTIVE_INITIAL = 96   # puntos iniciales en toda la ventana
+ADAPTIVE_MAX_DEPTH = 10  # subdivisiones máximas por intervalo inicial
+ADAPTIVE_TOL = 2e-3     # error de la cuerda admitido, relativo a la escala vertical
+JUMP_RATIO = 0.25       # salto (relativo a la escala) que se corta en vez de dibujarse
+BREAK_EPS = 1e-9        # separación relativa con que se evalúa a cada lado de un quiebre
+
+
+def _y_scale(ys: List[float]) -> float:
+    # Escala robusta (percentiles 5–95) para que un polo no vuelva invisible el resto de la curva.
+    vals = sorted(ys)
+    if not vals:
+        return 1.0
+    lo = vals[int(0.05 * (len(vals) - 1))]
+    hi = vals[int(0.95 * (len(vals) - 1))]
+    return max(hi - lo, 1e-12)
+
+
+def view_limits(xs: List[float], ys: List[float], ratio: float = 20.0) -> Optional[Tuple[float, float]]:
+    """Límites verticales sugeridos cuando unos pocos valores cerca de un polo aplastan la curva.
+
+    Los percentiles se ponderan por la longitud en x que representa cada punto, para que
+    la densidad del muestreo adaptativo junto a los polos no desplace la escala.
+    """
+    pts = []
+    for i, (xi, yi) in enumerate(zip(xs, ys)):
+        if math.isnan(yi):
+            continue
+        w = 0.0
+        if i > 0 and not math.isnan(xs[i - 1]):
+            w += 0.5 * (xi - xs[i - 1])
+        if i + 1 < len(xs) and not math.isnan(xs[i + 1]):
+            w += 0.5 * (xs[i + 1] - xi)
+        pts.append((yi, w))
+    if not pts:
+        return None
+    pts.sort()
+    total = sum(w for _, w in pts) or 1.0
+
+    def quantile(q: float) -> float:
+        acc = 0.0
+        for yi, w in pts:
+            acc += w
+            if acc >= q * total:
+                return yi
+        return pts[-1][0]
+
+    lo, hi = quantile(0.05), quantile(0.95)
+    scale = max(hi - lo, 1e-12)
+    if pts[-1][0] - pts[0][0] <= ratio * scale:
+        return None
+    pad = 0.5 * scale
+    return lo - pad, hi + pad
+
+
+def adaptive_sample(f: Callable[[float], float], xmin: float, xmax: float,
+                    breakpoints: Optional[List[float]] = None,
+                    initial: int = ADAPTIVE_INITIAL) -> Tuple[List[float], List[float], int]:
+    """Muestreo adaptativo de f en [xmin, xmax] separado en tramos.
+
+    Refina donde la cuerda se aleja de la curva y corta la polilínea en los
+    ``breakpoints`` (polos, saltos, esquinas), donde f no es real y donde hay
+    saltos verticales. ``initial`` es la cantidad de puntos de la malla inicial.
+    Devuelve (xs, ys, evaluaciones); los tramos van separados por NaN.
+    """
+    evals = 0
+
+    def value(xi: float) -> Optional[float]:
+        nonlocal evals
+        evals += 1
+        return _value(f, xi)
+
+    width = xmax - xmin
+    eps = BREAK_EPS * max(abs(xmin), abs(xmax), 1.0)
+    cuts = sorted(b for b in (breakpoints or []) if xmin + eps < b < xmax - eps)
+    edges = [xmin] + cuts + [xmax]
+
+    # Malla inicial por tramo, proporcional a su longitud
+    pieces: List[List[Tuple[float, Optional[float]]]] = []
+    for k, (a, b) in enumerate(zip(edges, edges[1:])):
+        lo = a + eps if k > 0 else a
+        hi = b - eps if k < len(edges) - 2 else b
+        if hi <= lo:
+            continue
+        m = max(4, int(initial * (b - a) / width))
+        step = (hi - lo) / m
+        pieces.append([(lo + i * step, value(lo + i * step)) for i in range(m + 1)])
+
+    scale = _y_scale([y for piece in pieces for _, y in piece if y is not None])
+    tol = ADAPTIVE_TOL * scale
+    min_dx = width / (initial * 2 ** ADAPTIVE_MAX_DEPTH)
+
+    xs: List[float] = []
+    ys: List[float] = []
+
+    def emit_break() -> None:
+        if xs and not math.isnan(xs[-1]):
+            xs.append(math.nan); ys.append(math.nan)
+
+    def emit(xi: float, yi: Optional[float]) -> None:
+        if yi is None:
+            emit_break()
+        else:
+            xs.append(xi); ys.append(yi)
+
+    def refine(x0: float, y0: Optional[float], x1: float, y1: Optional[float], depth: int) -> None:
+        # Emite los puntos de (x0, x1]; x0 ya fue emitido.
+        if depth >= ADAPTIVE_MAX_DEPTH or x1 - x0 <= min_dx:
+            if y0 is not None and y1 is not None and abs(y1 - y0) > JUMP_RATIO * scale:
+                # Salto grande en un intervalo mínimo: si el punto medio no queda entre ambos
+                # extremos es una discontinuidad (polo o salto) y no se une con una recta.
+                ym = value(0.5 * (x0 + x1))
+                if ym is None or min(abs(ym - y0), abs(ym - y1)) < 0.1 * abs(y1 - y0):
+                    emit_break()
+            emit(x1, y1)
+            return
+        xm = 0.5 * (x0 + x1)
+        ym = value(xm)
+        if y0 is None and y1 is None and ym is None:
+            # Zona fuera del dominio: no se sigue subdividiendo.
+            emit(x1, y1)
+            return
+        smooth = (y0 is not None and y1 is not None and ym is not None
+                  and abs(ym - 0.5 * (y0 + y1)) <= tol)
+        if smooth:
+            emit(x1, y1)
+            return
+        refine(x0, y0, xm, ym, depth + 1)
+        refine(xm, ym, x1, y1, depth + 1)
+
+    for piece in pieces:
+        emit_break()
+        x0, y0 = piece[0]
+        emit(x0, y0)
+        for x1, y1 in piece[1:]:
+            refine(x0, y0, x1, y1, 0)
+            x0, y0 = x1, y1
+
+    if xs and math.isnan(xs[-1]):
+        xs.pop(); ys.pop()
+    return xs, ys, evals
+
+
+# Envolvente por columna de píxel
+ENVELOPE_INITIAL = 4        # muestras iniciales por columna
+ENVELOPE_MAX_PER_COLUMN = 64  # tope de muestras por columna al refinar
+
+
+def _eval_many(f: Callable[[float], float], xs: List[float], batch: Any = None) -> List[float]:
+    # NaN donde f no es real y finita
+    if batch is not None:
+        return [y if math.isfinite(y) else math.nan for y in batch(xs)]
+    out = []
+    for xi in xs:
+        yi = _value(f, xi)
+        out.append(math.nan if yi is None else yi)
+    return out
+
+
+def _runs(pts: List[Tuple[float, float]], cuts: List[float], eps: float) -> List[List[Tuple[float, float]]]:
+    """Separa puntos ordenados por x en tramos continuos: se corta en los NaN y en cada quiebre."""
+    runs: List[List[Tuple[float, float]]] = []
+    current: List[Tuple[float, float]] = []
+    k = 0
+    for xi, yi in pts:
+        crossed = False
+        while k < len(cuts) and cuts[k] < xi - eps:
+            k += 1
+            crossed = True
+        on_cut = k < len(cuts) and abs(cuts[k] - xi) <= eps
+        if crossed or on_cut or math.isnan(yi):
+            if current:
+                runs.append(current)
+            current = []
+            if on_cut or math.isnan(yi):
+                continue
+        current.append((xi, yi))
+    if current:
+        runs.append(current)
+    return runs
+
+
+def _unresolved(runs: List[List[Tuple[float, float]]], tol: float) -> bool:
+    # Hay detalle bajo el píxel si algún tramo no es monótono y su altura supera la tolerancia.
+    for run in runs:
+        ys = [y for _, y in run]
+        if max(ys) - min(ys) <= tol:
+            continue
+        d = [b - a for a, b in zip(ys, ys[1:])]
+        if any(p * q < 0 for p, q in zip(d, d[1:])):
+            return True
+    return False
+
+
+def envelope_sample(f: Callable[[float], float], xmin: float, xmax: float, columns: int,
+                    breakpoints: Optional[List[float]] = None, batch: Any = None,
+                    rows: Optional[int] = None) -> Tuple[List[float], List[float], int, int]:
+    """Envolvente mín/máx por columna de píxel: a lo sumo 4 vértices (primero, mínimo, máximo,
+    último) por tramo continuo de cada columna, sin importar cuántas evaluaciones se hagan.
+
+    Sólo se densifica el muestreo en las columnas cuya envolvente no está resuelta (detalle
+    oscilante mayor que un píxel que cambia al agregar muestras). Devuelve
+    (xs, ys, evaluaciones, columnas refinadas); los tramos van separados por NaN.
+    """
+    rows = rows or max(2 * columns // 3, 1)
+    width = (xmax - xmin) / columns
+    eps = BREAK_EPS * max(abs(xmin), abs(xmax), 1.0)
+    cuts = sorted(b for b in (breakpoints or []) if xmin - eps <= b <= xmax + eps)
+
+    n = ENVELOPE_INITIAL
+    grid = [xmin + i * width / n for i in range(columns * n)] + [xmax]
+    values = _eval_many(f, grid, batch)
+    evals = len(grid)
+    samples: List[List[Tuple[float, float]]] = [[] for _ in range(columns)]
+    for i, (xi, yi) in enumerate(zip(grid, values)):
+        samples[min(i // n, columns - 1)].append((xi, yi))
+
+    scale = _y_scale([y for y in values if not math.isnan(y)])
+    tol = scale / rows
+
+    def bounds(col: int) -> Tuple[float, float]:
+        ys = [y for _, y in samples[col] if not math.isnan(y)]
+        return (min(ys), max(ys)) if ys else (math.nan, math.nan)
+
+    pending = [c for c in range(columns) if _unresolved(_runs(samples[c], cuts, eps), tol)]
+    refined = len(pending)
+    while pending and n < ENVELOPE_MAX_PER_COLUMN:
+        # Duplica la densidad sólo en las columnas pendientes, en una sola evaluación por lotes
+        before = {c: bounds(c) for c in pending}
+        new_x = [xmin + c * width + (2 * j + 1) * width / (2 * n) for c in pending for j in range(n)]
+        new_y = _eval_many(f, new_x, batch)
+        evals += len(new_x)
+        for i, c in enumerate(pending):
+            samples[c].extend(zip(new_x[i * n:(i + 1) * n], new_y[i * n:(i + 1) * n]))
+            samples[c].sort()
+        n *= 2
+        still = []
+        for c in pending:
+            lo0, hi0 = before[c]
+            lo1, hi1 = bounds(c)
+            if not (abs(lo1 - lo0) <= tol and abs(hi1 - hi0) <= tol):
+                still.append(c)
+        pending = still
+
+    xs: List[float] = []
+    ys: List[float] = []
+    for run in _runs([p for col in samples for p in col], cuts, eps):
+        if xs:
+            xs.append(math.nan); ys.append(math.nan)
+        start = 0
+        while start < len(run):
+            # Puntos consecutivos del tramo que caen en la misma columna
+            col = min(int((run[start][0] - xmin) / width), columns - 1)
+            end = start
+            while end < len(run) and min(int((run[end][0] - xmin) / width), columns - 1) == col:
+                end += 1
+            bucket = run[start:end]
+            keep = {0, len(bucket) - 1,
+                    min(range(len(bucket)), key=lambda i: bucket[i][1]),
+                    max(range(len(bucket)), key=lambda i: bucket[i][1])}
+            for i in sorted(keep):
+                xs.append(bucket[i][0]); ys.append(bucket[i][1])
+            start = end
+    return xs, ys, evals, refined
@@ -1,7 +1,16 @@
-from dataclasses import dataclass
-from typing import Dict, Any
+import keyword
+import math
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import Dict, Any, Callable, ClassVar, FrozenSet, Mapping, Optional, Tuple
 import sympy as sp
 
+from grammar import ParseError, from_srepr, is_incomplete, parse_expression
+from timing import Timer, Timings, emit, timer_stage
+
 ALLOWED_FUNCS: Dict[str, Any] = {
 
     "Abs": sp.Abs,  
@@ -33,28 +42,231 @@ ALLOWED_FUNCS: Dict[str, Any] = {
 
 x = sp.symbols('x')
 
+@dataclass(frozen=True)
+class CompiledFunction:
+    """Función simplificada una sola vez, compartida por analizador, graficador y GUI."""
+    expr: sp.Expr
+    numer: sp.Expr
+    denom: sp.Expr
+    free_symbols: FrozenSet[sp.Symbol]
+    f: Callable[[float], float] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_expr(cls, expr: sp.Expr, simplify: bool = True,
+                  timer: Optional[Timer] = None) -> "CompiledFunction":
+        if simplify:
+            with timer_stage(timer, "simplify"):
+                expr = sp.simplify(expr)
+        numer, denom = sp.fraction(expr)
+        with timer_stage(timer, "lambdify"):
+            f = sp.lambdify(x, expr, modules=["math"])
+        return cls(expr=expr, numer=numer, denom=denom,
+                   free_symbols=frozenset(expr.free_symbols), f=f)
+
+    @cached_property
+    def batch(self) -> Optional["BatchEvaluator"]:
+        """Evaluador por lotes con CSE (None si la expresión no se puede generar como código)."""
+        from evaluator import compile_batch
+        return compile_batch(self.expr)
+
+    @cached_property
+    def interval(self) -> Optional["IntervalFunction"]:
+        """Evaluador con aritmética de intervalos (None si la expresión tiene algo no soportado)."""
+        from interval import compile_interval
+        return compile_interval(self.expr)
+
+
+def _exact(value: float) -> sp.Rational:
+    # Valor decimal exacto (0.1 -> 1/10): el análisis simbólico no arrastra errores de coma flotante
+    return sp.Rational(f"{value:.12g}")
+
+
+@dataclass(frozen=True)
+class ParametricFunction:
+    """Familia f(x; a, b, ...) simplificada y compilada una sola vez, con los parámetros como
+    argumentos extra; ``bind`` fija sus valores sin volver a simplificar ni compilar."""
+    expr: sp.Expr
+    params: Tuple[sp.Symbol, ...]
+    f: Callable[..., float] = field(repr=False, compare=False)
+    _bound: "OrderedDict[Tuple[float, ...], CompiledFunction]" = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    BIND_CACHE_SIZE: ClassVar[int] = 64
+
+    @classmethod
+    def from_expr(cls, expr: sp.Expr, params: Tuple[sp.Symbol, ...], simplify: bool = True,
+                  timer: Optional[Timer] = None) -> "ParametricFunction":
+        if simplify:
+            with timer_stage(timer, "simplify"):
+                expr = sp.simplify(expr)
+        with timer_stage(timer, "lambdify"):
+            f = sp.lambdify((x, *params), expr, modules=["math"])
+        return cls(expr=expr, params=params, f=f)
+
+    @cached_property
+    def batch(self) -> Optional["BatchEvaluator"]:
+        from evaluator import compile_batch
+        return compile_batch(self.expr, self.params)
+
+    def values(self, params: Mapping[str, float]) -> Tuple[float, ...]:
+        """Valores en el orden de ``self.params`` (los que falten valen 1)."""
+        return tuple(float(params.get(p.name, 1.0)) for p in self.params)
+
+    def substitutions(self, values: Tuple[float, ...]) -> Dict[sp.Symbol, sp.Rational]:
+        return {p: _exact(v) for p, v in zip(self.params, values)}
+
+    def bind(self, params: Mapping[str, float]) -> CompiledFunction:
+        """La función de x con los parámetros fijos; se memoriza por tupla de valores."""
+        values = self.values(params)
+        with self._lock:
+            known = self._bound.get(values)
+            if known is not None:
+                self._bound.move_to_end(values)
+                return known
+        expr = self.expr.xreplace(self.substitutions(values))
+        numer, denom = sp.fraction(expr)
+        family_f = self.f
+
+        def f(x_value: float) -> float:
+            return family_f(x_value, *values)
+
+        compiled = CompiledFunction(expr=expr, numer=numer, denom=denom,
+                                    free_symbols=frozenset(expr.free_symbols), f=f)
+        batch = self.batch
+        # Se reutiliza el evaluador ya generado de la familia en lugar de otro sp.cse por valor
+        compiled.__dict__["batch"] = batch.bind(values) if batch is not None else None
+        with self._lock:
+            self._bound[values] = compiled
+            while len(self._bound) > self.BIND_CACHE_SIZE:
+                self._bound.popitem(last=False)
+        return compiled
+
+
+_PARAM_NAME = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+
+
+def check_param_name(name: str) -> str:
+    """Valida el nombre de un parámetro: no puede chocar con x, las funciones permitidas ni los
+    nombres que usa el evaluador generado (``math.*``, ``x0``, ``x1``, ...)."""
+    if (not _PARAM_NAME.fullmatch(name) or name == "x" or name in ALLOWED_FUNCS
+            or re.fullmatch(r"x\d+", name) or keyword.iskeyword(name) or hasattr(math, name)
+            or name in ("True", "False")):
+        raise ValueError(f"Nombre de parámetro no válido: '{name}'")
+    return name
+
+
+def as_compiled(obj: Any) -> CompiledFunction:
+    """Acepta un CompiledFunction, un ParseResult o una expresión SymPy."""
+    if isinstance(obj, CompiledFunction):
+        return obj
+    if isinstance(obj, ParseResult):
+        return obj.compiled
+    return CompiledFunction.from_expr(sp.sympify(obj))
+
+
 @dataclass
 class ParseResult:
     expr: sp.Expr  
     text: str      
+    compiled: CompiledFunction
+    timings: Timings = field(default_factory=dict)
+    # Familia con parámetros; ``compiled`` es la función con los valores pedidos en ``parse``
+    family: Optional[ParametricFunction] = None
 
 class FunctionParser:
+    """Convierte el texto de f(x) en un CompiledFunction con el parser seguro de grammar.py.
 
-    def __init__(self) -> None:
-        self._locals = {**ALLOWED_FUNCS, "x": x}
+    ``simplify`` decide si se aplica ``sp.simplify`` (la etapa más cara); ``parse`` acepta
+    además un valor por llamada. Los resultados se memorizan por texto en una LRU acotada.
+    """
 
-    def parse(self, text: str) -> ParseResult:
+    def __init__(self, store: Any = None, simplify: bool = True, memo_size: int = 128) -> None:
+        self._names = {**ALLOWED_FUNCS, "x": x}
+        self.store = store
+        self.simplify = simplify
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[Tuple[str, bool, Tuple[str, ...]], ParseResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, text: str, simplify: Optional[bool] = None,
+              params: Optional[Mapping[str, float]] = None) -> ParseResult:
+        """``params`` declara parámetros (nombre -> valor actual): la expresión se compila una vez
+        como familia (``ParseResult.family``) y ``compiled`` queda con esos valores."""
         if not isinstance(text, str) or not text.strip():
             raise ValueError("Ingresa una función no vacía, por ejemplo: sin(x) + 1/x")
-        cleaned = text.strip().replace("^", "**")
+        source = text.strip()
+        cleaned = source.replace("^", "**")
+        simplify = self.simplify if simplify is None else simplify
+        names = tuple(check_param_name(name) for name in (params or {}))
+        key = (cleaned, simplify, names)
+        timer = Timer()
+
+        with timer.stage("memo"), self._lock:
+            known = self._memo.get(key)
+            if known is not None:
+                self._memo.move_to_end(key)
+        if known is None:
+            known = self._parse(source, cleaned, simplify, names, timer)
+            with self._lock:
+                self._memo[key] = known
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        if known.family is not None:
+            with timer.stage("bind"):
+                compiled = known.family.bind(params)
+            known = replace(known, expr=compiled.expr, compiled=compiled)
+        return replace(known, timings=self._emit(timer))
+
+    def is_incomplete(self, text: str, params: Mapping[str, float] = {}) -> bool:
+        """Revisión barata (sólo tokens) de si ``text`` es una entrada a medio escribir."""
+        return is_incomplete(text.strip(), {**self._names, **{name: sp.Symbol(name) for name in params}})
+
+    def _parse(self, source: str, cleaned: str, simplify: bool, names: Tuple[str, ...],
+               timer: Timer) -> ParseResult:
+        # El almacén guarda la forma simplificada: sólo sirve si se pidió simplificar
+        if self.store is not None and simplify and not names:
+            with timer.stage("store"):
+                known = self.store.get_parsed(cleaned)
+            if known is not None:
+                # Arranque en caliente: el srepr se reconstruye sin eval; si el archivo trae otra cosa
+                # (corrupto o modificado), se ignora y se vuelve a parsear el texto
+                with timer.stage("srepr"):
+                    try:
+                        expr = from_srepr(known)
+                    except ValueError:
+                        expr = None
+                if isinstance(expr, sp.Expr) and expr.free_symbols <= {x}:
+                    compiled = CompiledFunction.from_expr(expr, simplify=False, timer=timer)
+                    return ParseResult(expr=compiled.expr, text=cleaned, compiled=compiled)
 
+        symbols = tuple(sp.Symbol(name) for name in names)
         try:
-            expr = sp.sympify(cleaned, locals=self._locals, evaluate=True)
-        except Exception as e:
-            raise ValueError(f"No pude interpretar la función. Revisa la sintaxis. Detalle: {e}")
+            with timer.stage("syntax"):
+                # ``source`` conserva '^': las posiciones de error coinciden con lo escrito
+                expr = parse_expression(source, {**self._names, **dict(zip(names, symbols))})
+        except ParseError as e:
+            raise ParseError(f"No pude interpretar la función: {e.message}", e.position, e.text)
 
+        if not isinstance(expr, sp.Expr):
+            raise ValueError("La función debe ser una expresión numérica en x (sin comparaciones).")
         free = expr.free_symbols
-        if free and not (free <= {x}):
+        if free and not (free <= {x, *symbols}):
             raise ValueError("La función solo puede depender de 'x'.")
 
-        return ParseResult(expr=sp.simplify(expr), text=cleaned)
\ No newline at end of file
+        if names:
+            family = ParametricFunction.from_expr(expr, symbols, simplify=simplify, timer=timer)
+            return ParseResult(expr=family.expr, text=cleaned, compiled=family.bind({}), family=family)
+
+        compiled = CompiledFunction.from_expr(expr, simplify=simplify, timer=timer)
+        if self.store is not None and simplify:
+            with timer.stage("store"):
+                self.store.put_parsed(cleaned, sp.srepr(compiled.expr))
+        return ParseResult(expr=compiled.expr, text=cleaned, compiled=compiled)
+
+    @staticmethod
+    def _emit(timer: Timer) -> Timings:
+        timings = timer.as_dict()
+        emit("parse", timings)
+        return timings
+
@@ -1,43 +1,189 @@
-from dataclasses import dataclass
-from typing import Optional, Tuple, List
+from array import array
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from typing import Any, Callable, List, Mapping, Optional, Tuple
 import math
+import threading
 import sympy as sp
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+# Sólo Figure (sin pyplot): no hace falta elegir backend, y la GUI no cambia de Agg a TkAgg al iniciar
+from matplotlib.figure import Figure
+
+from parser import CompiledFunction, ParametricFunction, as_compiled
+from timing import Timer, Timings, emit, timer_stage
+from tiles import TileCache, tile_cache as default_tile_cache, tiles_for_view
+import numeric
 
 x = sp.symbols('x')
 
 @dataclass
 class PlotResult:
-    fig: "plt.Figure"
+    fig: Figure
     x_value: Optional[float]
     y_value: Optional[float]
+    evals: int = 0  # evaluaciones de f usadas para la curva (0 si vino del almacén)
+    line: Any = None  # Line2D de la curva, para reemplazar sus datos al mover la vista
+    timings: Timings = field(default_factory=dict)
+
+@dataclass
+class CurveData:
+    """Muestras de la curva ya calculadas (p. ej. en un hilo de trabajo) para dibujarlas después."""
+    xs: List[float]
+    ys: List[float]
+    evals: int
+    window: Tuple[float, float]
+    timings: Timings = field(default_factory=dict)
+
+# Modos de muestreo de la curva
+ADAPTIVE = "adaptive"  # subdivisión donde la cuerda se aleja de la curva
+ENVELOPE = "envelope"  # envolvente mín/máx por columna de píxel
+AUTO = "auto"          # envolvente sólo si hay detalle bajo el píxel; si no, adaptativo
+
+# Columnas de píxel del eje en la figura por defecto (6 in a 110 dpi, sin márgenes)
+DEFAULT_COLUMNS = 600
+
+# Máximo de quiebres simbólicos por ventana (p. ej. floor(1000*x) tendría miles)
+MAX_BREAKPOINTS = 4000
+
+
+def _linear_crossings(arg: sp.Expr, targets, xmin: float, xmax: float) -> List[float]:
+    """Valores de x en [xmin, xmax] donde el argumento lineal ``arg`` toma los valores dados por ``targets``."""
+    if not arg.is_polynomial(x) or sp.degree(arg, x) != 1:
+        return []
+    a = float(arg.coeff(x, 1))
+    b = float(arg.subs(x, 0))
+    lo, hi = sorted((a * xmin + b, a * xmax + b))
+    return [(t - b) / a for t in targets(lo, hi)]
+
+
+def _integers_between(lo: float, hi: float):
+    k0, k1 = math.ceil(lo), math.floor(hi)
+    if k1 - k0 > MAX_BREAKPOINTS:
+        return []
+    return range(k0, k1 + 1)
+
+
+def _half_pi_multiples(offset: float):
+    # offset + k·π, con k entero, dentro de [lo, hi]
+    def targets(lo: float, hi: float):
+        return [offset + k * math.pi for k in _integers_between((lo - offset) / math.pi, (hi - offset) / math.pi)]
+    return targets
+
+
+def _real_zeros(e: sp.Expr, xmin: float, xmax: float) -> List[float]:
+    try:
+        sol = sp.solveset(e, x, sp.Interval(xmin, xmax))
+    except Exception:
+        return []
+    if not isinstance(sol, sp.FiniteSet):
+        return []
+    return [float(s) for s in sol if s.is_real]
+
+def _zero_sources(expr: sp.Expr) -> List[sp.Expr]:
+    """Expresiones cuyos ceros reales cortan la curva: denominador, argumentos de Abs y
+    fronteras de Piecewise."""
+    sources: List[sp.Expr] = []
+    denom = sp.fraction(sp.together(expr))[1]
+    if denom.has(x):
+        sources.append(denom)
+    for node in sp.preorder_traversal(expr):
+        if isinstance(node, sp.Abs):
+            sources.append(node.args[0])
+        elif isinstance(node, sp.Piecewise):
+            for _, cond in node.args:
+                if isinstance(cond, sp.core.relational.Relational):
+                    sources.append(cond.lhs - cond.rhs)
+    return sources
+
 
 class FunctionPlotter:
-    def __init__(self, expr: sp.Expr):
-        self.expr = sp.simplify(expr)
-        self.f = sp.lambdify(x, self.expr, modules=["math"])
+    def __init__(self, fn: CompiledFunction, store: Optional[Any] = None,
+                 tile_cache: Optional[TileCache] = default_tile_cache, mode: str = AUTO,
+                 zeros: Optional[Callable[[float, float], List[float]]] = None):
+        # ``zeros(xmin, xmax)``: ceros de _zero_sources ya resueltos (p. ej. por FamilyPlotter)
+        self.compiled = as_compiled(fn)
+        self.expr = self.compiled.expr
+        batch = self.compiled.batch
+        # La versión escalar del evaluador CSE devuelve NaN en vez de lanzar excepciones
+        self.f = batch.scalar if batch is not None else self.compiled.f
+        self.store = store
+        self.tile_cache = tile_cache
+        self.mode = mode
+        self.zeros = zeros
+        self.key = sp.srepr(self.expr)
+
+    def _cached_curve(self, xmin: float, xmax: float, columns: int = DEFAULT_COLUMNS,
+                      timer: Optional[Timer] = None) -> Tuple[List[float], List[float], int]:
+        if self.store is None:
+            return self.curve_points(xmin, xmax, columns, timer=timer)
+        # El modo adaptativo no depende del ancho en píxeles
+        n = 0 if self.mode == ADAPTIVE else columns
+        with timer_stage(timer, "store"):
+            hit = self.store.get_samples(self.key, (xmin, xmax), n, mode=self.mode)
+        if hit is not None:
+            return hit[0], hit[1], 0
+        xs, ys, evals = self.curve_points(xmin, xmax, columns, timer=timer)
+        with timer_stage(timer, "store"):
+            self.store.put_samples(self.key, (xmin, xmax), n, xs, ys, mode=self.mode)
+        return xs, ys, evals
 
     def sample_points(self, xmin: float, xmax: float, n: int = 1000) -> Tuple[List[float], List[float]]:
-        xs, ys = [], []
-        step = (xmax - xmin) / (n - 1)
-        for i in range(n):
-            xi = xmin + i * step
-            try:
-                yi = self.f(xi)
-                if yi is None or isinstance(yi, complex):
-                    continue
-                if math.isfinite(yi):
-                    xs.append(xi); ys.append(yi)
-            except Exception:
-                continue
-        return xs, ys
+        return numeric.sample_points(self.f, xmin, xmax, n, batch=self.compiled.batch)
 
-    def make_figure(self, x_value: Optional[float] = None,
-                    window: Tuple[float, float] = (-10, 10),
-                    x_intercepts: Optional[list] = None,
-                    y_intercept: Optional[float] = None) -> PlotResult:
+    def breakpoints(self, xmin: float, xmax: float) -> List[float]:
+        """Puntos de [xmin, xmax] donde la curva debe cortarse: polos, saltos de floor/ceiling,
+        fronteras de Piecewise y esquinas de Abs."""
+        if self.zeros is not None:
+            pts = list(self.zeros(xmin, xmax))
+        else:
+            pts = [z for e in _zero_sources(self.expr) for z in _real_zeros(e, xmin, xmax)]
+        for node in sp.preorder_traversal(self.expr):
+            if isinstance(node, (sp.floor, sp.ceiling)):
+                pts += _linear_crossings(node.args[0], _integers_between, xmin, xmax)
+            elif isinstance(node, (sp.tan, sp.sec)):
+                pts += _linear_crossings(node.args[0], _half_pi_multiples(math.pi / 2), xmin, xmax)
+            elif isinstance(node, (sp.cot, sp.csc)):
+                pts += _linear_crossings(node.args[0], _half_pi_multiples(0.0), xmin, xmax)
+        return sorted(set(pts))[:MAX_BREAKPOINTS]
+
+    def adaptive_points(self, xmin: float, xmax: float) -> Tuple[List[float], List[float], int]:
+        return numeric.adaptive_sample(self.f, xmin, xmax, self.breakpoints(xmin, xmax))
+
+    def envelope_points(self, xmin: float, xmax: float,
+                        columns: int = DEFAULT_COLUMNS) -> Tuple[List[float], List[float], int]:
+        xs, ys, evals, _ = numeric.envelope_sample(self.f, xmin, xmax, columns, self.breakpoints(xmin, xmax),
+                                                   batch=self.compiled.batch)
+        return xs, ys, evals
+
+    def curve_points(self, xmin: float, xmax: float, columns: int = DEFAULT_COLUMNS,
+                     cuts: Optional[List[float]] = None,
+                     initial: int = numeric.ADAPTIVE_INITIAL,
+                     timer: Optional[Timer] = None) -> Tuple[List[float], List[float], int]:
+        """Muestras de la curva según ``self.mode``; ``cuts`` son los quiebres si ya se calcularon."""
+        if cuts is None:
+            with timer_stage(timer, "breakpoints"):
+                cuts = self.breakpoints(xmin, xmax)
+        if self.mode == ADAPTIVE:
+            with timer_stage(timer, "adaptive"):
+                xs, ys, evals = numeric.adaptive_sample(self.f, xmin, xmax, cuts, initial=initial)
+            if timer is not None:
+                timer.count("adaptive", evals)
+            return xs, ys, evals
+        with timer_stage(timer, "envelope"):
+            xs, ys, evals, refined = numeric.envelope_sample(self.f, xmin, xmax, columns, cuts,
+                                                             batch=self.compiled.batch)
+        if timer is not None:
+            timer.count("envelope", evals)
+        if self.mode == AUTO and not refined:
+            # Sin detalle bajo el píxel: la curva adaptativa es igual de fiel y sigue nítida al acercar.
+            with timer_stage(timer, "adaptive"):
+                axs, ays, aevals = numeric.adaptive_sample(self.f, xmin, xmax, cuts, initial=initial)
+            if timer is not None:
+                timer.count("adaptive", aevals)
+            return axs, ays, evals + aevals
+        return xs, ys, evals
+
+    def curve(self, x_value: Optional[float] = None,
+              window: Tuple[float, float] = (-10, 10)) -> CurveData:
         xmin, xmax = window
         # Si x_value está fuera del rango, ajusta la ventana para incluirlo
         if x_value is not None:
@@ -46,54 +192,322 @@ class FunctionPlotter:
                 xmin = x_value - margin
             if x_value > xmax:
                 xmax = x_value + margin
-        xs, ys = self.sample_points(xmin, xmax)
+        timer = Timer()
+        xs, ys, evals = self._cached_curve(xmin, xmax, timer=timer)
+        timings = timer.as_dict()
+        emit("curve", timings)
+        return CurveData(xs=xs, ys=ys, evals=evals, window=(xmin, xmax), timings=timings)
 
-        fig, ax = plt.subplots(figsize=(6,4), dpi=110)
-        ax.plot(xs, ys, linewidth=2)
-        ax.axhline(0, linewidth=1)
-        ax.axvline(0, linewidth=1)
-        ax.set_title("f(x)")
-        ax.set_xlabel("x"); ax.set_ylabel("f(x)")
+    def _sample_tile(self, a: float, b: float, cuts: List[float], initial: int) -> Tuple[List[float], List[float], int]:
+        # Un quiebre justo en el borde de la baldosa se respeta muestreando a partir de un épsilon.
+        eps = numeric.BREAK_EPS * max(abs(a), abs(b), 1.0)
+        lo = a + eps if any(abs(c - a) <= eps for c in cuts) else a
+        hi = b - eps if any(abs(c - b) <= eps for c in cuts) else b
+        # Para la envolvente, una columna por píxel (la malla inicial es de 1 punto cada 2 píxeles)
+        return self.curve_points(lo, hi, 2 * initial, [c for c in cuts if lo < c < hi], initial=initial)
 
-        # Marcar intersecciones con eje X
-        if x_intercepts:
-            for xi in x_intercepts:
-                try:
-                    xi_val = float(xi)
-                    ax.scatter([xi_val], [0], color="red", s=50, zorder=6, label="Corte eje X" if xi == x_intercepts[0] else "")
-                except Exception:
-                    pass
+    def view_curve(self, xmin: float, xmax: float, pixels: int = 800) -> CurveData:
+        """Curva de la vista [xmin, xmax] a resolución de pantalla, armada con baldosas alineadas.
 
-        # Marcar intersección con eje Y
-        if y_intercept is not None:
-            try:
-                y0 = float(y_intercept)
-                ax.scatter([0], [y0], color="green", s=50, zorder=6, label="Corte eje Y")
-            except Exception:
-                pass
+        Sólo se muestrean las baldosas que no están en ``tile_cache``; al desplazar la vista
+        o volver a un zoom anterior se reutilizan las ya calculadas.
+        """
+        tiles = list(tiles_for_view(xmin, xmax))
+        level, _, a0, b0 = tiles[0]
+        # Malla inicial de ~1 punto cada 2 píxeles, en potencias de 2 para que un cambio
+        # pequeño del tamaño de la ventana no invalide las baldosas.
+        per_tile = max(pixels * (b0 - a0) / (xmax - xmin) / 2, 1.0)
+        initial = 2 ** max(3, math.ceil(math.log2(per_tile)))
 
-        yv = None
-        if x_value is not None:
-            try:
-                yv = float(sp.N(self.expr.subs(x, x_value)))
-                if math.isfinite(yv):
-                    ax.scatter([x_value], [yv], s=40, zorder=7, color="blue", label="Punto evaluado")
-                    ax.annotate(f"({x_value:.3g}, {yv:.3g})", (x_value, yv),
-                                textcoords="offset points", xytext=(6,6))
-            except Exception:
-                yv = None
+        keys = [(self.key, self.mode, level, k, initial) for level, k, _, _ in tiles]
+        found = {key: self.tile_cache.get(key) if self.tile_cache is not None else None for key in keys}
+        missing = [(key, a, b) for key, (_, _, a, b) in zip(keys, tiles) if found[key] is None]
+        evals = 0
+        if missing:
+            # Un solo cálculo simbólico de quiebres para todas las baldosas nuevas
+            cuts = self.breakpoints(missing[0][1], missing[-1][2])
+            for key, a, b in missing:
+                txs, tys, n = self._sample_tile(a, b, cuts, initial)
+                evals += n
+                found[key] = (array('d', txs), array('d', tys))
+                if self.tile_cache is not None:
+                    self.tile_cache.put(key, found[key])
+
+        xs: List[float] = []
+        ys: List[float] = []
+        for key in keys:
+            txs, tys = found[key]
+            if not txs:
+                continue
+            start = 0
+            if xs:
+                if xs[-1] == txs[0]:
+                    start = 1  # baldosas contiguas comparten el borde
+                else:
+                    xs.append(math.nan); ys.append(math.nan)
+            xs.extend(txs[start:]); ys.extend(tys[start:])
+        return CurveData(xs=xs, ys=ys, evals=evals, window=(xmin, xmax))
 
-        # Leyenda solo si hay cortes
-        handles, labels = ax.get_legend_handles_labels()
-        if any(labels):
-            ax.legend(loc="best")
+    def point_value(self, x_value: Optional[float]) -> Optional[float]:
+        """f(x_value) para marcar el punto evaluado, o None si no es real y finito."""
+        if x_value is None:
+            return None
+        # Con la función compilada, sin volver a sustituir en la expresión simbólica
+        try:
+            yv = float(self.f(x_value))
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+        return yv if math.isfinite(yv) else None
 
-        ax.grid(True, alpha=0.2)
-        fig.tight_layout()
-        return PlotResult(fig=fig, x_value=x_value, y_value=yv)
+    def make_figure(self, x_value: Optional[float] = None,
+                    window: Tuple[float, float] = (-10, 10),
+                    x_intercepts: Optional[list] = None,
+                    y_intercept: Optional[float] = None,
+                    curve: Optional[CurveData] = None) -> PlotResult:
+        """Figura independiente (sin pyplot), p. ej. para exportar a PNG."""
+        if curve is None:
+            curve = self.curve(x_value=x_value, window=window)
+        timer = Timer()
+        with timer.stage("render"):
+            view = PlotView(blit=False)
+            yv = self.point_value(x_value)
+            view.show_curve(curve, x_value=x_value, y_value=yv)
+            view.set_intercepts(x_intercepts, y_intercept)
+            view.fig.tight_layout()
+        timings = timer.as_dict()
+        emit("plot", timings)
+        # Incluye las etapas del muestreo, aunque se hayan medido antes (p. ej. en otro hilo)
+        for kind in ("durations", "counts"):
+            timings[kind] = {**curve.timings.get(kind, {}), **timings[kind]}
+        return PlotResult(fig=view.fig, x_value=x_value, y_value=yv, evals=curve.evals, line=view.line,
+                          timings=timings)
 
     def save_png(self, path: str, x_value: Optional[float] = None,
                  window: Tuple[float, float] = (-10, 10)) -> str:
         pr = self.make_figure(x_value=x_value, window=window)
         pr.fig.savefig(path)
-        return path
\ No newline at end of file
+        return path
+
+class FamilyPlotter:
+    """Curvas de una familia f(x; a, b, ...) para los deslizadores de parámetros.
+
+    Los ceros que cortan la curva (polos, esquinas de Abs, fronteras de Piecewise) se resuelven
+    una sola vez en función de los parámetros cuando son polinomios de grado ≤ 2 en x; para cada
+    valor sólo se evalúan esas fórmulas y se muestrea con el evaluador ya compilado. Las últimas
+    curvas se guardan por tupla de valores (volver a una posición anterior no remuestrea).
+    """
+
+    CACHE_SIZE = 32
+
+    def __init__(self, family: ParametricFunction, mode: str = AUTO) -> None:
+        self.family = family
+        self.mode = mode
+        self._formulas: List[Callable[..., Any]] = []
+        self._pending: List[sp.Expr] = []  # fuentes sin fórmula cerrada: solveset por valor
+        for source in _zero_sources(family.expr):
+            roots = _closed_form_zeros(source)
+            if roots is None:
+                self._pending.append(source)
+            else:
+                self._formulas += [sp.lambdify(family.params, r, modules=["mpmath"]) for r in roots]
+        self._curves: "OrderedDict[tuple, CurveData]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def zeros(self, values: Tuple[float, ...], xmin: float, xmax: float) -> List[float]:
+        pts: List[float] = []
+        for formula in self._formulas:
+            try:
+                z = complex(formula(*values))
+            except (ArithmeticError, ValueError, TypeError):
+                continue  # p. ej. 1/a con a = 0: esa raíz no existe para estos valores
+            if abs(z.imag) <= 1e-12 * max(1.0, abs(z.real)) and xmin <= z.real <= xmax:
+                pts.append(z.real)
+        if self._pending:
+            subs = self.family.substitutions(values)
+            for source in self._pending:
+                pts += _real_zeros(source.xreplace(subs), xmin, xmax)
+        return pts
+
+    def plotter(self, params: Mapping[str, float]) -> FunctionPlotter:
+        values = self.family.values(params)
+        return FunctionPlotter(self.family.bind(params), tile_cache=None, mode=self.mode,
+                               zeros=lambda a, b: self.zeros(values, a, b))
+
+    def view_curve(self, params: Mapping[str, float], xmin: float, xmax: float,
+                   pixels: int = 800) -> Tuple[FunctionPlotter, CurveData]:
+        key = (self.family.values(params), xmin, xmax, pixels)
+        plotter = self.plotter(params)
+        with self._lock:
+            curve = self._curves.get(key)
+            if curve is not None:
+                self._curves.move_to_end(key)
+                return plotter, curve
+        curve = plotter.view_curve(xmin, xmax, pixels)
+        with self._lock:
+            self._curves[key] = curve
+            while len(self._curves) > self.CACHE_SIZE:
+                self._curves.popitem(last=False)
+        return plotter, curve
+
+
+def _closed_form_zeros(source: sp.Expr) -> Optional[List[sp.Expr]]:
+    """Raíces en x de ``source`` como expresiones de los parámetros, si es polinomio de grado ≤ 2."""
+    try:
+        poly = sp.Poly(source, x)
+    except sp.PolynomialError:
+        return None
+    if poly.degree() > 2:
+        return None
+    return sp.solve(poly.as_expr(), x)
+
+
+# ``set_offsets`` no acepta una lista vacía: "sin puntos" es un único punto NaN, que no se dibuja
+_NO_POINTS = [(math.nan, math.nan)]
+
+
+def _offsets(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    return [(float(px), float(py)) for px, py in points] or _NO_POINTS
+
+
+def _has_points(artist) -> bool:
+    return any(math.isfinite(px) for px, _ in artist.get_offsets())
+
+
+class PlotView:
+    """Figura persistente: los artistas se crean una sola vez y se actualizan en el lugar.
+
+    Con ``blit=True`` los marcadores (cortes, punto evaluado, leyenda) son artistas animados:
+    se dibujan sobre el fondo ya renderizado (``blit()``) y cambiarlos no redibuja la curva.
+    """
+
+    def __init__(self, figsize: Tuple[float, float] = (6, 4), dpi: int = 110, blit: bool = True) -> None:
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.ax = ax = self.fig.add_subplot(111)
+        self.animated = blit
+        (self.line,) = ax.plot([], [], linewidth=2)
+        ax.axhline(0, linewidth=1)
+        ax.axvline(0, linewidth=1)
+        ax.set_xlabel("x"); ax.set_ylabel("f(x)")
+        ax.grid(True, alpha=0.2)
+        self.x_marks = ax.scatter([], [], color="red", s=50, zorder=6, label="Corte eje X", animated=blit)
+        self.y_mark = ax.scatter([], [], color="green", s=50, zorder=6, label="Corte eje Y", animated=blit)
+        self.point = ax.scatter([], [], s=40, zorder=7, color="blue", label="Punto evaluado", animated=blit)
+        self.note = ax.annotate("", (0, 0), textcoords="offset points", xytext=(6, 6), animated=blit)
+        self.note.set_visible(False)
+        self.canvas = None
+        self._background = None
+
+    # ------------------------------
+    # Blitting
+    # ------------------------------
+    def attach(self, canvas) -> None:
+        """Conecta el canvas: cada redibujo completo guarda el fondo para el blitting."""
+        self.canvas = canvas
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _overlays(self) -> list:
+        artists = [self.x_marks, self.y_mark, self.point, self.note]
+        if self.ax.get_legend() is not None:
+            artists.append(self.ax.get_legend())
+        return artists
+
+    def _on_draw(self, event) -> None:
+        if not self.animated:
+            return
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._overlays():
+            self.ax.draw_artist(artist)
+
+    def blit(self) -> None:
+        """Redibuja sólo los marcadores; si aún no hay fondo, pide un redibujo completo."""
+        if self.canvas is None:
+            return
+        if not self.animated or self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        for artist in self._overlays():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+    # ------------------------------
+    # Contenido
+    # ------------------------------
+    def _update_legend(self) -> None:
+        # Leyenda solo si hay cortes o punto evaluado
+        handles = [a for a in (self.x_marks, self.y_mark, self.point) if _has_points(a)]
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if handles:
+            self.ax.legend(handles=handles, loc="best").set_animated(self.animated)
+
+    def clear(self, title: str = "Gráfico") -> None:
+        self._background = None
+        self.line.set_data([], [])
+        for marks in (self.x_marks, self.y_mark, self.point):
+            marks.set_offsets(_offsets([]))
+        self.note.set_visible(False)
+        self._update_legend()
+        self.ax.set_title(title)
+        self.ax.set_xlim(-10, 10)
+        self.ax.set_ylim(-1, 1)
+
+    def show_curve(self, curve: CurveData, x_value: Optional[float] = None,
+                   y_value: Optional[float] = None, title: str = "f(x)") -> None:
+        """Reemplaza la curva (y borra los marcadores anteriores); el llamador redibuja el canvas."""
+        self._background = None  # el fondo guardado ya no corresponde
+        self.line.set_data(curve.xs, curve.ys)
+        self.ax.set_title(title)
+        self.ax.set_xlim(*curve.window)
+        ylim = numeric.view_limits(curve.xs, curve.ys)
+        if ylim is None:
+            finite = [y for y in curve.ys if math.isfinite(y)]
+            lo, hi = (min(finite), max(finite)) if finite else (-1.0, 1.0)
+            pad = 0.05 * (hi - lo) or 1.0
+            ylim = (lo - pad, hi + pad)
+        self.ax.set_ylim(*ylim)
+
+        self.x_marks.set_offsets(_offsets([]))
+        self.y_mark.set_offsets(_offsets([]))
+        self._set_point(x_value, y_value)
+        self._update_legend()
+
+    def _set_point(self, x_value: Optional[float], y_value: Optional[float]) -> None:
+        if x_value is not None and y_value is not None:
+            self.point.set_offsets(_offsets([(x_value, y_value)]))
+            self.note.xy = (x_value, y_value)
+            self.note.set_text(f"({x_value:.3g}, {y_value:.3g})")
+            self.note.set_visible(True)
+        else:
+            self.point.set_offsets(_offsets([]))
+            self.note.set_visible(False)
+
+    def set_curve_data(self, xs: List[float], ys: List[float]) -> None:
+        self.line.set_data(xs, ys)
+
+    def set_point(self, x_value: Optional[float], y_value: Optional[float]) -> None:
+        """Mueve el punto evaluado sin tocar la curva (p. ej. al cambiar un parámetro)."""
+        self._set_point(x_value, y_value)
+        self._update_legend()
+
+    def set_intercepts(self, x_intercepts: Optional[list] = None,
+                       y_intercept: Optional[float] = None) -> None:
+        """Marca los cortes sobre la curva ya dibujada (con blitting si está conectado a un canvas)."""
+        # Convertir intersecciones a valores numéricos si es posible
+        pts = []
+        for xi in x_intercepts or []:
+            try:
+                pts.append((float(xi), 0.0))
+            except Exception:
+                pass
+        self.x_marks.set_offsets(_offsets(pts))
+        y0 = []
+        if y_intercept is not None:
+            try:
+                y0 = [(0.0, float(y_intercept))]
+            except Exception:
+                pass
+        self.y_mark.set_offsets(_offsets(y0))
+        self._update_legend()
+        self.blit()
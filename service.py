@@ -0,0 +1,297 @@
+import argparse
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 60.0
+PLOT_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+# ------------------------------
+# Lado del proceso de trabajo
+# ------------------------------
+_parser = None
+_store = None
+
+
+def _init_worker(use_store: bool) -> None:
+    """Importa SymPy y Matplotlib y ejecuta un análisis mínimo para que la primera petición sea rápida."""
+    global _parser, _store
+    from parser import FunctionParser
+    from store import open_default_store
+    _store = open_default_store() if use_store else None
+    _parser = FunctionParser(store=_store)
+    _task_analyze("x**2 - 1", None)
+    _task_plot("x**2 - 1", None, "png", (-10.0, 10.0))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _task_analyze(text: str, x_value: Optional[float]) -> Dict[str, Any]:
+    from analyzer import FunctionAnalyzer
+    parsed = _parser.parse(text)
+    return asdict(FunctionAnalyzer(parsed.compiled, store=_store).analyze(x_value=x_value))
+
+
+def _task_evaluate(text: str, x_value: float) -> Dict[str, Any]:
+    from analyzer import FunctionAnalyzer
+    parsed = _parser.parse(text)
+    steps, value = FunctionAnalyzer(parsed.compiled, store=_store).evaluate(x_value)
+    return {"expr_str": str(parsed.expr), "x": x_value, "y": value, "steps": steps}
+
+
+def _task_plot(text: str, x_value: Optional[float], fmt: str, window: Tuple[float, float]) -> bytes:
+    from plotter import FunctionPlotter
+    parsed = _parser.parse(text)
+    pr = FunctionPlotter(parsed.compiled, store=_store).make_figure(x_value=x_value, window=window)
+    buf = io.BytesIO()
+    pr.fig.savefig(buf, format=fmt)
+    return buf.getvalue()
+
+
+_TASKS = {"analyze": _task_analyze, "evaluate": _task_evaluate, "plot": _task_plot}
+
+
+# ------------------------------
+# Lado del servidor
+# ------------------------------
+class ServiceBusy(Exception):
+    """La cola de trabajo está llena."""
+
+
+class AnalysisService:
+    """Pool de procesos precalentado con caché de respuestas y coalescencia de peticiones.
+
+    Peticiones idénticas simultáneas comparten un mismo Future; si ya hay ``workers + queue_size``
+    tareas en curso, ``call`` lanza ServiceBusy en lugar de encolar sin límite.
+    """
+
+    def __init__(self, workers: int = 0, queue_size: int = 32, cache_size: int = 256,
+                 timeout: float = DEFAULT_TIMEOUT, use_store: bool = True) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + queue_size
+        self.timeout = timeout
+        self.use_store = use_store
+        self.cache_size = cache_size
+        self.hits = 0
+        self.coalesced = 0
+        self._cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # clave -> (Future, pool donde corre): al vencer el plazo se sabe qué pool reciclar
+        self._inflight: Dict[Hashable, Tuple[Future, ProcessPoolExecutor]] = {}
+        # Reentrante: Future.cancel y add_done_callback pueden llamar a _finish con el lock tomado
+        self._lock = threading.RLock()
+        self.pool = self._new_pool()
+        self.recycled = 0
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.use_store,))
+
+    def warm_up(self) -> List[int]:
+        """Arranca todos los procesos (cada uno corre el inicializador) y espera a que estén listos."""
+        pool = self.pool
+        futures = [pool.submit(_ping) for _ in range(self.workers)]
+        return [f.result() for f in futures]
+
+    def _warm_up_quietly(self) -> None:
+        try:
+            self.warm_up()
+        except BrokenProcessPool:
+            pass  # el pool se reemplazó otra vez mientras arrancaba
+
+    def _replace_pool(self) -> None:
+        """Reemplaza el pool (con el lock tomado): termina sus procesos y precalienta el nuevo en segundo plano.
+
+        Las tareas que seguían en el pool viejo terminan con BrokenProcessPool (503, reintentar).
+        """
+        old = self.pool
+        self.pool = self._new_pool()
+        self.recycled += 1
+        # ProcessPoolExecutor no puede cancelar una tarea en curso: se terminan sus procesos
+        for proc in list((old._processes or {}).values()):
+            proc.terminate()
+        old.shutdown(wait=False, cancel_futures=True)
+        threading.Thread(target=self._warm_up_quietly, name="warm-up", daemon=True).start()
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def call(self, kind: str, *args: Any) -> Any:
+        key = (kind,) + args
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            entry = self._inflight.get(key)
+            if entry is not None:
+                self.coalesced += 1
+                fut, pool = entry
+            else:
+                if len(self._inflight) >= self.capacity:
+                    raise ServiceBusy()
+                try:
+                    fut = self.pool.submit(_TASKS[kind], *args)
+                except BrokenProcessPool:
+                    # Un proceso murió (p. ej. por memoria): se reemplaza el pool completo
+                    self._replace_pool()
+                    fut = self.pool.submit(_TASKS[kind], *args)
+                pool = self.pool
+                self._inflight[key] = (fut, pool)
+                fut.add_done_callback(lambda f, key=key: self._finish(key, f))
+        try:
+            return fut.result(timeout=self.timeout)
+        except FutureTimeout:
+            self._abandon(key, fut, pool)
+            raise
+
+    def _abandon(self, key: Hashable, fut: Future, pool: ProcessPoolExecutor) -> None:
+        """Tras vencer el plazo: libera el cupo y, si la tarea ya corre, recicla su pool."""
+        with self._lock:
+            if self._inflight.get(key, (None,))[0] is fut:
+                del self._inflight[key]
+            if fut.cancel() or fut.done() or pool is not self.pool:
+                return  # seguía en cola, ya terminó o su pool ya se reemplazó
+            self._replace_pool()
+
+    def _finish(self, key: Hashable, fut: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key, (None,))[0] is fut:
+                del self._inflight[key]
+            if fut.cancelled() or fut.exception() is not None:
+                return
+            self._cache[key] = fut.result()
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"workers": self.workers, "capacity": self.capacity, "inflight": len(self._inflight),
+                    "cached": len(self._cache), "hits": self.hits, "coalesced": self.coalesced,
+                    "recycled": self.recycled}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: AnalysisService  # lo asigna make_server
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _params(self) -> Dict[str, str]:
+        params = {k: v[-1] for k, v in parse_qs(urlparse(self.path).query).items()}
+        if self.command == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                body = json.loads(self.rfile.read(length).decode("utf-8"))
+                if not isinstance(body, dict):
+                    raise ValueError("el cuerpo JSON debe ser un objeto")
+                params.update({k: v for k, v in body.items() if v is not None})
+        return params
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                   "application/json; charset=utf-8", headers)
+
+    def do_POST(self) -> None:
+        self.do_GET()
+
+    def do_GET(self) -> None:
+        route = urlparse(self.path).path.rstrip("/")
+        try:
+            params = self._params()
+            if route == "/health":
+                self._json(200, {"ok": True, **self.service.info()})
+                return
+            if route not in ("/analyze", "/evaluate", "/plot"):
+                self._json(404, {"error": f"ruta desconocida: {route}"})
+                return
+            text = str(params.get("f", "")).strip()
+            if not text:
+                self._json(400, {"error": "falta el parámetro f"})
+                return
+            x_value = float(params["x"]) if params.get("x") not in (None, "") else None
+            if route == "/analyze":
+                self._json(200, self.service.call("analyze", text, x_value))
+            elif route == "/evaluate":
+                if x_value is None:
+                    self._json(400, {"error": "falta el parámetro x"})
+                    return
+                self._json(200, self.service.call("evaluate", text, x_value))
+            else:
+                fmt = str(params.get("format", "png")).lower()
+                if fmt not in PLOT_FORMATS:
+                    self._json(400, {"error": f"formato no soportado: {fmt}"})
+                    return
+                window = (float(params.get("xmin", -10)), float(params.get("xmax", 10)))
+                if not window[0] < window[1]:
+                    self._json(400, {"error": "se requiere xmin < xmax"})
+                    return
+                self._send(200, self.service.call("plot", text, x_value, fmt, window), PLOT_FORMATS[fmt])
+        except ServiceBusy:
+            self._json(503, {"error": "servicio ocupado, reintenta"}, {"Retry-After": "1"})
+        except BrokenProcessPool:
+            self._json(503, {"error": "se reinició el proceso de trabajo, reintenta"}, {"Retry-After": "1"})
+        except FutureTimeout:
+            self._json(504, {"error": f"el análisis superó {self.service.timeout:g} s"})
+        except (ValueError, TypeError) as e:
+            self._json(400, {"error": str(e)})
+        except Exception as e:
+            self._json(500, {"error": f"{type(e).__name__}: {e}"})
+
+
+def make_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                service: Optional[AnalysisService] = None) -> ThreadingHTTPServer:
+    """Servidor HTTP (un hilo por conexión) sobre ``service``; ``port=0`` elige un puerto libre."""
+    handler = type("Handler", (_Handler,), {"service": service or AnalysisService()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python main.py serve",
+                                 description="Servicio HTTP local de análisis y gráficos.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("-j", "--workers", type=int, default=0, help="procesos de trabajo (por defecto, uno por CPU)")
+    ap.add_argument("--queue", type=int, default=32, help="tareas en espera antes de responder 503")
+    ap.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="segundos máximos por petición")
+    ap.add_argument("--no-store", action="store_true", help="no usa el almacén persistente")
+    args = ap.parse_args(argv)
+
+    service = AnalysisService(workers=args.workers, queue_size=args.queue, timeout=args.timeout,
+                              use_store=not args.no_store)
+    service.warm_up()
+    server = make_server(args.host, args.port, service)
+    print(f"Escuchando en http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from typing import Optional, Tuple, List
+
+import sympy as sp
+
+from analyzer import AnalysisReport, ANALYZER_VERSION
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parsed (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+"""
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "mat1185")
+
+
+def version_stamp() -> str:
+    return f"sympy-{sp.__version__}/analyzer-{ANALYZER_VERSION}"
+
+
+class ResultStore:
+    """Almacén persistente (SQLite) de reportes y muestras de gráfico entre sesiones.
+
+    Varias instancias de la app pueden compartir el mismo archivo: se usa WAL, las lecturas no
+    toman el lock de escritura (la hora de acceso se anota en lotes) y las entradas menos usadas
+    se eliminan cuando se supera ``max_entries``. Un error de SQLite (archivo bloqueado, dañado
+    o disco lleno) nunca llega al análisis: la lectura cuenta como fallo y la escritura se omite.
+    """
+
+    TOUCH_BATCH = 32  # lecturas acumuladas antes de actualizar last_access
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2000) -> None:
+        if path is None:
+            os.makedirs(default_cache_dir(), exist_ok=True)
+            path = os.path.join(default_cache_dir(), "results.sqlite")
+        self.path = path
+        self.max_entries = max_entries
+        self.stamp = version_stamp()
+        self._local = threading.local()
+        self._touched: List[Tuple[str, str, float]] = []  # (tabla, clave, hora) pendientes
+        self._touched_lock = threading.Lock()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._conn())
+
+    def _key(self, key: str) -> str:
+        return f"{self.stamp}|{key}"
+
+    def _get(self, table: str, key: str) -> Optional[str]:
+        try:
+            row = self._conn().execute(f"SELECT payload FROM {table} WHERE key = ?",
+                                       (self._key(key),)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        with self._touched_lock:
+            self._touched.append((table, self._key(key), time.time()))
+            flush = len(self._touched) >= self.TOUCH_BATCH
+        if flush:
+            try:
+                with self._transaction() as conn:
+                    self._flush_touched(conn)
+            except sqlite3.Error:
+                pass  # sólo afecta el orden de eliminación
+        return row[0]
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        with self._touched_lock:
+            touched, self._touched = self._touched, []
+        for table, key, when in touched:
+            conn.execute(f"UPDATE {table} SET last_access = max(last_access, ?) WHERE key = ?", (when, key))
+
+    def _put(self, table: str, key: str, payload: str) -> None:
+        try:
+            with self._transaction() as conn:
+                self._flush_touched(conn)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {table} (key, payload, last_access) VALUES (?, ?, ?)",
+                    (self._key(key), payload, time.time()),
+                )
+                (count,) = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE key IN "
+                        f"(SELECT key FROM {table} ORDER BY last_access ASC LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+        except sqlite3.Error:
+            pass  # sin almacén el resultado se vuelve a calcular la próxima vez
+
+    # ------------------------------
+    # Expresiones ya simplificadas (texto limpio → srepr)
+    # ------------------------------
+    def get_parsed(self, text: str) -> Optional[str]:
+        return self._get("parsed", text)
+
+    def put_parsed(self, text: str, srepr: str) -> None:
+        self._put("parsed", text, srepr)
+
+    # ------------------------------
+    # Reportes
+    # ------------------------------
+    def get_report(self, key: str) -> Optional[AnalysisReport]:
+        payload = self._get("reports", key)
+        if payload is None:
+            return None
+        try:
+            return AnalysisReport(**json.loads(payload))
+        except (TypeError, ValueError):
+            return None
+
+    def put_report(self, key: str, report: AnalysisReport) -> None:
+        self._put("reports", key, json.dumps(asdict(report)))
+
+    # ------------------------------
+    # Muestras del gráfico
+    # ------------------------------
+    @staticmethod
+    def _samples_key(key: str, window: Tuple[float, float], n: int, mode: str) -> str:
+        return f"{key}|{mode}|{float(window[0])!r}|{float(window[1])!r}|{n}"
+
+    def get_samples(self, key: str, window: Tuple[float, float], n: int,
+                    mode: str = "uniform") -> Optional[Tuple[List[float], List[float]]]:
+        payload = self._get("samples", self._samples_key(key, window, n, mode))
+        if payload is None:
+            return None
+        try:
+            data = json.loads(payload)
+            return data["xs"], data["ys"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def put_samples(self, key: str, window: Tuple[float, float], n: int,
+                    xs: List[float], ys: List[float], mode: str = "uniform") -> None:
+        # Los NaN separan tramos de la curva; json los admite como extensión.
+        self._put("samples", self._samples_key(key, window, n, mode), json.dumps({"xs": xs, "ys": ys}))
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM parsed")
+            conn.execute("DELETE FROM reports")
+            conn.execute("DELETE FROM samples")
+
+
+class _Transaction:
+    """Contexto BEGIN IMMEDIATE / COMMIT sobre una conexión en modo autocommit."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            try:
+                self.conn.execute("COMMIT")
+                return
+            except sqlite3.Error:
+                # p. ej. disco lleno: la transacción no debe quedar abierta para el próximo BEGIN
+                self.conn.execute("ROLLBACK")
+                raise
+        self.conn.execute("ROLLBACK")
+
+
+def open_default_store() -> Optional[ResultStore]:
+    """Abre el almacén por defecto; devuelve None si está deshabilitado o no es accesible."""
+    if os.environ.get("MAT1185_NO_STORE"):
+        return None
+    try:
+        return ResultStore()
+    except (OSError, sqlite3.Error):
+        return None
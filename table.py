@@ -0,0 +1,270 @@
+"""Tablas de valores de f(x) en muchos puntos, escritas a CSV o JSONL a medida que se calculan.
+
+Dos modos: ``float`` usa la función compilada (evaluador por lotes) y ``mpmath`` evalúa con
+precisión arbitraria a ``digits`` cifras, leyendo cada x tal como está escrito (0.1 es 1/10).
+Ni los valores de x ni las filas se guardan en memoria: todo se procesa por bloques.
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+import sympy as sp
+
+from analyzer import division_by_zero_text, value_steps_text
+from grammar import ParseError
+from parser import CompiledFunction, FunctionParser, as_compiled
+
+x = sp.symbols('x')
+
+MODES = ("float", "mpmath")
+FORMATS = ("csv", "jsonl")
+DEFAULT_DIGITS = 30
+CHUNK = 4096          # puntos por bloque en el modo float
+GUARD_DIGITS = 10     # cifras extra con que se calcula en el modo mpmath
+
+XValue = Union[str, float]
+
+
+def iter_x_values(stream: TextIO) -> Iterator[str]:
+    """Un valor de x por línea (tal cual, para no perder precisión); se omiten vacías y comentarios."""
+    for line in stream:
+        text = line.strip()
+        if text and not text.startswith("#"):
+            yield text
+
+
+def linspace(start: float, stop: float, n: int) -> Iterator[float]:
+    """n valores equiespaciados de start a stop, generados uno a uno."""
+    if n == 1:
+        yield start
+        return
+    step = (stop - start) / (n - 1)
+    for i in range(n):
+        yield stop if i == n - 1 else start + i * step
+
+
+class TableEvaluator:
+    """Evalúa f en una secuencia de x y produce una fila (dict) por punto.
+
+    Cada fila tiene ``x``, ``y`` (None si f no está definida), ``defined`` y, si no lo está,
+    ``reason`` ("división por cero", "fuera del dominio" o "x no válido"). Con ``steps=True``
+    se agrega el paso a paso de cada punto, con el mismo texto que el análisis.
+    """
+
+    def __init__(self, fn: CompiledFunction, mode: str = "float", digits: int = DEFAULT_DIGITS,
+                 steps: bool = False) -> None:
+        if mode not in MODES:
+            raise ValueError(f"modo desconocido: {mode!r} (use {' o '.join(MODES)})")
+        self.compiled = as_compiled(fn)
+        self.expr = self.compiled.expr
+        self.mode = mode
+        self.digits = digits
+        self.steps = steps
+        self.expr_str = sp.sstr(self.expr)
+        denom = self.compiled.denom
+        self.denom_str = sp.sstr(denom)
+        self._exact_denom = None
+        self._subs_expr = self.expr
+        if mode == "mpmath":
+            import mpmath
+            self._mp = mpmath
+            # Los decimales de la función también se toman exactos: 0.1 es 1/10 y no su aproximación binaria
+            exact = {f: sp.Rational(str(f)) for f in self.expr.atoms(sp.Float)}
+            denom = denom.xreplace(exact)
+            self._subs_expr = self.expr.xreplace(exact)
+            self._f = sp.lambdify(x, self._subs_expr, modules="mpmath")
+            self._denom = sp.lambdify(x, denom, modules="mpmath") if denom.has(x) else None
+            # El denominador se evalúa con racionales: la división por cero se detecta sin redondeo
+            self._exact_denom = sp.lambdify(x, denom, modules="sympy") if denom.has(x) else None
+        else:
+            self._f = self.compiled.f
+            self._denom = sp.lambdify(x, denom, modules=["math"]) if denom.has(x) else None
+
+    # ------------------------------
+    # Evaluación
+    # ------------------------------
+    def rows(self, xs: Iterable[XValue]) -> Iterator[Dict[str, Any]]:
+        it = iter(xs)
+        while True:
+            chunk = list(itertools.islice(it, CHUNK))
+            if not chunk:
+                return
+            if self.mode == "mpmath":
+                with self._mp.workdps(self.digits + GUARD_DIGITS):
+                    for x0 in chunk:
+                        yield self._mp_row(x0)
+            else:
+                yield from self._float_rows(chunk)
+
+    def _float_rows(self, chunk: List[XValue]) -> Iterator[Dict[str, Any]]:
+        values: List[Optional[float]] = []
+        for x0 in chunk:
+            try:
+                values.append(float(x0))
+            except ValueError:
+                values.append(None)
+        batch = self.compiled.batch
+        if batch is not None:
+            ys = batch(array('d', [v if v is not None else math.nan for v in values]))
+        else:
+            ys = [self._float_value(v) for v in values]
+        for x0, xv, y in zip(chunk, values, ys):
+            if xv is None:
+                yield self._undefined(x0, "x no válido")
+            elif math.isfinite(y):
+                yield self._defined(xv, y)
+            else:
+                yield self._undefined(xv, self._reason(xv))
+
+    def _float_value(self, xv: Optional[float]) -> float:
+        if xv is None:
+            return math.nan
+        try:
+            return float(self._f(xv))
+        except (ArithmeticError, ValueError, TypeError):
+            return math.nan
+
+    def _mp_row(self, x0: XValue) -> Dict[str, Any]:
+        mp = self._mp
+        try:
+            xv = mp.mpf(x0)
+        except (ValueError, TypeError):
+            return self._undefined(x0, "x no válido")
+        if self._exact_denom is not None and self._exact_zero(x0):
+            return self._undefined(x0, "división por cero")
+        try:
+            y = self._f(xv)
+        except (ArithmeticError, ValueError, TypeError):
+            y = None
+        if isinstance(y, mp.mpc) and y.imag == 0:
+            y = y.real
+        if y is None or isinstance(y, mp.mpc) or not mp.isfinite(y):
+            return self._undefined(x0, self._reason(xv))
+        return self._defined(x0, mp.nstr(mp.mpf(y), self.digits))
+
+    def _exact_zero(self, x0: XValue) -> bool:
+        try:
+            return self._exact_denom(sp.Rational(str(x0))) == 0
+        except (ArithmeticError, ValueError, TypeError, sp.SympifyError):
+            return False
+
+    def _reason(self, xv: Any) -> str:
+        if self._denom is not None:
+            try:
+                if self._denom(xv) == 0:
+                    return "división por cero"
+            except ZeroDivisionError:
+                pass
+            except (ArithmeticError, ValueError, TypeError):
+                return "fuera del dominio"
+        return "fuera del dominio"
+
+    # ------------------------------
+    # Filas
+    # ------------------------------
+    def _defined(self, x0: XValue, y: Any) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"x": x0, "y": y, "defined": True}
+        if self.steps:
+            row["steps"] = value_steps_text(self.expr_str, x0, self._substituted(x0), y)
+        return row
+
+    def _undefined(self, x0: XValue, reason: str) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"x": x0, "y": None, "defined": False, "reason": reason}
+        if self.steps:
+            if reason == "división por cero":
+                row["steps"] = division_by_zero_text(self.expr_str, self.denom_str, x0)
+            elif reason == "x no válido":
+                row["steps"] = f"No se pudo interpretar x = {x0!r} como número."
+            else:
+                row["steps"] = (f"f(x) = {self.expr_str}\n"
+                                f"La función no toma un valor real en x = {x0} (fuera del dominio).")
+        return row
+
+    def _substituted(self, x0: XValue) -> str:
+        # En el modo mpmath x se sustituye como racional exacto (0.1 -> 1/10), igual que al escribirlo
+        value = sp.Rational(str(x0)) if self.mode == "mpmath" else x0
+        try:
+            return sp.sstr(self._subs_expr.subs(x, value))
+        except Exception:
+            return "?"
+
+
+# ------------------------------
+# Exportación
+# ------------------------------
+def write_csv(rows: Iterable[Dict[str, Any]], out: TextIO, steps: bool = False) -> int:
+    """Escribe las filas a medida que llegan; devuelve la cantidad de puntos donde f no está definida."""
+    fields = ["x", "y", "defined", "reason"] + (["steps"] if steps else [])
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    undefined = 0
+    for row in rows:
+        if not row["defined"]:
+            undefined += 1
+        y = row["y"]
+        writer.writerow({**row, "y": "" if y is None else repr(y) if isinstance(y, float) else y})
+    return undefined
+
+
+def write_jsonl(rows: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    undefined = 0
+    for row in rows:
+        if not row["defined"]:
+            undefined += 1
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return undefined
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python main.py table",
+        description="Evalúa f(x) en muchos valores de x y escribe la tabla en CSV o JSONL.")
+    ap.add_argument("function", help="función a evaluar, p. ej. \"x^2/(x-1)\"")
+    ap.add_argument("--input", default=None, help="archivo con un valor de x por línea ('-' = entrada estándar)")
+    ap.add_argument("--from", dest="start", type=float, default=-10.0, help="primer x (sin --input)")
+    ap.add_argument("--to", dest="stop", type=float, default=10.0, help="último x (sin --input)")
+    ap.add_argument("-n", "--points", type=int, default=101, help="cantidad de puntos (sin --input)")
+    ap.add_argument("--mode", choices=MODES, default="float",
+                    help="float: función compilada; mpmath: precisión arbitraria")
+    ap.add_argument("--digits", type=int, default=DEFAULT_DIGITS, help="cifras significativas del modo mpmath")
+    ap.add_argument("--steps", action="store_true", help="incluye el paso a paso de cada punto")
+    ap.add_argument("--format", choices=FORMATS, default=None,
+                    help="formato de salida (por defecto según la extensión de -o; si no, csv)")
+    ap.add_argument("-o", "--output", default="-", help="archivo de salida ('-' = salida estándar)")
+    args = ap.parse_args(argv)
+
+    try:
+        parsed = FunctionParser().parse(args.function)
+    except (ParseError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    fmt = args.format or ("jsonl" if args.output.endswith((".jsonl", ".json")) else "csv")
+    evaluator = TableEvaluator(parsed.compiled, mode=args.mode, digits=args.digits, steps=args.steps)
+
+    src = None
+    if args.input is not None:
+        src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        xs: Iterable[XValue] = iter_x_values(src)
+    else:
+        xs = linspace(args.start, args.stop, args.points)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        rows = evaluator.rows(xs)
+        undefined = write_jsonl(rows, out) if fmt == "jsonl" else write_csv(rows, out, args.steps)
+    finally:
+        if src is not None and src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    if undefined:
+        print(f"{undefined} puntos donde f no está definida", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
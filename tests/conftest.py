@@ -0,0 +1,4 @@
+import os
+
+# Las pruebas no deben leer ni escribir el almacén persistente del usuario
+os.environ["MAT1185_NO_STORE"] = "1"
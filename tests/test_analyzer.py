@@ -0,0 +1,104 @@
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import sympy as sp
+
+from analyzer import (AnalysisCache, AnalysisJob, FunctionAnalyzer, FutureTimeout, StageCancelled,
+                      StageTimeout, StageWorkers, canonical_key, run_with_deadline)
+from parser import FunctionParser
+
+x = sp.symbols('x')
+
+
+def analyze_text(text):
+    return FunctionAnalyzer(FunctionParser().parse(text).compiled, cache=None).analyze().x_intercepts
+
+
+def test_analyze_rational():
+    report = FunctionAnalyzer(FunctionParser().parse("(x^2 - 4)/(x - 1)").compiled, cache=None).analyze(x_value=2.0)
+    assert report.domain_str == str(sp.Union(sp.Interval.open(-sp.oo, 1), sp.Interval.open(1, sp.oo)))
+    assert sorted(report.x_intercepts) == ["-2", "2"]
+    assert report.y_intercept == "4"
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="sin fork")
+def test_analyze_after_fork():
+    # El proceso padre ya usó el executor: el hijo debe crear el suyo en lugar de heredar uno sin hilos
+    analyze_text("x**2 - 9")
+    ctx = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(1, mp_context=ctx) as pool:
+        assert sorted(pool.submit(analyze_text, "x**2 - 1").result(timeout=60)) == ["-1", "1"]
+
+
+def test_result_timeout_is_enforced():
+    job = AnalysisJob(x)  # ningún campo se resuelve
+    with pytest.raises(FutureTimeout):
+        job.result(timeout=0.05)
+
+
+@pytest.fixture(scope="module")
+def workers():
+    pool = StageWorkers(size=1)
+    pool.start()
+    yield pool
+    pool.close()
+
+
+SLOW = sp.sin(x) ** 7 / (sp.cos(x) - sp.exp(x))
+
+
+def test_stage_worker_is_reused(workers):
+    before = workers.pids()
+    assert workers.run(sp.sqrt(x), "_domain", (), 60) == sp.Interval(0, sp.oo)
+    assert workers.run(1 / x, "_domain", (), 60) == sp.Union(sp.Interval.open(-sp.oo, 0), sp.Interval.open(0, sp.oo))
+    assert workers.pids() == before
+
+
+def test_timed_out_stage_gets_a_new_worker(workers):
+    workers.run(x, "_domain", (), 60)  # el proceso ya está listo
+    before = workers.pids()
+    with pytest.raises(StageTimeout):
+        workers.run(SLOW, "_range", (sp.S.Reals,), 0.01)
+    after = workers.pids()
+    assert len(after) == 1 and after != before
+    assert workers.run(x**2, "_domain", (), 60) == sp.S.Reals
+
+
+def test_cancelled_stage_raises(workers):
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(StageCancelled):
+        workers.run(SLOW, "_range", (sp.S.Reals,), 60, cancel)
+    assert len(workers.pids()) == 1
+
+
+def domain_in_child(expr):
+    return run_with_deadline(expr, "_domain", (), 60)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="sin fork")
+def test_stage_workers_after_fork():
+    assert run_with_deadline(sp.sqrt(x), "_domain", (), 60) == sp.Interval(0, sp.oo)
+    ctx = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(1, mp_context=ctx) as pool:
+        assert pool.submit(domain_in_child, sp.log(x)).result(timeout=60) == sp.Interval.open(0, sp.oo)
+
+
+def test_profiled_analysis_does_not_touch_the_cache():
+    cache = AnalysisCache()
+    compiled = FunctionParser().parse("x**2 - 4").compiled
+    report = FunctionAnalyzer(compiled, cache=cache, profile=True).analyze()
+    assert report.profile and "cumulative" in report.profile
+    assert cache.get(canonical_key(compiled.expr)) is None
+
+
+def test_y_intercept_falls_back_to_numeric_when_simplify_times_out():
+    compiled = FunctionParser().parse("sin(x + 1)*exp(x) + cos(x)").compiled
+    report = FunctionAnalyzer(compiled, cache=None, budgets={"y_intercept": 1e-6}).analyze()
+    assert "y_intercept" in report.estimated
+    assert float(report.y_intercept) == pytest.approx(math.sin(1) + 1)
+    exact = FunctionAnalyzer(compiled, cache=None).analyze()
+    assert exact.y_intercept == "sin(1) + 1" and "y_intercept" not in exact.estimated
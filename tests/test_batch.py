@@ -0,0 +1,60 @@
+import io
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+import batch
+from batch import iter_expressions, run_batch
+
+
+def run(expressions, **kwargs):
+    out = io.StringIO()
+    failures = run_batch(iter(expressions), out, **kwargs)
+    records = sorted((json.loads(line) for line in out.getvalue().splitlines()), key=lambda r: r["index"])
+    return failures, records
+
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="el reemplazo de analyze_one sólo lo heredan procesos creados con fork")
+
+
+def fake_analyze(parser, text, x_value=None, png_path=None, store=None):
+    # Los procesos de trabajo se crean con fork: heredan este reemplazo de analyze_one
+    if text == "lento":
+        time.sleep(60)
+    return {"ok": True, "pid": os.getpid()}
+
+
+def test_iter_expressions_skips_blank_lines_and_comments():
+    assert list(iter_expressions(io.StringIO("x^2\n\n# comentario\n  sin(x)  \n"))) == ["x^2", "sin(x)"]
+
+
+def test_records_one_line_per_function():
+    failures, records = run(["x^2 - 4", "1/x", "x + foo(x)"], workers=2, x_value=2.0)
+    assert failures == 1
+    assert [r["input"] for r in records] == ["x^2 - 4", "1/x", "x + foo(x)"]
+    assert records[0]["ok"] and "2" in records[0]["x_intercepts"]
+    assert records[1]["ok"] and records[1]["timings"]["total"] > 0
+    assert not records[2]["ok"] and "ParseError" in records[2]["error"]
+
+
+@needs_fork
+def test_timeout_kills_worker_and_continues(monkeypatch):
+    monkeypatch.setattr(batch, "analyze_one", fake_analyze)
+    start = time.monotonic()
+    failures, records = run(["lento", "x", "x + 1"], workers=1, timeout=0.5)
+    assert time.monotonic() - start < 30
+    assert failures == 1
+    assert not records[0]["ok"] and "tiempo agotado" in records[0]["error"]
+    assert records[1]["ok"] and records[2]["ok"]
+
+
+@needs_fork
+def test_workers_are_recycled_after_tasks_per_worker(monkeypatch):
+    monkeypatch.setattr(batch, "analyze_one", fake_analyze)
+    failures, records = run([f"x + {i}" for i in range(5)], workers=1, tasks_per_worker=2)
+    assert failures == 0
+    pids = [r["pid"] for r in records]
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
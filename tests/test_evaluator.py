@@ -0,0 +1,69 @@
+import math
+
+import pytest
+import sympy as sp
+
+from evaluator import BatchEvaluator, compile_batch
+
+x = sp.symbols('x')
+
+POINTS = [-3.0, -1.0, -0.5, 0.0, 0.5, 1.0, 2.0, 3.0]
+
+
+def same(a, b):
+    return (math.isnan(a) and math.isnan(b)) or a == pytest.approx(b)
+
+
+@pytest.mark.parametrize("expr", [
+    sp.sin(x)**2 + sp.sin(x) * sp.cos(x),
+    1 / (x - 1) + 1 / (x + 1),
+    sp.sqrt(x) + sp.log(x),
+    sp.exp(-x**2) * sp.Abs(x - 2),
+    x**sp.Rational(1, 3),
+])
+def test_batch_matches_scalar_and_lambdify(expr):
+    evaluator = BatchEvaluator(expr)
+    batch = evaluator(POINTS)
+    reference = sp.lambdify(x, expr, "math")
+    for value, got in zip(POINTS, batch):
+        assert same(got, evaluator.scalar(value))
+        try:
+            expected = float(reference(value))
+        except (ArithmeticError, ValueError, TypeError):
+            expected = math.nan
+        assert same(got, expected)
+
+
+def test_poles_and_domain_errors_become_nan():
+    evaluator = BatchEvaluator(1 / (x - 1) + sp.log(x))
+    values = evaluator([-1.0, 1.0, 2.0])
+    assert math.isnan(values[0]) and math.isnan(values[1])
+    assert values[2] == pytest.approx(1 + math.log(2))
+    assert math.isnan(evaluator.scalar(1.0))
+
+
+def test_sample_keeps_only_finite_points():
+    xs, ys = BatchEvaluator(1 / x).sample(-1.0, 1.0, 5)
+    assert xs == [-1.0, -0.5, 0.5, 1.0]
+    assert ys == [-1.0, -2.0, 2.0, 1.0]
+
+
+def test_common_subexpressions_are_computed_once():
+    source = BatchEvaluator(sp.sin(x**2 + 1) + sp.cos(x**2 + 1)).source
+    # Una vez en cada una de las tres funciones generadas (_batch, _sample, _scalar)
+    assert source.count("_mat_c0 = x**2 + 1") == 3
+    assert source.count("x**2 + 1") == 3
+
+
+def test_bind_parameters():
+    a, b = sp.symbols('a b')
+    family = BatchEvaluator(a * sp.sin(b * x), (a, b))
+    bound = family.bind([2, 3])
+    assert bound.scalar(1.0) == pytest.approx(2 * math.sin(3))
+    assert family.bind([1, 1]).scalar(1.0) == pytest.approx(math.sin(1))
+    with pytest.raises(ValueError):
+        family.bind([1])
+
+
+def test_compile_batch_returns_none_for_unsupported():
+    assert compile_batch(sp.Function('g')(x)) is None
@@ -0,0 +1,45 @@
+import pytest
+import sympy as sp
+from sympy.calculus.util import continuous_domain, function_range
+
+import fastpath
+from analyzer import FunctionAnalyzer
+from parser import FunctionParser
+
+x = sp.symbols('x')
+
+CASES = [
+    x**2 - 1,
+    x**3 - 3 * x,
+    1 / x,
+    (x**2 - 4) / (x - 2),
+    (x**2 - 1) / (x**2 - 4),
+    (x + 1) / (x**2 + 1),
+    x**2 * (x - 1) / (x - 1),
+]
+
+
+@pytest.mark.parametrize("expr", CASES)
+def test_matches_sympy(expr):
+    assert fastpath.classify(expr) != fastpath.GENERIC
+    dom = continuous_domain(expr, x, sp.S.Reals)
+    assert fastpath.domain(expr) == dom
+    assert fastpath.function_range(expr) == function_range(expr, x, dom)
+    assert sp.FiniteSet(*[r for r, _ in fastpath.roots_in_domain(expr)]) == sp.solveset(expr, x, dom)
+
+
+def test_multiplicities():
+    assert fastpath.roots_in_domain((x - 1)**2 * (x + 2)) == [(-2, 1), (1, 2)]
+
+
+def test_generic_is_left_to_sympy():
+    assert fastpath.classify(sp.sin(x)) == fastpath.GENERIC
+    assert fastpath.classify(sp.sqrt(2) * x) == fastpath.GENERIC
+
+
+def test_unsimplified_parse_keeps_the_hole():
+    compiled = FunctionParser(simplify=False).parse("(x^2 - 4)/(x - 2)").compiled
+    report = FunctionAnalyzer(compiled, cache=None).analyze()
+    assert report.domain_str == str(sp.Union(sp.Interval.open(-sp.oo, 2), sp.Interval.open(2, sp.oo)))
+    assert report.range_str == str(sp.Union(sp.Interval.open(-sp.oo, 4), sp.Interval.open(4, sp.oo)))
+    assert report.x_intercepts == ["-2"]
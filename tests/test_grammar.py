@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+import sympy as sp
+
+from grammar import ParseError, from_srepr, parse_expression
+from parser import ALLOWED_FUNCS
+
+x = sp.symbols('x')
+NAMES = {**ALLOWED_FUNCS, "x": x}
+
+
+def test_parse_precedence_and_power():
+    assert parse_expression("2*x^2 + 1", NAMES) == 2 * x**2 + 1
+    assert parse_expression("-x**2", NAMES) == -x**2
+    assert parse_expression("2**3**2", NAMES) == 512
+
+
+def test_parse_functions():
+    assert parse_expression("sin(x) + ln(x)", NAMES) == sp.sin(x) + sp.log(x)
+
+
+@pytest.mark.parametrize("text, position", [("x +", 3), ("(x", 2), ("x $ 1", 2)])
+def test_error_position(text, position):
+    with pytest.raises(ParseError) as info:
+        parse_expression(text, NAMES)
+    assert info.value.position == position
+
+
+def test_unknown_name_is_rejected():
+    with pytest.raises(ParseError):
+        parse_expression("__import__('os')", NAMES)
+
+
+def test_parse_error_pickle_round_trip():
+    err = ParseError("falta un operando", 3, "x +")
+    copy = pickle.loads(pickle.dumps(err))
+    assert isinstance(copy, ParseError)
+    assert (copy.message, copy.position, copy.text) == (err.message, err.position, err.text)
+    assert str(copy) == str(err)
+
+
+@pytest.mark.parametrize("text", ["-" * 3000 + "x", "x" + "**x" * 2000, "(" * 500 + "x" + ")" * 500])
+def test_deep_nesting_is_a_parse_error(text):
+    with pytest.raises(ParseError, match="anidada"):
+        parse_expression(text, NAMES)
+
+
+def test_moderate_nesting_is_accepted():
+    assert parse_expression("-" * 50 + "x", NAMES) == x
+    assert parse_expression("(" * 90 + "x" + ")" * 90, NAMES) == x
+
+
+@pytest.mark.parametrize("expr", [
+    sp.Piecewise((x, x > 0), (-x, True)),
+    sp.Float("0.1") * x - sp.Rational(1, 3),
+    sp.pi * sp.exp(x) + sp.floor(x),
+    sp.sqrt(x - 1) / (x**2 - 1),
+    sp.Max(x, 0) + sp.Abs(x),
+])
+def test_from_srepr_round_trip(expr):
+    assert from_srepr(sp.srepr(expr)) == expr
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('true')",
+    "Add(\"__import__('os')\")",
+    "Symbol('x').subs(1, 2)",
+    "Symbol('a b')",
+    "Float('1+1')",
+    "Lambda(Symbol('x'), Symbol('x'))(1)",
+])
+def test_from_srepr_rejects_code(text):
+    with pytest.raises(ValueError):
+        from_srepr(text)
@@ -0,0 +1,80 @@
+import math
+import random
+
+import pytest
+import sympy as sp
+
+from interval import compile_interval, enclose_range, root_candidates, undefined_parts
+
+x = sp.symbols('x')
+
+
+def scalar(expr):
+    f = sp.lambdify(x, expr, modules=["math"])
+
+    def value(t):
+        try:
+            v = f(t)
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+        return v if isinstance(v, float) and math.isfinite(v) else None
+    return value
+
+
+@pytest.mark.parametrize("expr", [
+    x**3 - 2 * x, 1 / (x - 1), sp.sqrt(x - 1) + sp.sin(x), sp.log(x**2 + 1) * sp.cos(3 * x),
+    sp.exp(-x**2) / (x + 0.5), sp.Abs(x) ** sp.Rational(2, 3), sp.tan(x), 2**x - x**x,
+    (-2)**x - 4, sp.floor(x) * x, sp.Max(x, sp.sin(x)),
+])
+def test_enclosures_contain_sampled_values(expr):
+    F, f = compile_interval(expr), scalar(expr)
+    assert F is not None
+    rnd = random.Random(1185)
+    for _ in range(200):
+        lo = rnd.uniform(-10, 10)
+        hi = lo + rnd.choice([1e-6, 0.01, 0.5, 3.0])
+        enc = F(lo, hi)
+        for t in (lo, hi, rnd.uniform(lo, hi)):
+            v = f(t)
+            if v is not None:
+                assert not enc.empty and enc.lo <= v <= enc.hi, (expr, lo, hi, t, v, enc)
+
+
+def test_negative_base_with_symbolic_exponent_is_not_undefined():
+    F = compile_interval((-2)**x - 4)
+    assert undefined_parts(F, -10, 10) == []
+    assert any(a <= 2 <= b for a, b in root_candidates(F, -10, 10))
+
+
+def test_x_to_the_x_keeps_negative_integers():
+    F, f = compile_interval(x**x), scalar(x**x)
+    assert f(-1.0) == -1.0
+    assert not any(a <= -1 <= b for a, b in undefined_parts(F, -10, 10))
+    bound = enclose_range(F, f, -10, 10)
+    assert bound.lower <= -1
+
+
+def test_undefined_parts_are_verified():
+    parts = undefined_parts(compile_interval(sp.sqrt(x - 1)), -10, 10)
+    assert parts[0][0] == -10 and all(b <= 1 for _, b in parts) and parts[-1][1] > 0.99
+
+
+def test_range_enclosure_contains_attained():
+    F, f = compile_interval(x**2 - 1), scalar(x**2 - 1)
+    bound = enclose_range(F, f, -2, 3)
+    assert bound.lower <= -1 <= bound.attained_lo + 1e-9
+    assert bound.attained_hi - 1e-9 <= 8 <= bound.upper
+    assert bound.upper - bound.lower < 9.1
+
+
+def test_root_candidates_exclude_root_free_windows():
+    F = compile_interval(x**2 + 1)
+    assert root_candidates(F, -10, 10) == []
+
+
+def test_integer_valued_function_converges():
+    # math.floor devuelve int: sus valores también cuentan como alcanzados
+    F, f = compile_interval(sp.floor(x)), sp.lambdify(x, sp.floor(x), modules=["math"])
+    bound = enclose_range(F, f, -10, 10)
+    assert (bound.attained_lo, bound.attained_hi) == (-10, 10)
+    assert bound.evals < 3000
@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+import numeric
+
+
+def samples(f, xmin=-2.0, xmax=2.0, n=401):
+    return numeric.sample_points(f, xmin, xmax, n)
+
+
+def test_zero_function_has_no_point_roots():
+    xs, ys = samples(lambda t: 0.0)
+    assert numeric.find_roots(lambda t: 0.0, xs, ys) == []
+    assert numeric.zero_runs(xs, ys) == [(xs[0], xs[-1])]
+
+
+def test_floor_reports_one_zero_interval():
+    f = lambda t: float(math.floor(t))
+    xs, ys = samples(f)
+    assert numeric.find_roots(f, xs, ys) == []
+    (a, b), = numeric.zero_runs(xs, ys)
+    assert 0.0 <= a < 0.02 and 0.98 < b < 1.0
+
+
+def test_polynomial_roots():
+    f = lambda t: t * (t - 1)
+    xs, ys = samples(f, n=400)  # ninguna muestra cae justo en 0 ni en 1
+    roots = numeric.find_roots(f, xs, ys)
+    assert roots == pytest.approx([0.0, 1.0], abs=1e-9)
+    assert numeric.zero_runs(xs, ys) == []
+
+
+def test_isolated_zero_sample_is_a_root():
+    f = lambda t: t * (t - 1)
+    xs, ys = samples(f, n=401)  # x = 0 y x = 1 son muestras
+    assert numeric.find_roots(f, xs, ys) == pytest.approx([0.0, 1.0], abs=1e-9)
+
+
+def test_pole_is_not_a_root():
+    f = lambda t: 1 / t
+    xs, ys = samples(f, n=400)
+    assert numeric.find_roots(f, xs, ys, denom=lambda t: t) == []
+
+
+def test_adaptive_sample_breaks_at_pole():
+    xs, ys, evals = numeric.adaptive_sample(lambda t: 1 / t, -1.0, 1.0, breakpoints=[0.0])
+    assert evals > 0
+    assert any(math.isnan(v) for v in xs)
@@ -0,0 +1,75 @@
+import pytest
+import sympy as sp
+
+from grammar import ParseError
+from parser import FunctionParser, check_param_name
+from store import ResultStore
+
+x = sp.symbols('x')
+
+
+def test_parse_simplifies_and_compiles():
+    parsed = FunctionParser().parse("(x^2 - 1)/(x - 1)")
+    assert parsed.expr == x + 1
+    assert parsed.compiled.f(2.0) == 3.0
+
+
+def test_parse_memoizes_by_text():
+    parser = FunctionParser()
+    first = parser.parse("sin(x) + 1")
+    assert parser.parse("sin(x) + 1").compiled is first.compiled
+
+
+def test_parse_error_keeps_position():
+    with pytest.raises(ParseError) as info:
+        FunctionParser().parse("x + foo(x)")
+    assert info.value.position == 4
+
+
+@pytest.mark.parametrize("text", ["", "   ", "x < 1"])
+def test_invalid_input(text):
+    with pytest.raises(ValueError):
+        FunctionParser().parse(text)
+
+
+def test_parameters_bind_without_reparsing():
+    parser = FunctionParser()
+    parsed = parser.parse("a*x + b", params={"a": 2, "b": 1})
+    assert parsed.compiled.f(3.0) == 7.0
+    other = parser.parse("a*x + b", params={"a": 1, "b": 0})
+    assert other.family is parsed.family
+    assert other.compiled.f(3.0) == 3.0
+
+
+def test_parameters_named_like_generated_locals():
+    # n, xs, out, step y xmin son también nombres del código generado por BatchEvaluator
+    params = {"n": 2, "xs": 3, "out": 1, "step": 4, "xmin": 5}
+    compiled = FunctionParser().parse("n*sin(xs*x) + out/(x - step) + xmin", params=params).compiled
+    expected = [compiled.f(v) for v in (0.5, 1.0, 2.5)]
+    assert list(compiled.batch([0.5, 1.0, 2.5])) == pytest.approx(expected)
+    assert compiled.batch.scalar(1.0) == pytest.approx(expected[1])
+    xs, ys = compiled.batch.sample(0.5, 2.5, 5)
+    assert ys == pytest.approx([compiled.f(v) for v in xs])
+
+
+@pytest.mark.parametrize("name", ["x", "sin", "x1", "pi", "lambda", "1a"])
+def test_invalid_param_names(name):
+    with pytest.raises(ValueError):
+        check_param_name(name)
+
+
+def test_store_warm_start(tmp_path):
+    store = ResultStore(str(tmp_path / "store.sqlite"))
+    expr = FunctionParser(store=store).parse("(x^2 - 1)/(x - 1)").expr
+    parsed = FunctionParser(store=store).parse("(x^2 - 1)/(x - 1)")
+    assert parsed.expr == expr
+    stages = parsed.timings["durations"]
+    assert "srepr" in stages and "simplify" not in stages
+
+
+def test_store_entry_with_code_is_ignored(tmp_path):
+    store = ResultStore(str(tmp_path / "store.sqlite"))
+    store.put_parsed("x + 1", "__import__('os').getpid()")
+    parsed = FunctionParser(store=store).parse("x + 1")
+    assert parsed.expr == x + 1
+    assert store.get_parsed("x + 1") == sp.srepr(x + 1)
@@ -0,0 +1,67 @@
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+import service
+
+
+@pytest.fixture
+def server():
+    svc = service.AnalysisService(workers=1, queue_size=1, timeout=30, use_store=False)
+    srv = service.make_server(port=0, service=svc)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    svc.close()
+
+
+def request(srv, method, path, body=None):
+    conn = http.client.HTTPConnection(*srv.server_address, timeout=60)
+    payload = None if body is None else body.encode("utf-8")
+    conn.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    data = resp.read()
+    conn.close()
+    return resp.status, data
+
+
+def test_health(server):
+    status, data = request(server, "GET", "/health")
+    assert status == 200 and json.loads(data)["ok"] is True
+
+
+@pytest.mark.parametrize("body", ["[1, 2]", "\"x\"", "3", "{no es json"])
+def test_body_must_be_a_json_object(server, body):
+    status, data = request(server, "POST", "/analyze", body)
+    assert status == 400
+    assert "error" in json.loads(data)
+
+
+def test_parse_error_is_a_400_and_keeps_the_pool(server):
+    status, data = request(server, "GET", "/analyze?f=x%20%2B")
+    assert status == 400
+    assert "posición" in json.loads(data)["error"]
+    status, data = request(server, "GET", "/evaluate?f=x%2B1&x=2")
+    assert status == 200 and json.loads(data)["y"] == 3.0
+    assert server.RequestHandlerClass.service.recycled == 0
+
+
+def test_timeout_frees_capacity_and_recycles_pool(monkeypatch):
+    monkeypatch.setitem(service._TASKS, "sleep", time.sleep)
+    svc = service.AnalysisService(workers=1, queue_size=0, timeout=0.5, use_store=False)
+    try:
+        svc.warm_up()
+        with pytest.raises(service.FutureTimeout):
+            svc.call("sleep", 30)
+        info = svc.info()
+        assert info["inflight"] == 0 and info["recycled"] == 1
+        # Sin reciclar, el único proceso seguiría ocupado y esta llamada vencería también
+        svc.timeout = 30
+        assert svc.call("sleep", 0) is None
+    finally:
+        svc.close()
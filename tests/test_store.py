@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+import sympy as sp
+
+from analyzer import FunctionAnalyzer
+from parser import FunctionParser
+from store import ResultStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "store.sqlite"), max_entries=3)
+
+
+def report_for(text, store=None):
+    return FunctionAnalyzer(FunctionParser().parse(text).compiled, cache=None, store=store).analyze()
+
+
+def test_round_trip(store):
+    report = report_for("x**2 - 1")
+    store.put_report("k", report)
+    assert store.get_report("k") == report
+    store.put_samples("k", (-1.0, 1.0), 3, [-1.0, 0.0, 1.0], [0.0, float("nan"), 0.0])
+    xs, ys = store.get_samples("k", (-1.0, 1.0), 3)
+    assert xs == [-1.0, 0.0, 1.0] and ys[0] == 0.0
+    assert store.get_samples("k", (-1.0, 2.0), 3) is None
+
+
+def test_version_stamp_isolates_entries(store):
+    store.put_parsed("x + 1", "Add(Symbol('x'), Integer(1))")
+    store.stamp = "otra-version"
+    assert store.get_parsed("x + 1") is None
+
+
+def test_least_recently_used_is_evicted(store):
+    for i in range(3):
+        store.put_parsed(f"k{i}", str(i))
+    assert store.get_parsed("k0") == "0"  # k0 pasa a ser la más reciente
+    store.put_parsed("k3", "3")
+    assert store.get_parsed("k1") is None
+    assert [store.get_parsed(k) for k in ("k0", "k2", "k3")] == ["0", "2", "3"]
+
+
+def test_reads_do_not_need_the_write_lock(store):
+    store.put_parsed("x", "Symbol('x')")
+    other = sqlite3.connect(store.path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        assert store.get_parsed("x") == "Symbol('x')"
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+
+def test_sqlite_errors_fall_back_to_computing(store):
+    store._conn().execute("DROP TABLE reports")
+    report = report_for("(x - 1)*(x + 2)", store=store)
+    assert sorted(report.x_intercepts) == ["-2", "1"]
+    assert store.get_report("cualquiera") is None
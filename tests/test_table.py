@@ -0,0 +1,88 @@
+import csv
+import io
+import itertools
+import json
+
+import pytest
+
+from parser import FunctionParser
+from table import TableEvaluator, linspace, main, write_csv, write_jsonl
+
+# sqrt(2) redondeado a 15, 30 y 50 cifras significativas (nstr omite los ceros finales)
+SQRT2 = {15: "1.4142135623731",
+         30: "1.41421356237309504880168872421",
+         50: "1.4142135623730950488016887242096980785696718753769"}
+
+
+def evaluator(text, **kwargs):
+    return TableEvaluator(FunctionParser().parse(text).compiled, **kwargs)
+
+
+def test_float_rows_and_reasons():
+    rows = list(evaluator("sqrt(x)/x").rows([0, -1, "abc", 4]))
+    assert [r.get("reason") for r in rows] == ["división por cero", "fuera del dominio", "x no válido", None]
+    assert rows[3] == {"x": 4.0, "y": 0.5, "defined": True}
+
+
+@pytest.mark.parametrize("digits", sorted(SQRT2))
+def test_mpmath_digits(digits):
+    (row,) = evaluator("sqrt(2)*x", mode="mpmath", digits=digits).rows(["1"])
+    assert row["y"] == SQRT2[digits]
+
+
+def test_mpmath_reads_decimals_exactly():
+    # 0.1**2 - 0.01 no es 0 en binario: sólo el modo mpmath detecta el polo
+    (row,) = evaluator("1/(x^2 - 0.01)").rows(["0.1"])
+    assert row["defined"]
+    (row, near) = evaluator("1/(x^2 - 0.01)", mode="mpmath").rows(["0.1", "0.2"])
+    assert row["reason"] == "división por cero"
+    assert near["y"] == "33.3333333333333333333333333333"
+
+
+def test_steps_explain_division_by_zero():
+    (row,) = evaluator("1/(x - 2)", steps=True).rows([2.0])
+    assert "x - 2" in row["steps"]
+
+
+def test_rows_are_streamed():
+    rows = evaluator("x^2").rows(itertools.count())
+    assert [r["y"] for r in itertools.islice(rows, 3)] == [0.0, 1.0, 4.0]
+
+
+class Spy:
+    """Fuente de filas que verifica que la anterior ya fue escrita antes de producir la siguiente."""
+
+    def __init__(self, rows, out):
+        self.rows, self.out = rows, out
+
+    def __iter__(self):
+        for i, row in enumerate(self.rows):
+            if i:
+                assert self.out.getvalue().count("\n") >= i
+            yield row
+
+
+@pytest.mark.parametrize("writer", [write_csv, write_jsonl])
+def test_writers_write_each_row_as_it_arrives(writer):
+    out = io.StringIO()
+    rows = evaluator("1/x").rows(linspace(-1.0, 1.0, 5))
+    assert writer(Spy(rows, out), out) == 1
+
+
+def test_csv_and_jsonl_output():
+    out = io.StringIO()
+    write_csv(evaluator("1/x").rows([0.0, 3.0]), out)
+    first, second = csv.DictReader(io.StringIO(out.getvalue()))
+    assert first["y"] == "" and first["reason"] == "división por cero"
+    assert float(second["y"]) == 1 / 3.0
+    out = io.StringIO()
+    write_jsonl(evaluator("1/x").rows([0.0, 3.0]), out)
+    assert [json.loads(line)["defined"] for line in out.getvalue().splitlines()] == [False, True]
+
+
+def test_main_writes_file(tmp_path, capsys):
+    path = tmp_path / "tabla.jsonl"
+    assert main(["1/x", "--from", "-1", "--to", "1", "-n", "3", "-o", str(path)]) == 0
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["x"] for r in rows] == [-1.0, 0.0, 1.0]
+    assert "1 puntos" in capsys.readouterr().err
@@ -0,0 +1,61 @@
+from array import array
+
+import pytest
+
+from tiles import TILES_PER_VIEW, TileCache, tile_nbytes, tiles_for_view
+
+
+def make_tile(n):
+    return array('d', range(n)), array('d', range(n))
+
+
+@pytest.mark.parametrize("view", [(-10.0, 10.0), (0.1, 0.35), (-1e-3, 2e-3), (1000.0, 1700.0)])
+def test_tiles_cover_the_view(view):
+    xmin, xmax = view
+    tiles = list(tiles_for_view(xmin, xmax))
+    assert tiles[0][2] <= xmin and tiles[-1][3] >= xmax
+    assert TILES_PER_VIEW <= len(tiles) <= 2 * TILES_PER_VIEW + 1
+    for (_, _, _, b), (_, _, a, _) in zip(tiles, tiles[1:]):
+        assert a == b
+
+
+def test_panning_reuses_tile_keys():
+    before = {tile[:2] for tile in tiles_for_view(0.0, 8.0)}
+    after = {tile[:2] for tile in tiles_for_view(1.0, 9.0)}
+    assert len(before & after) >= len(before) - 1
+
+
+def test_eviction_respects_byte_budget():
+    size = tile_nbytes(make_tile(10))
+    cache = TileCache(budget=3 * size)
+    for key in "abc":
+        cache.put(key, make_tile(10))
+    assert cache.get("a") is not None  # "a" pasa a ser el más reciente
+    cache.put("d", make_tile(10))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert cache.nbytes == 3 * size <= cache.budget
+
+
+def test_replacing_a_tile_updates_size():
+    cache = TileCache()
+    cache.put("a", make_tile(10))
+    cache.put("a", make_tile(4))
+    assert cache.nbytes == tile_nbytes(make_tile(4))
+    assert cache.info()["tiles"] == 1
+
+
+def test_oversized_tile_is_not_cached():
+    cache = TileCache(budget=tile_nbytes(make_tile(4)))
+    cache.put("big", make_tile(100))
+    assert cache.get("big") is None and cache.nbytes == 0
+
+
+def test_resize_evicts_down_to_budget():
+    size = tile_nbytes(make_tile(10))
+    cache = TileCache(budget=4 * size)
+    for key in range(4):
+        cache.put(key, make_tile(10))
+    cache.resize(2 * size)
+    assert cache.info()["tiles"] == 2
+    assert cache.get(0) is None and cache.get(3) is not None
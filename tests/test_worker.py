@@ -0,0 +1,83 @@
+import threading
+import time
+
+from worker import BackgroundRunner, Cancelled
+
+
+class FakeMaster:
+    """Sustituto de Tk: ``after`` guarda el callback y ``pump`` lo ejecuta (como el bucle de eventos)."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, fn):
+        self.pending.append(fn)
+
+    def pump(self):
+        pending, self.pending = self.pending, []
+        for fn in pending:
+            fn()
+
+
+def wait_for(condition, master=None, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        if master is not None:
+            master.pump()
+        time.sleep(0.01)
+
+
+def test_done_is_delivered_on_the_tk_loop():
+    master = FakeMaster()
+    runner = BackgroundRunner(master)
+    results = []
+    runner.start(lambda ctx: 42, results.append, results.append)
+    wait_for(lambda: results, master)
+    assert results == [42] and not runner.busy()
+
+
+def test_superseded_task_is_cancelled_and_its_result_dropped():
+    master = FakeMaster()
+    runner = BackgroundRunner(master)
+    release = threading.Event()
+    results = []
+
+    def slow(ctx):
+        release.wait()
+        ctx.progress("después")
+        return "vieja"
+
+    runner.start(slow, results.append, results.append)
+    runner.start(lambda ctx: "nueva", results.append, results.append)
+    wait_for(lambda: results, master)
+    release.set()
+    wait_for(lambda: runner.threads() == 0, master)
+    master.pump()
+    assert results == ["nueva"]
+
+
+def test_stuck_tasks_do_not_pile_up_threads():
+    # Tareas que no llegan a ``progress``: cada tecla cancelaría una sin poder interrumpirla
+    master = FakeMaster()
+    runner = BackgroundRunner(master)
+    release = threading.Event()
+    started = []
+    results = []
+
+    def stuck(ctx):
+        started.append(ctx.generation)
+        release.wait()
+        if ctx.cancelled():
+            raise Cancelled()
+        return ctx.generation
+
+    for _ in range(20):
+        runner.start(stuck, results.append, results.append)
+        assert runner.threads() <= BackgroundRunner.MAX_THREADS
+    release.set()
+    wait_for(lambda: results, master)
+    wait_for(lambda: runner.threads() == 0, master)
+    # Sólo corren las primeras (ya en un hilo) y la última; las intermedias se descartan sin ejecutarse
+    assert len(started) == BackgroundRunner.MAX_THREADS + 1
+    assert results == [20]
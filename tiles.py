@@ -0,0 +1,93 @@
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+import math
+import threading
+
+# Cada vista se cubre con entre TILES_PER_VIEW y 2·TILES_PER_VIEW baldosas alineadas
+TILES_PER_VIEW = 4
+# Presupuesto de memoria por defecto para las muestras en caché (bytes)
+DEFAULT_BUDGET = 16 * 1024 * 1024
+
+Tile = Tuple[array, array]
+
+
+def tile_level(xmin: float, xmax: float) -> int:
+    """Nivel de zoom: las baldosas miden 2**nivel, de modo que la vista abarque unas pocas."""
+    return math.floor(math.log2((xmax - xmin) / TILES_PER_VIEW))
+
+
+def tiles_for_view(xmin: float, xmax: float) -> Iterator[Tuple[int, int, float, float]]:
+    """(nivel, índice, a, b) de las baldosas alineadas que cubren [xmin, xmax].
+
+    Las baldosas de un mismo nivel están en una grilla fija, así que desplazar la vista
+    (o volver a una ya vista) reutiliza las mismas claves.
+    """
+    level = tile_level(xmin, xmax)
+    width = 2.0 ** level
+    for k in range(math.floor(xmin / width), math.ceil(xmax / width)):
+        yield level, k, k * width, (k + 1) * width
+
+
+def tile_nbytes(tile: Tile) -> int:
+    xs, ys = tile
+    return xs.itemsize * len(xs) + ys.itemsize * len(ys)
+
+
+class TileCache:
+    """Caché LRU de tramos de curva ya muestreados, acotada por memoria en lugar de por cantidad."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET) -> None:
+        self.budget = budget
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tile]:
+        with self._lock:
+            tile = self._data.get(key)
+            if tile is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return tile
+
+    def put(self, key: Hashable, tile: Tile) -> None:
+        size = tile_nbytes(tile)
+        if size > self.budget:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= tile_nbytes(old)
+            self._data[key] = tile
+            self.nbytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.nbytes > self.budget and self._data:
+            _, old = self._data.popitem(last=False)
+            self.nbytes -= tile_nbytes(old)
+
+    def resize(self, budget: int) -> None:
+        with self._lock:
+            self.budget = budget
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+            self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "tiles": len(self._data),
+                    "nbytes": self.nbytes, "budget": self.budget}
+
+
+# Caché compartida: volver a una función ya graficada reutiliza sus baldosas
+tile_cache = TileCache()
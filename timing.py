@@ -0,0 +1,144 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+Timings = Dict[str, Dict[str, float]]  # {"durations": {etapa: s}, "counts": {etapa: n}}
+Hook = Callable[[str, Timings], None]
+
+_hooks: List[Hook] = []
+
+
+class Timer:
+    """Acumula la duración (s) y conteos (p. ej. evaluaciones de f) de cada etapa; apto para hilos."""
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def as_dict(self) -> Timings:
+        with self._lock:
+            return {"durations": dict(self.durations), "counts": dict(self.counts)}
+
+
+def timer_stage(timer: Optional[Timer], name: str):
+    """``timer.stage(name)``, o un contexto vacío si no se está midiendo."""
+    return timer.stage(name) if timer is not None else _NULL_STAGE
+
+
+class _NullStage:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+def merge(*parts: Optional[Timings], prefixes: Optional[List[str]] = None) -> Timings:
+    """Une varias mediciones (p. ej. parse + analyze + plot) anteponiendo un prefijo a cada etapa."""
+    out: Timings = {"durations": {}, "counts": {}}
+    for i, part in enumerate(parts):
+        if not part:
+            continue
+        prefix = f"{prefixes[i]}." if prefixes else ""
+        for kind in ("durations", "counts"):
+            for name, value in part.get(kind, {}).items():
+                out[kind][prefix + name] = out[kind].get(prefix + name, 0) + value
+    return out
+
+
+def format_breakdown(timings: Timings, limit: int = 4, skip: tuple = ()) -> str:
+    """Resumen para la barra de estado: las etapas más lentas, en ms."""
+    durations = {k: v for k, v in timings.get("durations", {}).items() if k not in skip}
+    top = sorted(durations.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+    return " · ".join(f"{name} {1000 * seconds:.0f} ms" for name, seconds in top)
+
+
+# ------------------------------
+# Ganchos de exportación
+# ------------------------------
+def add_hook(hook: Hook) -> None:
+    """Registra ``hook(origen, timings)``; se llama al terminar cada parse, análisis o gráfico."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def emit(source: str, timings: Timings) -> None:
+    for hook in list(_hooks):
+        try:
+            hook(source, timings)
+        except Exception:
+            pass  # un exportador defectuoso no debe romper el análisis
+
+
+def jsonl_hook(path: str) -> Hook:
+    """Gancho que agrega una línea JSON por medición al archivo ``path``."""
+    lock = threading.Lock()
+
+    def hook(source: str, timings: Timings) -> None:
+        line = json.dumps({"source": source, "time": time.time(), **timings})
+        with lock, open(path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+    return hook
+
+
+# MAT1185_TIMINGS=archivo.jsonl exporta todas las mediciones sin tocar el código
+if os.environ.get("MAT1185_TIMINGS"):
+    add_hook(jsonl_hook(os.environ["MAT1185_TIMINGS"]))
+
+
+# ------------------------------
+# Perfilado (opcional)
+# ------------------------------
+def profiling_enabled() -> bool:
+    return bool(os.environ.get("MAT1185_PROFILE"))
+
+
+@contextmanager
+def profiled(enabled: bool = True) -> Iterator[Optional[cProfile.Profile]]:
+    if not enabled:
+        yield None
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield prof
+    finally:
+        prof.disable()
+
+
+def profile_text(prof: cProfile.Profile, limit: int = 25) -> str:
+    """Las ``limit`` funciones con más tiempo acumulado, como texto de pstats."""
+    buf = io.StringIO()
+    pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(limit)
+    return buf.getvalue()
@@ -0,0 +1,57 @@
+"""Arranque rápido de la GUI: qué se importa en segundo plano y precalentamiento de cachés.
+
+Este módulo sólo usa la biblioteca estándar al importarse, para que la ventana aparezca antes
+de cargar SymPy y Matplotlib. ``prewarm`` analiza unas pocas funciones típicas para que las
+cachés de SymPy y sus importaciones perezosas no penalicen el primer análisis del usuario.
+"""
+import os
+import time
+from typing import Callable, Iterable, Tuple
+
+# Módulos que gui._load_modules carga después de mostrar la ventana (benchmarks/startup.py mide cada uno)
+HEAVY_MODULES: Tuple[str, ...] = (
+    "sympy",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_tkagg",
+    "parser",
+    "analyzer",
+    "plotter",
+    "store",
+)
+
+# Funciones típicas y rápidas: polinomio, racional, trigonométrica, raíz, exponencial y logaritmo
+PREWARM_EXPRESSIONS: Tuple[str, ...] = (
+    "x**2 - 4",
+    "(x**2 - 1)/(x - 2)",
+    "sin(x)",
+    "sqrt(x - 1)",
+    "exp(x) - 2",
+    "log(x)",
+)
+
+
+def prewarm_enabled() -> bool:
+    """El precalentamiento se desactiva con ``MAT1185_NO_PREWARM=1``."""
+    return not os.environ.get("MAT1185_NO_PREWARM")
+
+
+def prewarm(expressions: Iterable[str] = PREWARM_EXPRESSIONS,
+            checkpoint: Callable[[str], None] = lambda text: None) -> float:
+    """Parsea, analiza y muestrea ``expressions`` sin almacén ni cachés de resultados.
+
+    Las etapas corren en este proceso (sin plazos) para que calienten sus cachés, y no las de
+    un proceso hijo. ``checkpoint(texto)`` se llama antes de cada función y puede lanzar una
+    excepción para interrumpir (p. ej. ``RunContext.progress``). Devuelve los segundos usados.
+    """
+    from analyzer import FunctionAnalyzer
+    from parser import FunctionParser
+    from plotter import FunctionPlotter
+
+    t0 = time.perf_counter()
+    parser = FunctionParser()
+    for text in expressions:
+        checkpoint(text)
+        compiled = parser.parse(text).compiled
+        FunctionPlotter(compiled, tile_cache=None).curve(x_value=1.0)
+        FunctionAnalyzer(compiled, cache=None, budgets={}).analyze(x_value=1.0)
+    return time.perf_counter() - t0
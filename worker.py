@@ -0,0 +1,146 @@
+import queue
+import threading
+from concurrent.futures import CancelledError
+from typing import Any, Callable, List, Optional
+
+
+class Cancelled(Exception):
+    """La tarea fue reemplazada por otra más nueva o cancelada."""
+
+
+class RunContext:
+    """Lo que ve la tarea en el hilo de trabajo: informar progreso y registrar cómo interrumpirla."""
+
+    def __init__(self, runner: "BackgroundRunner", generation: int) -> None:
+        self._runner = runner
+        self.generation = generation
+        self._on_cancel: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._cancelled = False
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def progress(self, stage: str) -> None:
+        """Informa la etapa en curso; lanza Cancelled si la tarea ya fue reemplazada."""
+        if self._cancelled:
+            raise Cancelled()
+        self._runner._events.put((self.generation, "progress", stage))
+
+    def post(self, payload: Any) -> None:
+        """Entrega un resultado parcial a ``on_partial`` en el hilo de Tk."""
+        if self._cancelled:
+            raise Cancelled()
+        self._runner._events.put((self.generation, "partial", payload))
+
+    def on_cancel(self, fn: Callable[[], None]) -> None:
+        """Registra cómo interrumpir trabajo en curso (p. ej. ``AnalysisJob.cancel``)."""
+        with self._lock:
+            if not self._cancelled:
+                self._on_cancel.append(fn)
+                return
+        fn()
+
+    def _cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            callbacks, self._on_cancel = self._on_cancel, []
+        for fn in callbacks:
+            fn()
+
+
+class BackgroundRunner:
+    """Ejecuta una tarea a la vez en un hilo de trabajo y entrega sus eventos en el hilo de Tk.
+
+    Cada ``start`` cancela la tarea anterior: sus eventos pendientes se descartan y su
+    ``progress`` lanza ``Cancelled`` para que termine en la siguiente etapa. Los callbacks
+    ``on_done``/``on_error``/``on_progress``/``on_partial`` se llaman siempre desde el bucle de Tk.
+
+    Una tarea cancelada puede tardar en llegar a su siguiente ``progress``; mientras tanto la
+    nueva arranca en otro hilo, pero nunca hay más de ``MAX_THREADS``: con todos ocupados la
+    tarea más reciente espera (reemplazando a la que esperaba) y la ejecuta el primer hilo que
+    se libere. Así, escribir rápido no acumula un hilo por tecla.
+    """
+
+    POLL_MS = 40
+    MAX_THREADS = 2
+
+    def __init__(self, master) -> None:
+        self.master = master
+        self._events: "queue.Queue[tuple]" = queue.Queue()
+        self._current: Optional[RunContext] = None
+        self._generation = 0
+        self._callbacks: dict = {}
+        self._lock = threading.Lock()
+        self._threads = 0
+        self._waiting: Optional[tuple] = None  # (ctx, tarea) a la espera de un hilo libre
+        self.master.after(self.POLL_MS, self._poll)
+
+    def start(self, task: Callable[[RunContext], Any],
+              on_done: Callable[[Any], None],
+              on_error: Callable[[Exception], None],
+              on_progress: Optional[Callable[[str], None]] = None,
+              on_partial: Optional[Callable[[Any], None]] = None) -> RunContext:
+        self.cancel()
+        self._generation += 1
+        ctx = RunContext(self, self._generation)
+        self._current = ctx
+        self._callbacks = {"done": on_done, "error": on_error, "progress": on_progress,
+                           "partial": on_partial}
+        with self._lock:
+            if self._threads >= self.MAX_THREADS:
+                self._waiting = (ctx, task)
+                return ctx
+            self._threads += 1
+        threading.Thread(target=self._work, args=(ctx, task), name="tareas", daemon=True).start()
+        return ctx
+
+    def threads(self) -> int:
+        """Hilos de trabajo vivos (incluye los que terminan una tarea ya cancelada)."""
+        with self._lock:
+            return self._threads
+
+    def _work(self, ctx: RunContext, task: Callable[[RunContext], Any]) -> None:
+        while True:
+            if not ctx.cancelled():
+                self._execute(ctx, task)
+            with self._lock:
+                if self._waiting is None:
+                    self._threads -= 1
+                    return
+                (ctx, task), self._waiting = self._waiting, None
+
+    def _execute(self, ctx: RunContext, task: Callable[[RunContext], Any]) -> None:
+        try:
+            result = task(ctx)
+        except (Cancelled, CancelledError):
+            return
+        except Exception as e:
+            self._events.put((ctx.generation, "error", e))
+            return
+        self._events.put((ctx.generation, "done", result))
+
+    def cancel(self) -> None:
+        ctx, self._current = self._current, None
+        self._callbacks = {}
+        if ctx is not None:
+            ctx._cancel()
+
+    def busy(self) -> bool:
+        return self._current is not None
+
+    def _poll(self) -> None:
+        try:
+            while True:
+                gen, kind, payload = self._events.get_nowait()
+                if self._current is None or gen != self._current.generation:
+                    continue
+                callback = self._callbacks.get(kind)
+                if kind in ("done", "error"):
+                    self._current = None
+                    self._callbacks = {}
+                if callback is not None:
+                    callback(payload)
+        except queue.Empty:
+            pass
+        self.master.after(self.POLL_MS, self._poll)